@@ -5,19 +5,154 @@ All-in-one tool for contacting corporations, Congress, and local officials.
 No extra research needed - just pick an action and go.
 """
 
+import functools
 import json
 import os
 import sys
-import subprocess
-import platform
-import urllib.parse
-from datetime import datetime
+
+# Everything else is imported where it is used, so startup only pays for
+# what the chosen screen or command actually needs.
+
+# ============================================================================
+# INSTRUMENTATION - opt-in timings and counts for the hot paths
+# ============================================================================
+# Set ICE_ADVOCACY_PROFILE=1 or pass --profile to time every function marked
+# @instrumented. A snapshot is written at exit as JSON and as Prometheus text
+# (PROFILE_FILE + .json / .prom; give --profile PATH or set the variable to
+# a path to write elsewhere). Marking a function only records its name:
+# the timing wrapper is swapped in when profiling is turned on, so with it
+# off the original function runs with no wrapper at all.
+
+PROFILE_FILE = os.path.expanduser("~/.ice_advocacy_profile")
+PROFILE_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_instrumented = []
+_metrics = None
+
+def instrumented(func):
+    """Mark a function or method for timing when profiling is enabled."""
+    _instrumented.append(func)
+    return func
+
+def _record(op: str, seconds: float, failed: bool):
+    import bisect
+    with _metrics["lock"]:
+        m = _metrics["ops"].get(op)
+        if m is None:
+            m = _metrics["ops"][op] = {"count": 0, "seconds": 0.0, "max": 0.0, "errors": 0,
+                                       "buckets": [0] * (len(PROFILE_BUCKETS) + 1)}
+        m["count"] += 1
+        m["seconds"] += seconds
+        m["max"] = max(m["max"], seconds)
+        m["errors"] += failed
+        m["buckets"][bisect.bisect_left(PROFILE_BUCKETS, seconds)] += 1
+
+def _timed(func):
+    import inspect
+    import time
+    op, clock = func.__qualname__, time.perf_counter
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def timed(*args, **kwargs):
+            start, failed = clock(), True
+            try:
+                result = await func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                _record(op, clock() - start, failed)
+        return timed
+
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        start, failed = clock(), True
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            _record(op, clock() - start, failed)
+    return timed
+
+def enable_instrumentation(path: str = PROFILE_FILE):
+    """Swap timing wrappers in for every @instrumented function; export at exit."""
+    global _metrics
+    if _metrics is not None:
+        return
+    import atexit
+    import threading
+    import time
+    _metrics = {"lock": threading.Lock(), "ops": {}, "started": time.time()}
+    module = sys.modules[__name__]
+    for func in _instrumented:
+        owner_name, _, attr = func.__qualname__.rpartition(".")
+        owner = getattr(module, owner_name) if owner_name else module
+        setattr(owner, attr, _timed(func))
+    atexit.register(write_profile, path)
+
+def disable_instrumentation():
+    """Put the original functions back and drop the metrics and the exit export."""
+    global _metrics
+    if _metrics is None:
+        return
+    import atexit
+    module = sys.modules[__name__]
+    for func in _instrumented:
+        owner_name, _, attr = func.__qualname__.rpartition(".")
+        owner = getattr(module, owner_name) if owner_name else module
+        setattr(owner, attr, func)
+    atexit.unregister(write_profile)
+    _metrics = None
+
+def profile_snapshot() -> dict:
+    """Per-operation count, total/mean/max seconds, errors and cumulative buckets."""
+    import time
+    with _metrics["lock"]:
+        ops = {op: dict(m, buckets=list(m["buckets"])) for op, m in _metrics["ops"].items()}
+    snapshot = {"started": _metrics["started"], "seconds": time.time() - _metrics["started"],
+                "pid": os.getpid(), "argv": sys.argv[1:], "ops": {}}
+    for op, m in sorted(ops.items()):
+        running, buckets = 0, {}
+        for le, n in zip([*map(str, PROFILE_BUCKETS), "+Inf"], m["buckets"]):
+            running += n
+            buckets[le] = running
+        snapshot["ops"][op] = {"count": m["count"], "seconds_total": m["seconds"],
+                               "seconds_mean": m["seconds"] / m["count"], "seconds_max": m["max"],
+                               "errors": m["errors"], "buckets": buckets}
+    return snapshot
+
+def prometheus_text(snapshot: dict) -> str:
+    lines = [
+        "# HELP advocacy_op_duration_seconds Time spent in instrumented operations.",
+        "# TYPE advocacy_op_duration_seconds histogram",
+    ]
+    for op, m in snapshot["ops"].items():
+        for le, n in m["buckets"].items():
+            lines.append(f'advocacy_op_duration_seconds_bucket{{op="{op}",le="{le}"}} {n}')
+        lines.append(f'advocacy_op_duration_seconds_sum{{op="{op}"}} {m["seconds_total"]:.9f}')
+        lines.append(f'advocacy_op_duration_seconds_count{{op="{op}"}} {m["count"]}')
+    lines += ["# HELP advocacy_op_errors_total Instrumented calls that raised.",
+              "# TYPE advocacy_op_errors_total counter"]
+    lines += [f'advocacy_op_errors_total{{op="{op}"}} {m["errors"]}' for op, m in snapshot["ops"].items()]
+    return "\n".join(lines) + "\n"
+
+def write_profile(path: str = PROFILE_FILE):
+    snapshot = profile_snapshot()
+    atomic_write_json(path + ".json", snapshot, indent=2, durable=False)
+    with open(path + ".prom.tmp", 'w', encoding='utf-8') as f:
+        f.write(prometheus_text(snapshot))
+    os.replace(path + ".prom.tmp", path + ".prom")
+    print(f"Profile written to {path}.json and {path}.prom", file=sys.stderr)
 
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
 CONFIG_FILE = os.path.expanduser("~/.ice_advocacy_config.json")
+JOURNAL_FILE = os.path.expanduser("~/.ice_advocacy_actions.jsonl")
+ACTIONS_DB_FILE = os.path.expanduser("~/.ice_advocacy_actions.db")
+PACKED_FILE = os.path.expanduser("~/.ice_advocacy_actions.bin")
 
 DEFAULT_CONFIG = {
     "user_name": "",
@@ -27,18 +162,849 @@ DEFAULT_CONFIG = {
     "user_state": "",
     "zip_code": "",
     "phone": "",
-    "actions_taken": []
 }
 
-def load_config() -> dict:
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
-    return DEFAULT_CONFIG.copy()
+class FileLock:
+    """Advisory exclusive lock on `<path>.lock`, held for a `with` block.
+
+    Only cooperating instances of this tool honor it, which is all we need
+    to keep two copies of the CLI (or the server and the CLI) from
+    interleaving their writes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path + ".lock"
+        self.fd = None
+
+    def __enter__(self):
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.name == 'nt':
+            import msvcrt
+            msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        # Closing the descriptor releases the lock
+        os.close(self.fd)
+        self.fd = None
+
+def atomic_write_json(path: str, data, indent: int = None, durable: bool = True):
+    """Replace `path` with `data` so readers see the old file or the new one, never half.
+
+    The JSON goes to a temporary file in the same directory, is fsynced,
+    and is renamed over the target. With durable=False the fsyncs are
+    skipped, for files that can be rebuilt from something else.
+    """
+    import tempfile
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=folder)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, separators=None if indent else (',', ':'))
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    if durable and os.name != 'nt':
+        dir_fd = os.open(folder, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+@instrumented
+def load_config(path: str = CONFIG_FILE) -> dict:
+    config = DEFAULT_CONFIG.copy()
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                config = json.load(f)
+        except ValueError:
+            # Left behind by an older version killed mid-save - keep it for
+            # recovery and start over rather than crash on every launch
+            os.replace(path, path + ".corrupt")
+            print(f"  Your settings file was damaged; saved it as {path}.corrupt")
+
+    # Older configs kept the whole history inline - move it to the store once,
+    # then drop it from the file so later loads never open the store here
+    if "actions_taken" in config:
+        legacy_actions = config.pop("actions_taken")
+        store = get_action_store()
+        if legacy_actions and not store.count():
+            store.extend(legacy_actions)
+        save_config(config, path)
+
+    return config
+
+@instrumented
+def save_config(config: dict, path: str = CONFIG_FILE):
+    """Save the user profile. Actions live in the action store, not here."""
+    profile = {k: v for k, v in config.items() if k != "actions_taken"}
+    with FileLock(path):
+        atomic_write_json(path, profile, indent=2)
+
+# ============================================================================
+# ACTION STORAGE
+# ============================================================================
+# The journal (one JSON record per line) is the default. Set
+# ICE_ADVOCACY_STORE=sqlite to keep history in an indexed SQLite database
+# instead - useful for shared kiosks with very large histories - or
+# ICE_ADVOCACY_STORE=packed for a compact binary file (16 bytes an action,
+# strings stored once); an existing journal is copied into it on first use.
+#
+# Either way, running totals live in a small stats file next to the history
+# and are updated as each action is logged, so the stats screen never has
+# to walk the whole history.
+
+ACTION_STORE = os.environ.get("ICE_ADVOCACY_STORE", "journal")
+RECENT_ACTIONS = 10
+
+# One encoder for every journal line (json.dumps builds a new one per call
+# when given separators)
+_encode_compact = json.JSONEncoder(separators=(',', ':')).encode
+
+@functools.lru_cache(maxsize=4096)
+def _iso_week(day: str) -> str:
+    from datetime import date
+    year, week, _ = date.fromisoformat(day).isocalendar()
+    return f"{year}-W{week:02d}"
+
+def _note_last_contact(last_contact: dict, target: str, day: str):
+    """Fold one action into a {target: [latest day, actions that day]} index."""
+    last = last_contact.get(target)
+    if last is None or day > last[0]:
+        last_contact[target] = [day, 1]
+    elif day == last[0]:
+        last[1] += 1
+
+class StatsRollup:
+    """Running counters per type, method, target, day and ISO week.
+
+    last_contact maps each target to [its latest day, actions that day],
+    which is what the contact scheduler needs to start without reading
+    the history. It is None in stats saved before it existed; the stores
+    rebuild those on load.
+    """
+
+    FIELDS = ("by_type", "by_method", "by_target", "by_day", "by_week")
+
+    def __init__(self, data: dict = None):
+        data = data or {}
+        self.total = data.get("total", 0)
+        for field in self.FIELDS:
+            setattr(self, field, dict(data.get(field, {})))
+        self.recent = list(data.get("recent", []))
+        self.watermark = data.get("watermark")
+        self.last_contact = data.get("last_contact", None if self.total else {})
+
+    def add(self, record: dict):
+        day = record['date'][:10]
+        self.total += 1
+        for counts, key in ((self.by_type, record['type']), (self.by_method, record['method']),
+                            (self.by_target, record['target']), (self.by_day, day),
+                            (self.by_week, _iso_week(day))):
+            counts[key] = counts.get(key, 0) + 1
+        if self.last_contact is not None:
+            _note_last_contact(self.last_contact, record['target'], day)
+        self.recent.append(record)
+        del self.recent[:-RECENT_ACTIONS]
+
+    @classmethod
+    def from_actions(cls, actions) -> "StatsRollup":
+        """Count a whole history in a few Counter passes rather than add() per record."""
+        from collections import Counter
+        actions = actions if isinstance(actions, list) else list(actions)
+        by_day = Counter(r['date'][:10] for r in actions)
+        by_week = Counter()
+        for day, count in by_day.items():
+            by_week[_iso_week(day)] += count
+        last_contact = {}
+        for r in actions:
+            _note_last_contact(last_contact, r['target'], r['date'][:10])
+        return cls({
+            "total": len(actions),
+            "by_type": Counter(r['type'] for r in actions),
+            "by_method": Counter(r['method'] for r in actions),
+            "by_target": Counter(r['target'] for r in actions),
+            "by_day": by_day,
+            "by_week": by_week,
+            "recent": actions[-RECENT_ACTIONS:],
+            "last_contact": last_contact,
+        })
+
+    def to_dict(self) -> dict:
+        data = {"total": self.total, "recent": self.recent, "watermark": self.watermark,
+                "last_contact": self.last_contact}
+        data.update({field: getattr(self, field) for field in self.FIELDS})
+        return data
+
+    def streaks(self, today: str = None) -> tuple:
+        """(current, longest) runs of consecutive active days. O(days)."""
+        from datetime import date, timedelta
+        days = sorted(date.fromisoformat(d) for d in self.by_day)
+        longest = run = 0
+        previous = None
+        for day in days:
+            run = run + 1 if previous and day - previous == timedelta(days=1) else 1
+            longest = max(longest, run)
+            previous = day
+        today = date.fromisoformat(today) if today else date.today()
+        current = run if previous and (today - previous).days <= 1 else 0
+        return current, longest
+
+    def top_targets(self, n: int = 5) -> list:
+        import heapq
+        # Ties by name, so every store gives the same answer
+        return heapq.nsmallest(n, self.by_target.items(), key=lambda kv: (-kv[1], kv[0]))
+
+    def histogram(self, days: int = 14, today: str = None) -> list:
+        """[(day, count)] for the last `days` days, oldest first."""
+        from datetime import date, timedelta
+        end = date.fromisoformat(today) if today else date.today()
+        span = [(end - timedelta(days=i)).isoformat() for i in range(days - 1, -1, -1)]
+        return [(day, self.by_day.get(day, 0)) for day in span]
+
+    def summary(self) -> dict:
+        current, longest = self.streaks()
+        data = self.to_dict()
+        del data["watermark"], data["last_contact"]
+        data.update(current_streak=current, longest_streak=longest,
+                    top_targets=self.top_targets(), histogram=self.histogram())
+        return data
+
+# Actions logged within this many seconds of each other share one disk write
+FLUSH_DELAY = float(os.environ.get("ICE_ADVOCACY_FLUSH_DELAY", "0.25"))
+
+class ActionStore:
+    """Shared rollup bookkeeping; subclasses implement the raw history.
+
+    Writes take an advisory lock on the history so several processes can
+    log to the same store. append() queues the action and a timer writes
+    everything queued within FLUSH_DELAY in one go; anything still queued
+    is written at exit. Readers flush first, so they always see it.
+    """
+
+    stats_path = None
+    _rollup = None
+
+    def __init__(self, path: str):
+        import threading
+        self.path = path
+        self.writes = 0
+        self._exit_hook = False
+        self._pending = []
+        self._timer = None
+        self._pending_lock = threading.Lock()
+
+    def append(self, record: dict):
+        """Queue one action; it is written with any others logged within FLUSH_DELAY."""
+        if FLUSH_DELAY <= 0:
+            self.extend([record])
+            return
+        import threading
+        with self._pending_lock:
+            self._pending.append(record)
+            if self._timer is None:
+                if not self._exit_hook:
+                    import atexit
+                    atexit.register(self.flush)
+                    self._exit_hook = True
+                self._timer = threading.Timer(FLUSH_DELAY, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    @instrumented
+    def flush(self):
+        """Write any queued actions now."""
+        with self._pending_lock:
+            records, self._pending = self._pending, []
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        if records:
+            try:
+                self.extend(records)
+            except BaseException:
+                with self._pending_lock:
+                    self._pending[:0] = records
+                raise
+
+    def close(self):
+        """Write anything queued and drop the exit hook; the store stays usable."""
+        self.flush()
+        if self._exit_hook:
+            import atexit
+            atexit.unregister(self.flush)
+            self._exit_hook = False
+
+    @instrumented
+    def extend(self, records: list):
+        """Write records in one go, under the lock, and fold them into the rollup."""
+        with FileLock(self.path):
+            rollup = self._current_rollup()
+            self._write_many(records)
+            for record in records:
+                rollup.add(record)
+            rollup.watermark = self.watermark()
+            self._save_rollup(rollup)
+            self.writes += 1
+
+    def rollup(self) -> StatsRollup:
+        """The running counters, including anything still queued."""
+        self.flush()
+        with FileLock(self.path):
+            return self._current_rollup()
+
+    def rebuild(self) -> StatsRollup:
+        """Recompute the counters from the full history and save them."""
+        self.flush()
+        with FileLock(self.path):
+            return self._rebuild()
+
+    # The methods below expect the lock to be held already
+
+    def _current_rollup(self) -> StatsRollup:
+        # Another process may have logged since we last looked: reread its
+        # rollup from disk, and rebuild only if that doesn't match either
+        # (or predates last_contact, which only a full recount can fill in)
+        stale = lambda rollup: rollup.watermark != self.watermark() or rollup.last_contact is None
+        if self._rollup is None or stale(self._rollup):
+            try:
+                with open(self.stats_path, encoding='utf-8') as f:
+                    self._rollup = StatsRollup(json.load(f))
+            except (OSError, ValueError):
+                self._rollup = StatsRollup()
+            if stale(self._rollup):
+                self._rebuild()
+        return self._rollup
+
+    @instrumented
+    def _rebuild(self) -> StatsRollup:
+        rollup = self._rebuild_rollup()
+        rollup.watermark = self.watermark()
+        self._save_rollup(rollup)
+        return rollup
+
+    def all(self) -> list:
+        """Every action, oldest first."""
+        self.flush()
+        with FileLock(self.path):
+            return self._all()
+
+    def since(self, day: str) -> list:
+        """Actions dated `day` (YYYY-MM-DD) or later, oldest first.
+
+        Subclasses read only the end of the history, back to the first
+        action older than `day`.
+        """
+        self.flush()
+        with FileLock(self.path):
+            return [r for r in self._all() if r['date'] >= day]
+
+    def _rebuild_rollup(self) -> StatsRollup:
+        return StatsRollup.from_actions(self._all())
+
+    def _save_rollup(self, rollup: StatsRollup):
+        # Derived from the history, so no fsync: a lost update is rebuilt
+        self._rollup = rollup
+        atomic_write_json(self.stats_path, rollup.to_dict(), durable=False)
+
+    def summary(self) -> dict:
+        return self.rollup().summary()
+
+class JournalStore(ActionStore):
+    """Append-only JSON Lines file of actions."""
+
+    def __init__(self, path: str = JOURNAL_FILE):
+        super().__init__(path)
+        self.stats_path = os.path.splitext(path)[0] + ".stats.json"
+
+    def watermark(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def _write_many(self, records: list):
+        """Append actions in a single write and fsync them to disk."""
+        lines = "".join(_encode_compact(r) + "\n" for r in records)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _all(self) -> list:
+        """Read every action from the journal.
+
+        A crash mid-append can leave a torn last line; it is dropped and the
+        file truncated back to the last complete record so later appends stay
+        on their own lines.
+        """
+        if not os.path.exists(self.path):
+            return []
+
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        good_end = data.rfind(b"\n") + 1
+        torn = good_end != len(data)
+        lines = data[:good_end].decode('utf-8', errors='replace').splitlines()
+        try:
+            # An intact journal decodes in one call; fall back line by line
+            actions = json.loads("[" + ",".join(lines) + "]")
+        except ValueError:
+            decode = json.JSONDecoder().decode
+            actions = []
+            for line in lines:
+                try:
+                    actions.append(decode(line))
+                except ValueError:
+                    continue
+
+        if torn:
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_end)
+        return actions
+
+    def count(self) -> int:
+        return len(self.all())
+
+    def since(self, day: str) -> list:
+        self.flush()
+        with FileLock(self.path):
+            try:
+                f = open(self.path, 'rb')
+            except FileNotFoundError:
+                return []
+            with f:
+                end = f.seek(0, os.SEEK_END)
+                pos, data = end, b""
+                decode = json.JSONDecoder().decode
+                while pos > 0:
+                    start = max(0, pos - 65536)
+                    f.seek(start)
+                    data = f.read(pos - start) + data
+                    pos = start
+                    # Stop once the first whole line in hand is older than day
+                    first = data.find(b"\n") + 1 if pos else 0
+                    line = data[first:data.find(b"\n", first)]
+                    try:
+                        if decode(line.decode('utf-8'))['date'] < day:
+                            break
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        # A torn last line has no newline yet; all() repairs it, here it is skipped
+        actions = []
+        for line in data[:data.rfind(b"\n") + 1].splitlines():
+            try:
+                record = decode(line.decode('utf-8', errors='replace'))
+            except ValueError:
+                continue
+            if isinstance(record, dict) and record.get('date', '') >= day:
+                actions.append(record)
+        return actions
+
+    def compact(self, actions: list):
+        """Rewrite the journal as a fresh snapshot of the given actions."""
+        self.flush()
+        with FileLock(self.path):
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for record in actions:
+                    f.write(_encode_compact(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._rebuild()
+
+class SQLiteStore(ActionStore):
+    """Actions in SQLite, indexed so stats are aggregate queries."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS actions (
+            id INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            day TEXT NOT NULL,
+            type TEXT NOT NULL,
+            target TEXT NOT NULL,
+            method TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS actions_date ON actions(date);
+        CREATE INDEX IF NOT EXISTS actions_day ON actions(day);
+        CREATE INDEX IF NOT EXISTS actions_type ON actions(type);
+        CREATE INDEX IF NOT EXISTS actions_target ON actions(target);
+    """
+
+    def __init__(self, path: str = ACTIONS_DB_FILE):
+        import sqlite3
+        super().__init__(path)
+        self.stats_path = path + ".stats.json"
+        # Used from the flush timer's thread too; the file lock serializes access
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.executescript(self.SCHEMA)
+
+    def watermark(self) -> int:
+        return self.db.execute("SELECT COALESCE(MAX(id), 0) FROM actions").fetchone()[0]
+
+    @staticmethod
+    def _row(record: dict) -> tuple:
+        return (record['date'], record['date'][:10], record['type'],
+                record['target'], record['method'])
+
+    def _write_many(self, records: list):
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO actions (date, day, type, target, method) VALUES (?, ?, ?, ?, ?)",
+                (self._row(r) for r in records))
+
+    def _all(self) -> list:
+        rows = self.db.execute("SELECT date, type, target, method FROM actions ORDER BY id")
+        return [{"date": d, "type": t, "target": g, "method": m} for d, t, g, m in rows]
+
+    def count(self) -> int:
+        self.flush()
+        with FileLock(self.path):
+            return self.db.execute("SELECT COUNT(*) FROM actions").fetchone()[0]
+
+    def since(self, day: str) -> list:
+        self.flush()
+        with FileLock(self.path):
+            rows = self.db.execute("SELECT date, type, target, method FROM actions "
+                                   "WHERE date >= ? ORDER BY id", (day,))
+            return [{"date": d, "type": t, "target": g, "method": m} for d, t, g, m in rows]
+
+    def _rebuild_rollup(self) -> StatsRollup:
+        """Counters straight from indexed GROUP BY queries, no full scan in Python."""
+        q = self.db.execute
+        rollup = StatsRollup({
+            "total": q("SELECT COUNT(*) FROM actions").fetchone()[0],
+            "by_type": dict(q("SELECT type, COUNT(*) FROM actions GROUP BY type")),
+            "by_method": dict(q("SELECT method, COUNT(*) FROM actions GROUP BY method")),
+            "by_target": dict(q("SELECT target, COUNT(*) FROM actions GROUP BY target")),
+            "by_day": dict(q("SELECT day, COUNT(*) FROM actions GROUP BY day")),
+        })
+        for day, count in rollup.by_day.items():
+            week = _iso_week(day)
+            rollup.by_week[week] = rollup.by_week.get(week, 0) + count
+        rows = q("SELECT date, type, target, method FROM actions ORDER BY id DESC LIMIT ?",
+                 (RECENT_ACTIONS,)).fetchall()
+        rollup.recent = [{"date": d, "type": t, "target": g, "method": m}
+                         for d, t, g, m in reversed(rows)]
+        rollup.last_contact = {target: [day, n] for target, day, n in q(
+            "SELECT a.target, a.day, COUNT(*) FROM actions a JOIN "
+            "(SELECT target, MAX(day) AS day FROM actions GROUP BY target) latest "
+            "ON a.target = latest.target AND a.day = latest.day GROUP BY a.target")}
+        return rollup
+
+# Seconds since 1970-01-01 of the (local, naive) timestamp, then the ids of
+# the type, target and method strings - little-endian uint32 each
+PACKED_FIELDS = 4
+_UNIX_EPOCH_ORDINAL = 719163  # date(1970, 1, 1).toordinal()
+
+@functools.lru_cache(maxsize=4096)
+def _epoch_day(days: int) -> str:
+    from datetime import date
+    return date.fromordinal(_UNIX_EPOCH_ORDINAL + days).isoformat()
+
+def _to_epoch(timestamp: str) -> int:
+    from datetime import datetime
+    moment = datetime.fromisoformat(timestamp).replace(tzinfo=None)
+    return (moment.toordinal() - _UNIX_EPOCH_ORDINAL) * 86400 + \
+        moment.hour * 3600 + moment.minute * 60 + moment.second
+
+@functools.lru_cache(maxsize=1)
+def _clock_parts() -> tuple:
+    """("T00:", ... "T23:") and ("00:00", ... "59:59") so times are two lookups."""
+    return ([f"T{h:02d}:" for h in range(24)],
+            [f"{m:02d}:{s:02d}" for m in range(60) for s in range(60)])
+
+def _from_epoch(seconds: int) -> str:
+    hours, minutes = _clock_parts()
+    days, rest = divmod(seconds, 86400)
+    hour, rest = divmod(rest, 3600)
+    return _epoch_day(days) + hours[hour] + minutes[rest]
+
+class PackedAction:
+    """One action as held in memory by PackedStore: an int and three shared strings."""
+
+    __slots__ = ("epoch", "type", "target", "method")
+
+    def __init__(self, epoch: int, type: str, target: str, method: str):
+        self.epoch = epoch
+        self.type = type
+        self.target = target
+        self.method = method
+
+    @property
+    def date(self) -> str:
+        return _from_epoch(self.epoch)
+
+    def to_dict(self) -> dict:
+        return {"date": self.date, "type": self.type, "target": self.target, "method": self.method}
+
+class PackedStore(ActionStore):
+    """Fixed-size binary records plus an append-only table of interned strings.
+
+    Each action is PACKED_FIELDS uint32s: the epoch second it was logged
+    and the ids of its type, target and method in the `.strings` file (one
+    JSON string per line).
+
+    Dates are lossy: they come back as naive "YYYY-MM-DDTHH:MM:SS". The
+    microseconds that log_action records are dropped, and a UTC offset is
+    discarded without converting (the wall-clock time is kept). So a
+    round trip through this store, or copying a journal into it, does not
+    return byte-identical dates. Every day, week and cooldown count is
+    unaffected.
+    """
+
+    def __init__(self, path: str = PACKED_FILE):
+        import struct
+        super().__init__(path)
+        self.strings_path = os.path.splitext(path)[0] + ".strings"
+        self.stats_path = path + ".stats.json"
+        self.record = struct.Struct("<" + "I" * PACKED_FIELDS)
+        self.strings = []
+        self.ids = {}
+        self._strings_read = 0
+        if os.path.exists(self.path + ".compact"):
+            with FileLock(self.path):
+                self._finish_compact()
+
+    def watermark(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _assign_ids(records: list, strings: list, ids: dict) -> list:
+        """Give each string in the records not yet in `ids` the next id; returns those strings."""
+        new = []
+        for record in records:
+            for field in ('type', 'target', 'method'):
+                value = record[field]
+                if value not in ids:
+                    ids[value] = len(strings)
+                    strings.append(sys.intern(value))
+                    new.append(value)
+        return new
+
+    def _load_strings(self):
+        """Pick up strings added since the last read (by us or another process)."""
+        try:
+            with open(self.strings_path, 'rb') as f:
+                f.seek(self._strings_read)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        # A torn last line was never referenced: records are written after
+        # their strings. Leave it for _intern to overwrite.
+        data = data[:data.rfind(b"\n") + 1]
+        if data:
+            for value in json.loads("[" + ",".join(data.decode('utf-8').splitlines()) + "]"):
+                self.ids.setdefault(value, len(self.strings))
+                self.strings.append(sys.intern(value))
+            self._strings_read += len(data)
+
+    def _intern(self, records: list) -> list:
+        """Ids for every string in the records, saving any new ones first."""
+        self._load_strings()
+        new = self._assign_ids(records, self.strings, self.ids)
+        if new:
+            data = "".join(json.dumps(v) + "\n" for v in new).encode('utf-8')
+            with open(self.strings_path, 'ab') as f:
+                f.truncate(self._strings_read)
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self._strings_read += len(data)
+        ids = self.ids
+        return [(_to_epoch(r['date']), ids[r['type']], ids[r['target']], ids[r['method']])
+                for r in records]
+
+    def _write_many(self, records: list):
+        pack = self.record.pack
+        data = b"".join(pack(*row) for row in self._intern(records))
+        with open(self.path, 'ab') as f:
+            f.truncate(self.watermark() - self.watermark() % self.record.size)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _columns(self):
+        """Every field of every record as one flat array of ints."""
+        from array import array
+        self._load_strings()
+        fields = array('I')
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return fields
+        # Ignore a torn final record; the next write truncates it away
+        fields.frombytes(data[:len(data) - len(data) % self.record.size])
+        if sys.byteorder == 'big':
+            fields.byteswap()
+        return fields
+
+    def records(self) -> list:
+        """Every action as a PackedAction, oldest first."""
+        self.flush()
+        with FileLock(self.path):
+            return self._records()
+
+    def _records(self) -> list:
+        fields, strings = self._columns(), self.strings
+        return [PackedAction(e, strings[t], strings[g], strings[m])
+                for e, t, g, m in zip(fields[0::4], fields[1::4], fields[2::4], fields[3::4])]
+
+    def _all(self) -> list:
+        fields, strings, date = self._columns(), self.strings, _from_epoch
+        return [{"date": date(e), "type": strings[t], "target": strings[g], "method": strings[m]}
+                for e, t, g, m in zip(fields[0::4], fields[1::4], fields[2::4], fields[3::4])]
+
+    def count(self) -> int:
+        self.flush()
+        with FileLock(self.path):
+            return self.watermark() // self.record.size
+
+    def _rebuild_rollup(self) -> StatsRollup:
+        """Count ids and day numbers straight off the packed columns."""
+        from collections import Counter
+        fields, strings = self._columns(), self.strings
+
+        def by_string(ids) -> dict:
+            return {strings[i]: n for i, n in Counter(ids).items()}
+
+        rollup = StatsRollup({
+            "total": len(fields) // PACKED_FIELDS,
+            "by_type": by_string(fields[1::4]),
+            "by_target": by_string(fields[2::4]),
+            "by_method": by_string(fields[3::4]),
+            "by_day": {_epoch_day(d): n for d, n in
+                       Counter(e // 86400 for e in fields[0::4]).items()},
+        })
+        for day, count in rollup.by_day.items():
+            week = _iso_week(day)
+            rollup.by_week[week] = rollup.by_week.get(week, 0) + count
+        tail = fields[-RECENT_ACTIONS * PACKED_FIELDS:] if fields else fields
+        rollup.recent = [PackedAction(tail[i], strings[tail[i + 1]], strings[tail[i + 2]],
+                                      strings[tail[i + 3]]).to_dict()
+                         for i in range(0, len(tail), PACKED_FIELDS)]
+        latest = {}
+        for (target, day), n in Counter(zip(fields[2::4], (e // 86400 for e in fields[0::4]))).items():
+            if target not in latest or day > latest[target][0]:
+                latest[target] = [day, n]
+        rollup.last_contact = {strings[t]: [_epoch_day(day), n] for t, (day, n) in latest.items()}
+        return rollup
 
-def save_config(config: dict):
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    def since(self, day: str) -> list:
+        from array import array
+        self.flush()
+        with FileLock(self.path):
+            self._load_strings()
+            cutoff = _to_epoch(day)
+            size = self.record.size
+            try:
+                f = open(self.path, 'rb')
+            except FileNotFoundError:
+                return []
+            with f:
+                end = f.seek(0, os.SEEK_END)
+                pos = end - end % size  # ignore a torn final record
+                data = b""
+                while pos > 0:
+                    start = max(0, pos - 4096 * size)
+                    f.seek(start)
+                    data = f.read(pos - start) + data
+                    pos = start
+                    if self.record.unpack_from(data)[0] < cutoff:
+                        break
+        fields = array('I')
+        fields.frombytes(data)
+        if sys.byteorder == 'big':
+            fields.byteswap()
+        strings, date = self.strings, _from_epoch
+        return [{"date": date(e), "type": strings[t], "target": strings[g], "method": strings[m]}
+                for e, t, g, m in zip(fields[0::4], fields[1::4], fields[2::4], fields[3::4])
+                if e >= cutoff]
+
+    def compact(self, actions: list):
+        """Rewrite the store as a fresh snapshot, dropping unused strings.
+
+        Both new files are written and fsynced beside the old ones, then
+        renamed into place strings first. That rename is the commit point:
+        if the process dies before it the old files stand, and after it
+        the next open finishes moving the records in.
+        """
+        self.flush()
+        with FileLock(self.path):
+            strings, ids = [], {}
+            self._assign_ids(actions, strings, ids)
+            pack = self.record.pack
+            table = "".join(json.dumps(v) + "\n" for v in strings).encode('utf-8')
+            packed = b"".join(pack(_to_epoch(r['date']), ids[r['type']], ids[r['target']],
+                                   ids[r['method']]) for r in actions)
+            for path, data in ((self.strings_path, table), (self.path, packed)):
+                with open(path + ".compact", 'wb') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(self.strings_path + ".compact", self.strings_path)
+            self._finish_compact()
+            self._rebuild()
+
+    def _finish_compact(self):
+        """Settle an interrupted compact(), with the lock held.
+
+        A strings file still waiting means the old files were never touched,
+        so the new ones are dropped; records waiting alone means the strings
+        were already swapped, so the records follow them.
+        """
+        records_new, strings_new = self.path + ".compact", self.strings_path + ".compact"
+        if os.path.exists(strings_new):
+            for path in (strings_new, records_new):
+                if os.path.exists(path):
+                    os.remove(path)
+            return
+        if os.path.exists(records_new):
+            os.replace(records_new, self.path)
+            if os.name != 'nt':
+                dir_fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+        self.strings, self.ids, self._strings_read = [], {}, 0
+
+def open_action_store(kind: str, path: str = None) -> ActionStore:
+    """A store of the given kind ("journal", "sqlite" or "packed")."""
+    if kind == "sqlite":
+        return SQLiteStore(path or ACTIONS_DB_FILE)
+    if kind == "packed":
+        store = PackedStore(path or PACKED_FILE)
+        # Switching over: bring the journal's history along, once
+        if path is None and not store.count() and os.path.exists(JOURNAL_FILE):
+            store.extend(JournalStore().all())
+        return store
+    return JournalStore(path or JOURNAL_FILE)
+
+_action_store = None
+
+def get_action_store():
+    """Return the configured action store, opening it on first use."""
+    global _action_store
+    if _action_store is None:
+        _action_store = open_action_store(ACTION_STORE)
+    return _action_store
 
 # ============================================================================
 # CEO CONTACTS - From 50501 Minnesota Campaign + Additional
@@ -238,513 +1204,5146 @@ Sincerely,
 """
 
 # ============================================================================
-# UTILITY FUNCTIONS
+# TEMPLATE ENGINE
 # ============================================================================
 
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
+class CompiledTemplate:
+    """A message template parsed once into literal segments and field slots.
 
-def open_phone_dialer(phone_number: str):
-    """Open phone dialer with the number."""
-    clean_number = ''.join(c for c in phone_number if c.isdigit() or c == '+')
-    if platform.system() == 'Darwin':  # macOS
-        subprocess.run(['open', f'tel:{clean_number}'], check=False)
-    elif platform.system() == 'Linux':
-        subprocess.run(['xdg-open', f'tel:{clean_number}'], check=False)
-    else:
-        print(f"\n>>> CALL THIS NUMBER: {phone_number}")
+    The segments are joined into a %-style format string, so rendering is a
+    single C-level substitution with no re-parsing of the template text.
+    """
 
-def open_email_client(to: str, subject: str, body: str):
-    """Open default email client with pre-filled email."""
-    subject_encoded = urllib.parse.quote(subject)
-    body_encoded = urllib.parse.quote(body)
-    mailto_url = f"mailto:{to}?subject={subject_encoded}&body={body_encoded}"
+    def __init__(self, source: str):
+        import string
+        self.source = source
+        self.segments = []
+        self.fields = []
+        parts = []
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            if spec or conversion:
+                raise ValueError(f"Unsupported format spec in template field {field!r}")
+            self.segments.append((literal, field))
+            parts.append(literal.replace('%', '%%'))
+            if field is not None:
+                parts.append(f"%({field})s")
+                if field not in self.fields:
+                    self.fields.append(field)
+        self._compiled = ''.join(parts)
 
-    if platform.system() == 'Darwin':
-        subprocess.run(['open', mailto_url], check=False)
-    elif platform.system() == 'Linux':
-        subprocess.run(['xdg-open', mailto_url], check=False)
-    else:
-        print(f"\n>>> Send email to: {to}")
-        print(f">>> Subject: {subject}")
+    def render(self, fields: dict) -> str:
+        return self._compiled % fields
 
-def open_url(url: str):
-    """Open URL in default browser."""
-    if platform.system() == 'Darwin':
-        subprocess.run(['open', url], check=False)
-    elif platform.system() == 'Linux':
-        subprocess.run(['xdg-open', url], check=False)
-    else:
-        print(f"\n>>> Open this URL: {url}")
+    def render_many(self, field_dicts) -> list:
+        """Render once per field dict, e.g. one per constituent profile."""
+        compiled = self._compiled
+        return [compiled % fields for fields in field_dicts]
 
-def log_action(config: dict, action_type: str, target: str, method: str):
-    """Log an advocacy action taken."""
-    if "actions_taken" not in config:
-        config["actions_taken"] = []
+TEMPLATE_SOURCES = {
+    "ceo_call": CEO_CALL_SCRIPT,
+    "ceo_email": CEO_EMAIL_TEMPLATE,
+    "congress_call": CONGRESS_CALL_SCRIPT,
+    "congress_email": CONGRESS_EMAIL_TEMPLATE,
+}
 
-    config["actions_taken"].append({
-        "date": datetime.now().isoformat(),
-        "type": action_type,
-        "target": target,
-        "method": method
-    })
-    save_config(config)
+@functools.lru_cache(maxsize=None)
+def get_template(name: str) -> CompiledTemplate:
+    """Compile a named template the first time it is needed."""
+    return CompiledTemplate(TEMPLATE_SOURCES[name])
 
-# ============================================================================
-# MENU SCREENS
-# ============================================================================
+CUSTOMER_TYPE = "customer and community member"
 
-def print_banner():
-    clear_screen()
-    print("""
-╔══════════════════════════════════════════════════════════════════╗
-║                                                                  ║
-║     ██╗ ██████╗███████╗     █████╗  ██████╗████████╗██╗ ██████╗  ║
-║     ██║██╔════╝██╔════╝    ██╔══██╗██╔════╝╚══██╔══╝██║██╔═══██╗ ║
-║     ██║██║     █████╗      ███████║██║        ██║   ██║██║   ██║ ║
-║     ██║██║     ██╔══╝      ██╔══██║██║        ██║   ██║██║   ██║ ║
-║     ██║╚██████╗███████╗    ██║  ██║╚██████╗   ██║   ██║╚██████╔╝ ║
-║     ╚═╝ ╚═════╝╚══════╝    ╚═╝  ╚═╝ ╚═════╝   ╚═╝   ╚═╝ ╚═════╝  ║
-║                                                                  ║
-║         TELL CORPORATIONS: DON'T COOPERATE WITH ICE              ║
-║         One-stop advocacy hub - no research needed               ║
-║                                                                  ║
-╚══════════════════════════════════════════════════════════════════╝
-    """)
+def ceo_fields(profile: dict, target: dict) -> dict:
+    return {
+        "company": target['company'],
+        "ceo": target['ceo'],
+        "phone": target['phone'],
+        "user_name": profile.get('user_name', 'A concerned citizen'),
+        "user_address": profile.get('user_address', ''),
+        "user_city": profile.get('user_city', ''),
+        "user_state": profile.get('user_state', ''),
+        "zip_code": profile.get('zip_code', ''),
+        "customer_type": CUSTOMER_TYPE,
+    }
 
-def setup_user(config: dict) -> dict:
-    """Quick setup for new users."""
-    print("\n" + "="*60)
-    print("QUICK SETUP - We need a few details to personalize your messages")
-    print("="*60 + "\n")
+def congress_fields(profile: dict) -> dict:
+    return {
+        "user_name": profile.get('user_name', '[YOUR NAME]'),
+        "user_address": profile.get('user_address', '[YOUR ADDRESS]'),
+        "user_city": profile.get('user_city', '[YOUR CITY]'),
+        "user_state": profile.get('user_state', '[STATE]'),
+        "zip_code": profile.get('zip_code', '[ZIP]'),
+    }
 
-    config["user_name"] = input("Your full name: ").strip()
-    config["user_address"] = input("Street address: ").strip()
-    config["user_city"] = input("City: ").strip()
-    config["user_state"] = input("State (e.g., CA, NY): ").strip().upper()
-    config["zip_code"] = input("ZIP code: ").strip()
-    config["user_email"] = input("Email (optional, press Enter to skip): ").strip()
-    config["phone"] = input("Phone (optional, press Enter to skip): ").strip()
+# Rendered output is cached per (template, target, profile) so repeated views
+# of the same script - e.g. "call" then "copy script" - render only once.
+@functools.lru_cache(maxsize=1024)
+def _render_ceo(name: str, fields: tuple) -> str:
+    return get_template(name).render(dict(fields))
 
-    save_config(config)
-    print("\n✓ Setup complete! Your info is saved for future use.")
-    input("\nPress Enter to continue...")
-    return config
+def _ceo_keys(profile: dict, target: dict) -> tuple:
+    """ceo_fields() as a hashable cache key, so batch and menu renders can't drift apart."""
+    return tuple(ceo_fields(profile, target).items())
 
-def main_menu():
-    print("""
-┌──────────────────────────────────────────────────────────────────┐
-│  MAIN MENU                                                       │
-├──────────────────────────────────────────────────────────────────┤
-│                                                                  │
-│  1. 📞 CONTACT CORPORATE CEOs                                    │
-│     Call or email CEOs of companies complicit with ICE           │
-│                                                                  │
-│  2. 🏛️  CONTACT CONGRESS                                         │
-│     Call your senators and representatives about ICE funding     │
-│                                                                  │
-│  3. 📝 STAND UP AMERICA PETITION                                 │
-│     Quick online petition to freeze ICE funding                  │
-│                                                                  │
-│  4. 📊 VIEW YOUR ADVOCACY STATS                                  │
-│     See how many actions you've taken                            │
-│                                                                  │
-│  5. ⚙️  UPDATE YOUR INFO                                          │
-│     Change your name, address, etc.                              │
-│                                                                  │
-│  6. 📚 RESOURCES & KNOW YOUR RIGHTS                              │
-│                                                                  │
-│  0. Exit                                                         │
-│                                                                  │
-└──────────────────────────────────────────────────────────────────┘
-    """)
-    return input("Select an option: ").strip()
+@instrumented
+def render_ceo_call_script(profile: dict, target: dict) -> str:
+    return _render_ceo("ceo_call", _ceo_keys(profile, target))
+
+@instrumented
+def render_ceo_email(profile: dict, target: dict) -> str:
+    return _render_ceo("ceo_email", _ceo_keys(profile, target))
+
+@instrumented
+def render_congress_call_script(profile: dict) -> str:
+    return get_template("congress_call").render(congress_fields(profile))
+
+@instrumented
+def render_congress_email(profile: dict) -> str:
+    return get_template("congress_email").render(congress_fields(profile))
 
 # ============================================================================
-# CORPORATE CEO ACTIONS
+# SITE DATA - tables shared with the web front-end (index.html)
 # ============================================================================
+# index.html carries the representative, organization and news data as
+# JavaScript object literals. These helpers read them straight from the page
+# so the CLI and the site never drift apart.
 
-def corporate_menu(config: dict):
-    """Menu for contacting corporate CEOs."""
-    while True:
-        clear_screen()
-        print("""
-╔══════════════════════════════════════════════════════════════════╗
-║  TELL CORPORATIONS: DON'T COOPERATE WITH ICE                     ║
-╠══════════════════════════════════════════════════════════════════╣
-║  Select a company to contact their CEO:                          ║
-╚══════════════════════════════════════════════════════════════════╝
-""")
+SITE_HTML = os.path.join(os.path.dirname(os.path.abspath(__file__)), "index.html")
 
-        # Show complicit companies first
-        complicit = [c for c in CEO_TARGETS if c.get("complicit")]
-        others = [c for c in CEO_TARGETS if not c.get("complicit")]
+class _JSLiteralParser:
+    """Parser for the JSON-like subset of JavaScript used by the site's tables:
+    objects (bare or quoted keys), arrays, strings in any quote style,
+    numbers, true/false/null/undefined, comments and trailing commas."""
 
-        print("  COMPANIES WITH ICE TIES:")
-        print("  " + "─"*60)
-        for i, target in enumerate(complicit, 1):
-            status = "🔴" if target.get("complicit") else "⚪"
-            print(f"  {i:2}. {status} {target['company']:<15} - {target['ceo']} ({target['title']})")
+    _ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
 
-        if others:
-            print("\n  OTHER MAJOR CORPORATIONS:")
-            print("  " + "─"*60)
-            for i, target in enumerate(others, len(complicit) + 1):
-                print(f"  {i:2}. ⚪ {target['company']:<15} - {target['ceo']} ({target['title']})")
+    def __init__(self, text: str, pos: int = 0):
+        self.text = text
+        self.pos = pos
 
-        print("\n  0. Back to main menu")
-        print()
+    def error(self, message: str):
+        line = self.text.count('\n', 0, self.pos) + 1
+        return ValueError(f"{message} at line {line} of {SITE_HTML}")
 
-        choice = input("  Select company number: ").strip()
+    def skip(self):
+        text = self.text
+        while True:
+            while self.pos < len(text) and text[self.pos].isspace():
+                self.pos += 1
+            if text.startswith('//', self.pos):
+                end = text.find('\n', self.pos)
+                self.pos = len(text) if end < 0 else end
+            elif text.startswith('/*', self.pos):
+                self.pos = text.index('*/', self.pos) + 2
+            else:
+                return
 
-        if choice == '0':
-            return
+    def value(self):
+        self.skip()
+        ch = self.text[self.pos]
+        if ch == '{':
+            return self.obj()
+        if ch == '[':
+            return self.arr()
+        if ch in '\'"`':
+            return self.string()
+        for word, result in (('true', True), ('false', False), ('null', None), ('undefined', None)):
+            if self.text.startswith(word, self.pos):
+                self.pos += len(word)
+                return result
+        return self.number()
+
+    def obj(self) -> dict:
+        result = {}
+        self.pos += 1
+        while True:
+            self.skip()
+            if self.text[self.pos] == '}':
+                self.pos += 1
+                return result
+            if self.text[self.pos] in '\'"`':
+                key = self.string()
+            else:
+                start = self.pos
+                while self.text[self.pos].isalnum() or self.text[self.pos] in '_$':
+                    self.pos += 1
+                key = self.text[start:self.pos]
+                if not key:
+                    raise self.error("Expected object key")
+            self.skip()
+            if self.text[self.pos] != ':':
+                raise self.error("Expected ':'")
+            self.pos += 1
+            result[key] = self.value()
+            self.skip()
+            if self.text[self.pos] == ',':
+                self.pos += 1
 
+    def arr(self) -> list:
+        result = []
+        self.pos += 1
+        while True:
+            self.skip()
+            if self.text[self.pos] == ']':
+                self.pos += 1
+                return result
+            result.append(self.value())
+            self.skip()
+            if self.text[self.pos] == ',':
+                self.pos += 1
+
+    def string(self) -> str:
+        text = self.text
+        quote = text[self.pos]
+        self.pos += 1
+        parts = []
+        while True:
+            ch = text[self.pos]
+            if ch == quote:
+                self.pos += 1
+                return ''.join(parts)
+            if ch == '\\':
+                nxt = text[self.pos + 1]
+                if nxt == 'u':
+                    parts.append(chr(int(text[self.pos + 2:self.pos + 6], 16)))
+                    self.pos += 6
+                    continue
+                parts.append(self._ESCAPES.get(nxt, nxt))
+                self.pos += 2
+                continue
+            parts.append(ch)
+            self.pos += 1
+
+    def number(self):
+        start = self.pos
+        while self.pos < len(self.text) and (self.text[self.pos].isalnum() or self.text[self.pos] in '.-+'):
+            self.pos += 1
+        token = self.text[start:self.pos]
         try:
-            idx = int(choice) - 1
-            all_targets = complicit + others
-            if 0 <= idx < len(all_targets):
-                contact_ceo(config, all_targets[idx])
+            return float(token) if '.' in token else int(token)
         except ValueError:
-            pass
+            raise self.error(f"Unexpected token {token!r}") from None
+
+@functools.lru_cache(maxsize=None)
+def _site_source() -> str:
+    with open(SITE_HTML, encoding='utf-8') as f:
+        return f.read()
+
+@instrumented
+@functools.lru_cache(maxsize=None)
+def load_site_table(name: str):
+    """Return the value of `const <name> = ...` from index.html as Python data."""
+    import re
+    match = re.search(rf"\bconst {re.escape(name)}\s*=\s*", _site_source())
+    if not match:
+        raise KeyError(f"No table named {name!r} in {SITE_HTML}")
+    return _JSLiteralParser(_site_source(), match.end()).value()
+
+# ============================================================================
+# REPRESENTATIVE LOOKUP - offline ZIP -> senators + House rep
+# ============================================================================
+
+REPS_INDEX_FILE = os.path.expanduser("~/.ice_advocacy_reps.idx")
+
+# ZIP3 prefix ranges -> state, ported from getStateFromZip() in index.html
+ZIP3_STATE_RANGES = [
+    (10, 27, 'MA'), (28, 29, 'RI'), (30, 38, 'NH'), (39, 49, 'ME'), (50, 59, 'VT'),
+    (60, 69, 'CT'), (70, 89, 'NJ'), (100, 149, 'NY'), (150, 196, 'PA'), (197, 199, 'DE'),
+    (200, 200, 'DC'), (202, 205, 'DC'), (206, 219, 'MD'), (220, 246, 'VA'), (247, 268, 'WV'),
+    (270, 289, 'NC'), (290, 299, 'SC'), (300, 319, 'GA'), (320, 349, 'FL'), (350, 369, 'AL'),
+    (370, 385, 'TN'), (386, 397, 'MS'), (398, 399, 'GA'), (400, 427, 'KY'), (430, 459, 'OH'),
+    (460, 479, 'IN'), (480, 499, 'MI'), (500, 528, 'IA'), (530, 549, 'WI'), (550, 567, 'MN'),
+    (569, 569, 'DC'), (570, 577, 'SD'), (580, 588, 'ND'), (590, 599, 'MT'), (600, 629, 'IL'),
+    (630, 658, 'MO'), (660, 679, 'KS'), (680, 693, 'NE'), (700, 714, 'LA'), (716, 729, 'AR'),
+    (730, 749, 'OK'), (750, 799, 'TX'), (800, 816, 'CO'), (820, 831, 'WY'), (832, 838, 'ID'),
+    (840, 847, 'UT'), (850, 865, 'AZ'), (870, 884, 'NM'), (885, 885, 'TX'), (890, 898, 'NV'),
+    (900, 961, 'CA'), (967, 968, 'HI'), (970, 979, 'OR'), (980, 994, 'WA'), (995, 999, 'AK'),
+]
+
+class RepresentativeIndex:
+    """ZIP -> representatives, answered from two flat 1000-slot tables.
+
+    Every US ZIP's state and (where index.html knows it) House district are
+    determined by its first three digits, so the whole index is one byte of
+    state id plus one uint16 rep id per ZIP3 prefix. The prebuilt file holds
+    those tables followed by a JSON payload of the people themselves, and
+    is memory-mapped rather than parsed when loaded; close() unmaps it.
+    """
+
+    MAGIC = b"ICEREPS1"
+
+    def __init__(self, state_table, rep_table, payload: dict, mapping=None):
+        self._state_table = state_table
+        self._rep_table = rep_table
+        self._map = mapping
+        self.payload = payload
+        self.states = payload['states']
+        self.reps = payload['reps']
+        self.senators = payload['senators']
+        self.at_large = payload['at_large']
+        self._members = {}
+        for rep in self.reps:
+            self._members.setdefault((rep['state'], rep['district']), rep)
+
+    @classmethod
+    def build(cls) -> "RepresentativeIndex":
+        from array import array
+        senators = load_site_table('senatorsDB')
+        house = load_site_table('houseRepsDB')
+        districts = load_site_table('zipToDistrictDB')
+
+        states = sorted({s for _, _, s in ZIP3_STATE_RANGES} | set(senators) | set(house))
+        state_table = bytearray(1000)
+        for lo, hi, state in ZIP3_STATE_RANGES:
+            for z3 in range(lo, hi + 1):
+                state_table[z3] = states.index(state) + 1
+
+        reps, rep_ids = [], {}
+        for state, members in house.items():
+            for rep in members:
+                reps.append(dict(rep, state=state))
+                rep_ids.setdefault((state, rep['district']), len(reps))
+        rep_table = array('H', bytes(2000))
+        for prefix, info in districts.items():
+            rep_table[int(prefix)] = rep_ids.get((info['state'], info['district']), 0)
+
+        payload = {
+            "states": states,
+            "reps": reps,
+            "senators": senators,
+            "at_large": {state: rep_ids[(state, members[0]['district'])]
+                         for state, members in house.items() if len(members) == 1},
+        }
+        return cls(state_table, rep_table, payload)
+
+    def save(self, path: str, source_stamp: list):
+        payload = json.dumps(dict(self.payload, source=source_stamp), separators=(',', ':'))
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(bytes(self._state_table))
+            f.write(self._rep_table.tobytes())
+            f.write(payload.encode('utf-8'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, source_stamp: list = None):
+        """Map a prebuilt index; None if it is missing, corrupt or stale."""
+        import mmap
+        try:
+            with open(path, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        start = len(cls.MAGIC)
+        try:
+            if data[:start] != cls.MAGIC:
+                raise ValueError("not a representative index")
+            payload = json.loads(data[start + 3000:])
+            if source_stamp is not None and payload.get('source') != source_stamp:
+                raise ValueError("built from an older index.html")
+        except ValueError:
+            data.close()
+            return None
+        view = memoryview(data)
+        return cls(view[start:start + 1000], view[start + 1000:start + 3000].cast('H'), payload, data)
+
+    def close(self):
+        """Unmap the index file this was loaded from; lookups fail afterwards."""
+        if self._map is not None:
+            self._state_table.release()
+            self._rep_table.release()
+            self._map.close()
+            self._map = None
+
+    def house_member(self, state: str, district: str):
+        """The House member for a state and district number, or None."""
+        return self._members.get((state, district))
+
+    def state_for_zip(self, zip_code: str) -> str:
+        if len(zip_code) < 3 or not zip_code[:3].isdigit():
+            return ''
+        state_id = self._state_table[int(zip_code[:3])]
+        return self.states[state_id - 1] if state_id else ''
+
+    def lookup(self, zip_code: str, state: str = '') -> dict:
+        """Senators and House member for a ZIP (state taken from the ZIP if not given)."""
+        zip_code = zip_code.strip()[:5]
+        state = (state or self.state_for_zip(zip_code)).upper()
+        house = []
+        if zip_code[:3].isdigit():
+            rep_id = self._rep_table[int(zip_code[:3])]
+            if rep_id and self.reps[rep_id - 1]['state'] == state:
+                house.append(self.reps[rep_id - 1])
+        if not house and state in self.at_large:
+            house.append(self.reps[self.at_large[state] - 1])
+        return {
+            "zip": zip_code,
+            "state": state,
+            "district": house[0]['district'] if house else '',
+            "senators": self.senators.get(state, []),
+            "house": house,
+        }
+
+def _site_stamp() -> list:
+    st = os.stat(SITE_HTML)
+    return [st.st_mtime_ns, st.st_size]
+
+_rep_index = None
+
+@instrumented
+def get_rep_index() -> RepresentativeIndex:
+    """Load the prebuilt index, rebuilding it if index.html has changed."""
+    global _rep_index
+    if _rep_index is None:
+        stamp = _site_stamp()
+        _rep_index = RepresentativeIndex.load(REPS_INDEX_FILE, stamp)
+        if _rep_index is None:
+            _rep_index = RepresentativeIndex.build()
+            try:
+                _rep_index.save(REPS_INDEX_FILE, stamp)
+            except OSError:
+                pass
+    return _rep_index
+
+# Exact House districts from the Google Civic API, when a key is configured.
+# ZIP3 prefixes often span several districts; an address pins it down.
+CIVIC_API_KEY = os.environ.get("ICE_ADVOCACY_CIVIC_KEY", "")
+CIVIC_DIVISIONS_URL = "https://civicinfo.googleapis.com/civicinfo/v2/divisionsByAddress"
+# District lines move once a decade
+CIVIC_TTL = 30 * 24 * 3600
+
+def civic_divisions(address: str) -> dict:
+    """{ocd division id: name} for an address, through the fetch cache."""
+    response = get_http_cache().fetch(CIVIC_DIVISIONS_URL, {"address": address, "key": CIVIC_API_KEY},
+                                      ttl=CIVIC_TTL)
+    divisions = json.loads(response["body"]).get("divisions", {})
+    return {ocd_id: division.get("name", "") for ocd_id, division in divisions.items()}
+
+def civic_house_district(profile: dict) -> str:
+    """The profile's congressional district number, '' if unknown or ambiguous."""
+    profile = normalize_profile(profile)
+    if profile['user_address'] and profile['user_city']:
+        address = (f"{profile['user_address']}, {profile['user_city']}, "
+                   f"{profile['user_state']} {profile['zip_code']}")
+    else:
+        address = profile['zip_code'][:5]
+    if not CIVIC_API_KEY or not address:
+        return ''
+    districts = {ocd_id.rsplit(":", 1)[1] for ocd_id in civic_divisions(address)
+                 if "/cd:" in ocd_id}
+    return districts.pop() if len(districts) == 1 else ''
+
+# ============================================================================
+# TARGET REGISTRY - indexed, searchable list of companies to contact
+# ============================================================================
+# CEO_TARGETS are the featured companies. ICE_ADVOCACY_TARGETS can point at a
+# JSON or CSV file with more (same fields as CEO_TARGETS, plus an optional
+# "state"), and the contractor lists from index.html are folded in too.
+
+TARGETS_FILE = os.environ.get("ICE_ADVOCACY_TARGETS", "")
+
+_COMPANY_SUFFIXES = {"inc", "inc.", "corp", "corp.", "co", "co.", "company", "llc",
+                     "technologies", "international", "group"}
+
+def company_key(name: str) -> str:
+    """Normalize a company name so "Palantir Technologies" matches "Palantir"."""
+    import re
+    words = re.sub(r"\(.*?\)", " ", name.lower()).split()
+    return " ".join(w for w in words if w not in _COMPANY_SUFFIXES) or name.lower()
+
+def load_targets_file(path: str) -> list:
+    """Read extra targets from a JSON list or a CSV with CEO_TARGETS' columns."""
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.json'):
+            return json.load(f)
+        import csv
+        targets = []
+        for row in csv.DictReader(f):
+            row['complicit'] = row.get('complicit', '').strip().lower() in ('1', 'true', 'yes', 'x')
+            targets.append(row)
+        return targets
+
+def site_targets() -> list:
+    """ICE contractors and tech companies from index.html, as CEO_TARGETS entries."""
+    targets = []
+    for entry in load_site_table('iceCompaniesDB') + load_site_table('iceRetailersDB'):
+        hq = entry.get('hq') or ''
+        targets.append({
+            "company": entry['name'],
+            "ceo": entry.get('contact') or "Executive Leadership",
+            "title": entry.get('type', ''),
+            "phone": entry.get('phone') or '',
+            "email": entry.get('email') or '',
+            "complicit": True,
+            "notes": entry.get('notes', ''),
+            "state": hq.rpartition(', ')[2] if ', ' in hq else '',
+            "source": "site",
+        })
+    return targets
+
+class TargetRegistry:
+    """Targets with precomputed indexes by company, CEO, complicity and state.
+
+    search() answers exact and prefix queries from a sorted token list with
+    bisect, falling back to fuzzy matching only when nothing matches.
+    """
+
+    def __init__(self, targets: list):
+        import bisect
+        self._bisect = bisect.bisect_left
+        self.targets = []
+        self.by_company = {}
+        for target in targets:
+            key = company_key(target['company'])
+            if key in self.by_company:
+                continue
+            self.by_company[key] = len(self.targets)
+            self.targets.append(target)
+
+        self.complicit = [t for t in self.targets if t.get("complicit")]
+        self.others = [t for t in self.targets if not t.get("complicit")]
+        self.by_ceo = {}
+        self.by_state = {}
+        tokens = []
+        for i, target in enumerate(self.targets):
+            self.by_ceo.setdefault(target['ceo'].lower(), []).append(i)
+            if target.get('state'):
+                self.by_state.setdefault(target['state'].upper(), []).append(i)
+            for text in (target['company'], target['ceo']):
+                text = text.lower()
+                tokens.append((text, i))
+                tokens.extend((word, i) for word in text.split()[1:])
+        self._tokens = sorted(tokens)
+        self._names = sorted({text for text, _ in tokens})
+        self._name_index = {}
+        for text, i in tokens:
+            self._name_index.setdefault(text, []).append(i)
+        self._trigrams = {}
+        for n, name in enumerate(self._names):
+            for tri in self._trigrams_of(name):
+                self._trigrams.setdefault(tri, []).append(n)
+
+    @staticmethod
+    def _trigrams_of(text: str) -> set:
+        padded = f"  {text} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    @classmethod
+    def load(cls, path: str = TARGETS_FILE, include_site: bool = True) -> "TargetRegistry":
+        targets = list(CEO_TARGETS)
+        if path:
+            targets.extend(load_targets_file(path))
+        if include_site:
+            try:
+                targets.extend(site_targets())
+            except (OSError, KeyError, ValueError):
+                pass
+        return cls(targets)
+
+    def featured(self) -> list:
+        """Targets for the numbered menu: complicit first, site contractors excluded."""
+        return ([t for t in self.complicit if t.get('source') != 'site']
+                + [t for t in self.others if t.get('source') != 'site'])
+
+    def in_state(self, state: str) -> list:
+        return [self.targets[i] for i in self.by_state.get(state.upper(), [])]
+
+    @instrumented
+    def search(self, query: str, limit: int = 10) -> list:
+        """Company or CEO names matching query, best matches first."""
+        import difflib
+        q = query.strip().lower()
+        if not q:
+            return []
+        seen, results = set(), []
+
+        def add(i):
+            if i not in seen:
+                seen.add(i)
+                results.append(self.targets[i])
+
+        if company_key(q) in self.by_company:
+            add(self.by_company[company_key(q)])
+        for i in self.by_ceo.get(q, []):
+            add(i)
+        pos = self._bisect(self._tokens, (q,))
+        while pos < len(self._tokens) and len(results) < limit:
+            token, i = self._tokens[pos]
+            if not token.startswith(q):
+                break
+            add(i)
+            pos += 1
+        if not results:
+            # Only names sharing the most trigrams with the query are scored
+            shared = {}
+            for tri in self._trigrams_of(q):
+                for n in self._trigrams.get(tri, ()):
+                    shared[n] = shared.get(n, 0) + 1
+            best = sorted(shared, key=shared.get, reverse=True)[:50]
+            candidates = [self._names[n] for n in best]
+            for name in difflib.get_close_matches(q, candidates, n=limit, cutoff=0.6):
+                for i in self._name_index[name]:
+                    add(i)
+        return results[:limit]
+
+_target_registry = None
+
+@instrumented
+def get_target_registry() -> TargetRegistry:
+    global _target_registry
+    if _target_registry is None:
+        _target_registry = TargetRegistry.load()
+    return _target_registry
+
+# ============================================================================
+# FETCH CACHE - remote data downloaded once, then revalidated cheaply
+# ============================================================================
+# fetch() keeps responses on disk under FETCH_CACHE_DIR, keyed by URL and
+# parameters. Within `ttl` seconds a response is served with no network at
+# all. For `stale` seconds after that it is still served at once while a
+# background request refreshes it. Beyond that the request is conditional
+# (If-None-Match / If-Modified-Since), so an unchanged resource costs a 304
+# and no body. If the network is down, the last copy is served regardless.
+
+FETCH_CACHE_DIR = os.path.expanduser("~/.ice_advocacy_http")
+FETCH_TTL = 15 * 60
+STALE_WHILE_REVALIDATE = 24 * 3600
+FETCH_TIMEOUT = 30
+# How long exit waits for background refreshes to land
+REFRESH_GRACE = 5
+
+class HTTPCache:
+    """On-disk HTTP cache with TTLs, conditional revalidation and stale-while-revalidate."""
+
+    def __init__(self, folder: str = FETCH_CACHE_DIR):
+        import threading
+        self.folder = folder
+        self.stats = {"fresh": 0, "stale": 0, "revalidated": 0, "downloaded": 0, "failed": 0}
+        self._lock = threading.Lock()
+        self._refreshing = {}
+        self._exit_hook = False
+
+    @staticmethod
+    def key(url: str, params: dict = None) -> str:
+        import hashlib
+        from urllib.parse import urlencode
+        full = url + ("?" + urlencode(sorted(params.items())) if params else "")
+        return hashlib.blake2b(full.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _paths(self, key: str) -> tuple:
+        return os.path.join(self.folder, key + ".json"), os.path.join(self.folder, key + ".body")
+
+    def _load(self, key: str):
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        # A body from a different write than its metadata
+        return (meta, body) if len(body) == meta.get("length") else None
+
+    def _save(self, key: str, meta: dict, body: bytes = None):
+        import tempfile
+        os.makedirs(self.folder, exist_ok=True)
+        meta_path, body_path = self._paths(key)
+        if body is not None:
+            fd, tmp_path = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, body_path)
+        atomic_write_json(meta_path, meta, durable=False)
+
+    def _count(self, outcome: str):
+        with self._lock:
+            self.stats[outcome] += 1
+
+    @staticmethod
+    def _response(meta: dict, body: bytes, source: str) -> dict:
+        import time
+        return {"status": meta["status"], "headers": meta["headers"], "body": body,
+                "source": source, "age": time.time() - meta["fetched"]}
+
+    def fetch(self, url: str, params: dict = None, ttl: float = FETCH_TTL,
+              stale: float = STALE_WHILE_REVALIDATE, timeout: float = FETCH_TIMEOUT) -> dict:
+        """GET url?params: {status, headers, body, source, age}.
+
+        source says where the body came from: "cache" (fresh), "stale"
+        (being refreshed in the background, or the network failed),
+        "revalidated" (the server said 304) or "network".
+        """
+        import time
+        key = self.key(url, params)
+        cached = self._load(key)
+        if cached:
+            meta, body = cached
+            age = time.time() - meta["fetched"]
+            if age < ttl:
+                self._count("fresh")
+                return self._response(meta, body, "cache")
+            if age < ttl + stale:
+                self._count("stale")
+                self._refresh_later(key, url, params, timeout)
+                return self._response(meta, body, "stale")
+        return self._request(key, url, params, cached, timeout)
+
+    def _request(self, key: str, url: str, params: dict, cached, timeout: float) -> dict:
+        import time
+        import urllib.error
+        import urllib.request
+        from urllib.parse import urlencode
+        headers = {"User-Agent": "ice-advocacy-tool"}
+        if cached:
+            if cached[0]["headers"].get("etag"):
+                headers["If-None-Match"] = cached[0]["headers"]["etag"]
+            if cached[0]["headers"].get("last-modified"):
+                headers["If-Modified-Since"] = cached[0]["headers"]["last-modified"]
+        request = urllib.request.Request(url + ("?" + urlencode(params) if params else ""),
+                                         headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                status, body = response.status, response.read()
+                received = {k.lower(): v for k, v in response.headers.items()}
+        except urllib.error.HTTPError as exc:
+            if exc.code == 304 and cached:
+                meta, body = cached
+                meta["fetched"] = time.time()
+                if exc.headers.get("ETag"):
+                    meta["headers"]["etag"] = exc.headers["ETag"]
+                self._save(key, meta)
+                self._count("revalidated")
+                return self._response(meta, body, "revalidated")
+            if cached and exc.code >= 500:
+                self._count("failed")
+                return self._response(*cached, "stale")
+            raise
+        except OSError:
+            if cached:
+                self._count("failed")
+                return self._response(*cached, "stale")
+            raise
+
+        # The URL alone: params may carry API keys
+        meta = {"url": url, "status": status, "fetched": time.time(), "length": len(body),
+                "headers": {k: received[k] for k in ("etag", "last-modified", "content-type")
+                            if k in received}}
+        if "no-store" not in received.get("cache-control", ""):
+            self._save(key, meta, body)
+        self._count("downloaded")
+        return self._response(meta, body, "network")
+
+    def _refresh_later(self, key: str, url: str, params: dict, timeout: float):
+        import threading
+        with self._lock:
+            if key in self._refreshing:
+                return
+            if not self._exit_hook:
+                import atexit
+                atexit.register(self.wait, REFRESH_GRACE)
+                self._exit_hook = True
+
+            def refresh():
+                try:
+                    self._request(key, url, params, self._load(key), timeout)
+                except (OSError, ValueError):
+                    self._count("failed")
+                finally:
+                    with self._lock:
+                        self._refreshing.pop(key, None)
+
+            thread = threading.Thread(target=refresh, daemon=True)
+            self._refreshing[key] = thread
+        thread.start()
+
+    def wait(self, timeout: float = None):
+        """Wait for background refreshes to finish."""
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for thread in threads:
+            thread.join(timeout)
+
+_http_cache = None
+
+def get_http_cache() -> HTTPCache:
+    global _http_cache
+    if _http_cache is None:
+        _http_cache = HTTPCache()
+    return _http_cache
+
+# ============================================================================
+# COMMUNITY EVENTS - the community-submitted events sheet, prebuilt by state
+# ============================================================================
+# index.html fetches this sheet on every page load and splits it on commas,
+# which breaks on quoted fields. `advocacy_tool.py ingest-events` instead
+# stream-parses the CSV export, validates each approved row and keeps an
+# index by state and date. Every row is keyed by a hash of its contents, so
+# re-ingesting only parses rows that are new or were edited.
+
+EVENTS_SHEET_URL = ("https://docs.google.com/spreadsheets/d/"
+                    "1OWpGSjv_RB8V3J6hvaDHkEn1UvTQxKm8woSSzP1YtAY/export?format=csv&gid=0")
+EVENTS_INDEX_FILE = os.path.expanduser("~/.ice_advocacy_events.json")
+
+STATE_NAMES = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR", "california": "CA",
+    "colorado": "CO", "connecticut": "CT", "delaware": "DE", "district of columbia": "DC",
+    "florida": "FL", "georgia": "GA", "hawaii": "HI", "idaho": "ID", "illinois": "IL",
+    "indiana": "IN", "iowa": "IA", "kansas": "KS", "kentucky": "KY", "louisiana": "LA",
+    "maine": "ME", "maryland": "MD", "massachusetts": "MA", "michigan": "MI", "minnesota": "MN",
+    "mississippi": "MS", "missouri": "MO", "montana": "MT", "nebraska": "NE", "nevada": "NV",
+    "new hampshire": "NH", "new jersey": "NJ", "new mexico": "NM", "new york": "NY",
+    "north carolina": "NC", "north dakota": "ND", "ohio": "OH", "oklahoma": "OK", "oregon": "OR",
+    "pennsylvania": "PA", "puerto rico": "PR", "rhode island": "RI", "south carolina": "SC",
+    "south dakota": "SD", "tennessee": "TN", "texas": "TX", "utah": "UT", "vermont": "VT",
+    "virginia": "VA", "washington": "WA", "west virginia": "WV", "wisconsin": "WI", "wyoming": "WY",
+}
+STATE_CODES = frozenset(STATE_NAMES.values())
+
+# Column matching rules from loadCommunityEvents(): field -> header test
+EVENT_COLUMNS = {
+    "email": lambda h: "email" in h,
+    "name": lambda h: "event" in h and "name" in h,
+    "date": lambda h: "date" in h,
+    "city": lambda h: "city" in h,
+    "state": lambda h: "state" in h,
+    "org": lambda h: "organization" in h,
+    "link": lambda h: "link" in h or "website" in h,
+    "desc": lambda h: "description" in h,
+    "type": lambda h: "type" in h,
+    "approved": lambda h: "approved" in h,
+}
+EVENT_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%m-%d-%Y",
+                      "%B %d, %Y", "%b %d, %Y", "%B %d %Y", "%b %d %Y")
+RECURRING_DATES = {"ongoing", "weekly", "monthly", "daily", "biweekly", "tbd"}
+NOT_APPROVED = {"", "false", "no", "n", "0"}
+
+def normalize_state(value: str) -> str:
+    """Two-letter code for a state code or name, '' if it isn't one."""
+    value = value.strip().rstrip('.')
+    code = value.upper()
+    if code in STATE_CODES or code == "ALL":
+        return code
+    return STATE_NAMES.get(value.lower(), '')
+
+def normalize_event_date(value: str) -> tuple:
+    """(label, ISO day) - day is '' for recurring or unparseable dates."""
+    from datetime import datetime
+    value = " ".join(value.split())
+    if not value or value.lower() in RECURRING_DATES:
+        return (value.title() or "TBD"), ''
+    for candidate in (value, value.split(" ")[0]):
+        for fmt in EVENT_DATE_FORMATS:
+            try:
+                day = datetime.strptime(candidate, fmt).date()
+            except ValueError:
+                continue
+            return day.strftime("%b %d, %Y").replace(" 0", " "), day.isoformat()
+    return value, ''
+
+def match_event_columns(header: list) -> dict:
+    header = [h.strip().lower() for h in header]
+    return {field: next((i for i, h in enumerate(header) if test(h)), None)
+            for field, test in EVENT_COLUMNS.items()}
+
+def normalize_event(row: list, columns: dict) -> dict:
+    """Validate one sheet row. Returns None if not approved; raises ValueError if invalid."""
+    def col(field):
+        i = columns[field]
+        return " ".join(row[i].split()) if i is not None and i < len(row) else ''
+
+    if columns["approved"] is None or col("approved").lower() in NOT_APPROVED:
+        return None
+    name = col("name")
+    if not name:
+        raise ValueError("no event name")
+    state = normalize_state(col("state"))
+    if not state:
+        raise ValueError(f"unknown state {col('state')!r}")
+    label, day = normalize_event_date(col("date"))
+    link = col("link")
+    if link and not link.startswith(("http://", "https://")):
+        link = "https://" + link if "." in link and " " not in link else ''
+    return {
+        "date": label,
+        "day": day,
+        "city": col("city") or "Unknown",
+        "state": state,
+        "name": name,
+        "org": col("org") or "Community Submitted",
+        "link": link or "#",
+        "desc": col("desc") or "Community-submitted event.",
+        "type": (col("type") or "rally").lower(),
+    }
+
+def _event_sort_key(event: dict) -> str:
+    # Dated events in date order, then recurring ones
+    return (event["day"] or "9999") + "|" + event["name"].lower()
+
+def open_events_source(source: str, ttl: float = FETCH_TTL, stale: float = STALE_WHILE_REVALIDATE):
+    """A text stream for a local CSV path or an http(s) URL (through the fetch cache)."""
+    import io
+    if source.startswith(("http://", "https://")):
+        response = get_http_cache().fetch(source, ttl=ttl, stale=stale)
+        return io.StringIO(response["body"].decode('utf-8-sig'), newline='')
+    return open(source, encoding='utf-8-sig', newline='')
+
+def load_events_index(path: str = EVENTS_INDEX_FILE) -> dict:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {"header": None, "events": {}, "rejected": {}, "by_state": {}}
+
+@instrumented
+def ingest_events(stream, index: dict) -> dict:
+    """Update `index` in place from a CSV stream; returns counts of what changed.
+
+    Rows whose hash is already indexed are skipped without parsing. Rows
+    that disappeared from the sheet are removed from the state lists, and
+    new ones are inserted in date order, so the index is never rebuilt
+    from scratch unless the sheet's columns change.
+    """
+    import bisect
+    import csv
+    import hashlib
+
+    reader = csv.reader(stream)
+    header = next(reader, [])
+    if header != index.get("header"):
+        index.update(header=header, events={}, rejected={}, by_state={})
+    columns = match_event_columns(header)
+    # A row cut short (a partial last line) would otherwise read as unapproved
+    width = max((i + 1 for i in columns.values() if i is not None), default=0)
+    events, rejected, by_state = index["events"], index["rejected"], index["by_state"]
+
+    counts = {"rows": 0, "unchanged": 0, "added": 0, "removed": 0, "skipped": 0, "rejected": 0}
+    seen = set()
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        counts["rows"] += 1
+        digest = hashlib.blake2b("\x1f".join(row).encode('utf-8'), digest_size=12).hexdigest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        if digest in events or digest in rejected:
+            counts["unchanged"] += 1
+            continue
+        try:
+            if len(row) < width:
+                raise ValueError(f"incomplete row ({len(row)} of {width} columns)")
+            event = normalize_event(row, columns)
+        except ValueError as e:
+            rejected[digest] = f"line {reader.line_num}: {e}"
+            counts["rejected"] += 1
+            continue
+        if event is None:
+            rejected[digest] = "not approved"
+            counts["skipped"] += 1
+            continue
+        events[digest] = event
+        bisect.insort(by_state.setdefault(event["state"], []), [_event_sort_key(event), digest])
+        counts["added"] += 1
+
+    for digest in [d for d in events if d not in seen]:
+        event = events.pop(digest)
+        by_state[event["state"]].remove([_event_sort_key(event), digest])
+        counts["removed"] += 1
+    for digest in [d for d in rejected if d not in seen]:
+        del rejected[digest]
+    return counts
+
+def save_events_index(index: dict, path: str = EVENTS_INDEX_FILE):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def events_near(state: str, index: dict = None, today: str = None) -> list:
+    """Upcoming and recurring community events in `state` plus nationwide ones."""
+    from datetime import date
+    index = index if index is not None else load_events_index()
+    today = today or date.today().isoformat()
+    found = []
+    for code in dict.fromkeys([state.upper(), "ALL"]):
+        for _, digest in index["by_state"].get(code, []):
+            event = index["events"][digest]
+            if not event["day"] or event["day"] >= today:
+                found.append(event)
+    return found
+
+def cmd_ingest_events(args):
+    import time
+    index = load_events_index(args.index)
+    started = time.perf_counter()
+    # --ttl 0 means check for changes now, not in the background
+    stale = STALE_WHILE_REVALIDATE if args.ttl else 0
+    with open_events_source(args.source, args.ttl, stale) as stream:
+        counts = ingest_events(stream, index)
+    save_events_index(index, args.index)
+    if args.source.startswith(("http://", "https://")):
+        outcomes = {"fresh": "reused a recent download", "stale": "reused a download, refreshing it",
+                    "revalidated": "unchanged since the last download", "downloaded": "downloaded",
+                    "failed": "network failed, used the last download"}
+        print("Sheet " + ", ".join(outcomes[k] for k, v in get_http_cache().stats.items() if v) + ".")
+    print(f"{counts['rows']} rows in {time.perf_counter() - started:.2f}s: "
+          f"{counts['added']} added, {counts['removed']} removed, {counts['unchanged']} unchanged, "
+          f"{counts['skipped']} awaiting approval, {counts['rejected']} rejected.")
+    for reason in [r for r in index["rejected"].values() if r != "not approved"][:10]:
+        print(f"  rejected {reason}")
+    print(f"{len(index['events'])} events across {sum(1 for v in index['by_state'].values() if v)} states.")
+
+# ============================================================================
+# DATA BUNDLE - per-state JSON shards compiled from one canonical dataset
+# ============================================================================
+# `advocacy_tool.py build-data` gathers CEO_TARGETS and the site's tables into
+# one dataset and writes it to BUNDLE_DIR as small minified shards - one for
+# nationwide data and one per state - named by content hash, plus a
+# manifest.json pointing at the current files. A client fetches the manifest
+# and then only the shards it needs; hashed names can be cached forever.
+# The manifest records a hash of the sources it was built from; when
+# index.html or CEO_TARGETS have changed since, the bundle is ignored and
+# readers fall back to index.html until build-data is run again.
+#
+# index.html keeps its inline tables: they are the source the bundle (and
+# the representative and place indexes) are compiled from.
+
+BUNDLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Site tables keyed by state code
+STATE_KEYED_TABLES = (
+    "senatorsDB", "houseRepsDB", "houseRepublicansDB", "governorsDB", "stateLegislatorsDB",
+    "majorCitiesDB", "chamberDB", "localInstitutionsDB", "localOrgsDB", "localNewsDB",
+    "localICETiesDB", "stateRSSFeeds",
+)
+# Lists whose rows carry a `state` field ('ALL' or none means nationwide)
+STATE_FIELD_TABLES = ("upcomingProtests", "documentedRaids")
+NATIONAL_TABLES = ("nationalCorporations", "iceCompaniesDB", "iceRetailersDB",
+                   "nationalNews", "institutionTypes")
+
+def bundle_source_hash() -> str:
+    """sha256 of what a bundle is compiled from: index.html and CEO_TARGETS."""
+    import hashlib
+    digest = hashlib.sha256(_site_digest(*_site_stamp()).encode('ascii'))
+    digest.update(json.dumps(CEO_TARGETS, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+@functools.lru_cache(maxsize=1)
+def _site_digest(mtime_ns: int, size: int) -> str:
+    import hashlib
+    with open(SITE_HTML, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def build_dataset() -> dict:
+    """{"national": {table: data}, "states": {code: {table: data}}, "source": hash}."""
+    source = bundle_source_hash()
+    zip3_states = {z3: state for lo, hi, state in ZIP3_STATE_RANGES for z3 in range(lo, hi + 1)}
+    national = {"ceoTargets": CEO_TARGETS}
+    states = {}
+
+    def put(state, table, key, value):
+        shard = states.setdefault(state, {})
+        if key is None:
+            shard.setdefault(table, []).append(value)
+        else:
+            shard.setdefault(table, {})[key] = value
+
+    for table in NATIONAL_TABLES:
+        national[table] = load_site_table(table)
+    for table in STATE_KEYED_TABLES:
+        for state, value in load_site_table(table).items():
+            states.setdefault(state, {})[table] = value
+    for table in STATE_FIELD_TABLES:
+        for row in load_site_table(table):
+            if row.get("state") in (None, "", "ALL"):
+                national.setdefault(table, []).append(row)
+            else:
+                put(row["state"], table, None, row)
+    for table in ("zipToCityMap", "zipToDistrictDB"):
+        for zip_code, value in load_site_table(table).items():
+            state = value["state"] if isinstance(value, dict) else zip3_states.get(int(zip_code[:3]))
+            if state:
+                put(state, table, zip_code, value)
+    return {"national": national, "states": dict(sorted(states.items())), "source": source}
+
+def write_bundle(dataset: dict, out_dir: str = BUNDLE_DIR) -> dict:
+    """Write hashed shards and manifest.json; returns the manifest."""
+    import gzip
+    import hashlib
+
+    os.makedirs(out_dir, exist_ok=True)
+    old_files = set()
+    try:
+        with open(os.path.join(out_dir, "manifest.json"), encoding='utf-8') as f:
+            old_files = {info["file"] for info in json.load(f)["shards"].values()}
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+
+    shards = {"national": dataset["national"], **dataset["states"]}
+    manifest = {"version": 2, "source": dataset.get("source"), "shards": {}}
+    for name, data in shards.items():
+        raw = json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+        digest = hashlib.sha256(raw).hexdigest()
+        filename = f"{name}.{digest[:12]}.json"
+        path = os.path.join(out_dir, filename)
+        if not os.path.exists(path):
+            with open(path + ".tmp", 'wb') as f:
+                f.write(raw)
+            os.replace(path + ".tmp", path)
+        manifest["shards"][name] = {
+            "file": filename,
+            "sha256": digest,
+            "bytes": len(raw),
+            "gzip_bytes": len(gzip.compress(raw, mtime=0)),
+            "records": sum(len(v) if isinstance(v, (list, dict)) else 1 for v in data.values()),
+        }
+
+    tmp_path = os.path.join(out_dir, "manifest.json.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, os.path.join(out_dir, "manifest.json"))
+    for stale in old_files - {info["file"] for info in manifest["shards"].values()}:
+        try:
+            os.remove(os.path.join(out_dir, stale))
+        except FileNotFoundError:
+            pass
+    return manifest
+
+@functools.lru_cache(maxsize=4)
+def _bundle_manifest(path: str, mtime_ns: int):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+@functools.lru_cache(maxsize=64)
+def _bundle_file(path: str):
+    # Shard files are named by content hash, so a path always holds the same data
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def load_bundle_shard(name: str, bundle_dir: str = BUNDLE_DIR):
+    """One shard ('national' or a state code) from a built bundle, or None.
+
+    None means there is no usable bundle - none was built, or its sources
+    have changed since - and the caller should read index.html instead.
+    """
+    path = os.path.join(bundle_dir, "manifest.json")
+    try:
+        manifest = _bundle_manifest(path, os.stat(path).st_mtime_ns)
+    except FileNotFoundError:
+        return None
+    if not manifest or manifest.get("source") != bundle_source_hash():
+        return None
+    info = manifest["shards"].get(name)
+    if not info:
+        return {}
+    try:
+        return _bundle_file(os.path.join(bundle_dir, info["file"]))
+    except (FileNotFoundError, ValueError):
+        return None
+
+def cmd_build_data(args):
+    manifest = write_bundle(build_dataset(), args.out)
+    shards = manifest["shards"]
+    for name, info in sorted(shards.items(), key=lambda kv: -kv[1]["bytes"]):
+        print(f"  {info['file']:<32} {info['records']:>5} records "
+              f"{info['bytes'] / 1024:>8.1f} KiB {info['gzip_bytes'] / 1024:>7.1f} KiB gzipped")
+    total = sum(info["bytes"] for info in shards.values())
+    print(f"{len(shards)} shards, {total / 1024:.1f} KiB in {args.out} "
+          f"(index.html is {os.path.getsize(SITE_HTML) / 1024:.1f} KiB).")
+
+# ============================================================================
+# NEARBY - nearest organizations, raids and offices to a ZIP code
+# ============================================================================
+# index.html has no coordinates, so places are pinned to the city they name,
+# using the table of city centers below. A ZIP is placed at its city from
+# zipToCityMap, else at the metro its 3-digit prefix belongs to, else at the
+# nearest prefix in the same state we know, else at the state's center.
+# Statewide organizations with no city are pinned to the state center too.
+
+EARTH_RADIUS_MILES = 3958.8
+
+CITY_COORDINATES = {
+    "Albuquerque, NM": (35.084, -106.650), "Anchorage, AK": (61.218, -149.900),
+    "Anoka, MN": (45.198, -93.387), "Atlanta, GA": (33.749, -84.388),
+    "Aurora, CO": (39.729, -104.832), "Austin, TX": (30.267, -97.743),
+    "Baltimore, MD": (39.290, -76.612), "Baton Rouge, LA": (30.451, -91.187),
+    "Bethesda, MD": (38.984, -77.095), "Billings, MT": (45.783, -108.501),
+    "Birmingham, AL": (33.518, -86.810), "Boise, ID": (43.615, -116.202),
+    "Boston, MA": (42.360, -71.058), "Boulder, CO": (40.015, -105.271),
+    "Buffalo, NY": (42.886, -78.878), "Burlington, VT": (44.476, -73.212),
+    "Catonsville, MD": (39.272, -76.732), "Champlin, MN": (45.189, -93.397),
+    "Charleston, SC": (32.777, -79.931), "Charleston, WV": (38.350, -81.633),
+    "Charlotte, NC": (35.227, -80.843), "Cheyenne, WY": (41.140, -104.820),
+    "Chicago, IL": (41.878, -87.630), "Cincinnati, OH": (39.103, -84.512),
+    "Cleveland, OH": (41.499, -81.694), "College Park, MD": (38.981, -76.937),
+    "Colorado Springs, CO": (38.834, -104.821), "Columbia, SC": (34.000, -81.035),
+    "Columbus, OH": (39.961, -82.999), "Dallas, TX": (32.777, -96.797),
+    "Dayton, MN": (45.244, -93.515), "Denver, CO": (39.739, -104.990),
+    "Derwood, MD": (39.117, -77.161), "Des Moines, IA": (41.587, -93.625),
+    "Detroit, MI": (42.331, -83.046), "El Paso, TX": (31.762, -106.485),
+    "Elizabeth, NJ": (40.664, -74.211), "Elk River, MN": (45.304, -93.567),
+    "Fairfax, VA": (38.846, -77.306), "Fargo, ND": (46.877, -96.790),
+    "Fort Collins, CO": (40.585, -105.084), "Fort Worth, TX": (32.755, -97.331),
+    "Fresno, CA": (36.738, -119.787), "Grand Rapids, MI": (42.963, -85.668),
+    "Greeley, CO": (40.423, -104.709), "Hartford, CT": (41.764, -72.685),
+    "Honolulu, HI": (21.307, -157.858), "Houston, TX": (29.760, -95.370),
+    "Hyattsville, MD": (38.956, -76.946), "Indianapolis, IN": (39.768, -86.158),
+    "Jackson, MS": (32.299, -90.185), "Jacksonville, FL": (30.332, -81.656),
+    "Jersey City, NJ": (40.718, -74.043), "Kansas City, KS": (39.114, -94.627),
+    "Kansas City, MO": (39.100, -94.579), "Las Vegas, NV": (36.170, -115.140),
+    "Lexington, KY": (38.040, -84.504), "Lincoln, NE": (40.814, -96.703),
+    "Little Rock, AR": (34.746, -92.290), "Long Beach, CA": (33.770, -118.194),
+    "Longmont, CO": (40.167, -105.102), "Los Angeles, CA": (34.052, -118.244),
+    "Louisville, KY": (38.253, -85.759), "Loveland, CO": (40.398, -105.075),
+    "Madison, WI": (43.073, -89.401), "Manchester, NH": (42.996, -71.455),
+    "Memphis, TN": (35.150, -90.049), "Mesa, AZ": (33.415, -111.831),
+    "Miami, FL": (25.762, -80.192), "Milwaukee, WI": (43.039, -87.906),
+    "Minneapolis, MN": (44.978, -93.265), "Mobile, AL": (30.695, -88.040),
+    "Montgomery, AL": (32.367, -86.300), "Nashville, TN": (36.163, -86.781),
+    "New Haven, CT": (41.308, -72.928), "New Orleans, LA": (29.951, -90.072),
+    "New York, NY": (40.713, -74.006), "Newark, NJ": (40.736, -74.172),
+    "Oakland, CA": (37.804, -122.271), "Oklahoma City, OK": (35.468, -97.516),
+    "Omaha, NE": (41.257, -95.934), "Orlando, FL": (28.538, -81.379),
+    "Philadelphia, PA": (39.953, -75.165), "Phoenix, AZ": (33.448, -112.074),
+    "Pittsburgh, PA": (40.441, -79.996), "Portland, ME": (43.661, -70.255),
+    "Portland, OR": (45.515, -122.679), "Potomac, MD": (39.018, -77.209),
+    "Providence, RI": (41.824, -71.413), "Pueblo, CO": (38.254, -104.609),
+    "Raleigh, NC": (35.780, -78.639), "Reno, NV": (39.530, -119.814),
+    "Richmond, VA": (37.541, -77.436), "Rochester, NY": (43.157, -77.615),
+    "Rockville, MD": (39.084, -77.153), "Sacramento, CA": (38.582, -121.494),
+    "Saint Paul, MN": (44.954, -93.090), "Salt Lake City, UT": (40.761, -111.891),
+    "San Antonio, TX": (29.424, -98.494), "San Diego, CA": (32.716, -117.161),
+    "San Francisco, CA": (37.775, -122.419), "San Jose, CA": (37.338, -121.886),
+    "Santa Fe, NM": (35.687, -105.938), "Savannah, GA": (32.081, -81.091),
+    "Seattle, WA": (47.606, -122.332), "Silver Spring, MD": (38.991, -77.026),
+    "Sioux Falls, SD": (43.546, -96.731), "Spokane, WA": (47.659, -117.426),
+    "St. Louis, MO": (38.627, -90.199), "Tacoma, WA": (47.253, -122.444),
+    "Takoma Park, MD": (38.978, -77.007), "Tampa, FL": (27.951, -82.457),
+    "Tucson, AZ": (32.222, -110.975), "Tulsa, OK": (36.154, -95.993),
+    "Virginia Beach, VA": (36.853, -75.978), "Washington, DC": (38.907, -77.037),
+    "Weld County, CO": (40.555, -104.392), "Wichita, KS": (37.687, -97.330),
+    "Wilmington, DE": (39.740, -75.547), "Worcester, MA": (42.263, -71.802),
+}
+CITY_ALIASES = {
+    "new york city": "new york", "nyc": "new york", "st. paul": "saint paul",
+    "st paul": "saint paul", "saint louis": "st. louis", "st louis": "st. louis",
+    "washington dc": "washington", "washington d.c.": "washington",
+}
+
+STATE_CENTERS = {
+    "AL": (32.806, -86.791), "AK": (61.370, -152.404), "AZ": (33.729, -111.431),
+    "AR": (34.970, -92.373), "CA": (36.116, -119.682), "CO": (39.060, -105.311),
+    "CT": (41.598, -72.755), "DE": (39.319, -75.507), "DC": (38.897, -77.026),
+    "FL": (27.766, -81.687), "GA": (33.041, -83.643), "HI": (21.094, -157.498),
+    "ID": (44.240, -114.479), "IL": (40.349, -88.986), "IN": (39.849, -86.258),
+    "IA": (42.012, -93.211), "KS": (38.527, -96.726), "KY": (37.668, -84.670),
+    "LA": (31.170, -91.868), "ME": (44.694, -69.382), "MD": (39.064, -76.802),
+    "MA": (42.230, -71.530), "MI": (43.327, -84.536), "MN": (45.694, -93.900),
+    "MS": (32.742, -89.679), "MO": (38.456, -92.288), "MT": (46.922, -110.454),
+    "NE": (41.125, -98.268), "NV": (38.314, -117.055), "NH": (43.452, -71.564),
+    "NJ": (40.299, -74.521), "NM": (34.841, -106.249), "NY": (42.166, -74.948),
+    "NC": (35.630, -79.806), "ND": (47.529, -99.784), "OH": (40.388, -82.765),
+    "OK": (35.565, -96.929), "OR": (44.572, -122.071), "PA": (40.591, -77.210),
+    "PR": (18.221, -66.590), "RI": (41.681, -71.512), "SC": (33.857, -80.945),
+    "SD": (44.300, -99.439), "TN": (35.748, -86.692), "TX": (31.054, -97.563),
+    "UT": (40.150, -111.862), "VT": (44.046, -72.711), "VA": (37.769, -78.170),
+    "WA": (47.401, -121.490), "WV": (38.491, -80.955), "WI": (44.269, -89.616),
+    "WY": (42.756, -107.302),
+}
+
+# 3-digit ZIP prefixes of the metros above
+ZIP3_METROS = [
+    ("Boston, MA", 21, 22), ("Worcester, MA", 15, 16), ("Providence, RI", 28, 29),
+    ("Manchester, NH", 30, 31), ("Portland, ME", 40, 41), ("Burlington, VT", 54, 54),
+    ("Hartford, CT", 60, 61), ("New Haven, CT", 64, 65), ("Newark, NJ", 70, 71),
+    ("Elizabeth, NJ", 72, 72), ("Jersey City, NJ", 73, 73), ("New York, NY", 100, 104),
+    ("New York, NY", 110, 116), ("Buffalo, NY", 140, 142), ("Rochester, NY", 144, 146),
+    ("Pittsburgh, PA", 150, 152), ("Philadelphia, PA", 190, 191), ("Wilmington, DE", 197, 198),
+    ("Washington, DC", 200, 205), ("Silver Spring, MD", 209, 209), ("Baltimore, MD", 210, 212),
+    ("Fairfax, VA", 220, 223), ("Richmond, VA", 230, 232), ("Virginia Beach, VA", 234, 234),
+    ("Charleston, WV", 250, 253), ("Raleigh, NC", 275, 276), ("Charlotte, NC", 280, 282),
+    ("Columbia, SC", 290, 292), ("Charleston, SC", 294, 294), ("Atlanta, GA", 300, 303),
+    ("Savannah, GA", 313, 314), ("Jacksonville, FL", 320, 322), ("Orlando, FL", 327, 328),
+    ("Miami, FL", 331, 332), ("Tampa, FL", 335, 336), ("Birmingham, AL", 350, 352),
+    ("Montgomery, AL", 360, 361), ("Mobile, AL", 365, 366), ("Nashville, TN", 370, 372),
+    ("Memphis, TN", 380, 381), ("Jackson, MS", 390, 392), ("Louisville, KY", 400, 402),
+    ("Lexington, KY", 403, 405), ("Columbus, OH", 430, 432), ("Cleveland, OH", 440, 441),
+    ("Cincinnati, OH", 450, 452), ("Indianapolis, IN", 460, 462), ("Detroit, MI", 480, 482),
+    ("Grand Rapids, MI", 493, 495), ("Des Moines, IA", 500, 503), ("Milwaukee, WI", 530, 532),
+    ("Madison, WI", 535, 537), ("Saint Paul, MN", 550, 551), ("Minneapolis, MN", 553, 554),
+    ("Sioux Falls, SD", 570, 571), ("Fargo, ND", 580, 581), ("Billings, MT", 590, 591),
+    ("Chicago, IL", 606, 608), ("St. Louis, MO", 630, 631), ("Kansas City, MO", 640, 641),
+    ("Kansas City, KS", 660, 661), ("Wichita, KS", 670, 672), ("Omaha, NE", 680, 681),
+    ("Lincoln, NE", 683, 685), ("New Orleans, LA", 700, 701), ("Baton Rouge, LA", 707, 708),
+    ("Little Rock, AR", 720, 722), ("Oklahoma City, OK", 730, 731), ("Tulsa, OK", 740, 741),
+    ("Dallas, TX", 750, 753), ("Fort Worth, TX", 760, 761), ("Houston, TX", 770, 772),
+    ("San Antonio, TX", 780, 782), ("Austin, TX", 786, 787), ("El Paso, TX", 798, 799),
+    ("Denver, CO", 800, 802), ("Boulder, CO", 803, 803), ("Fort Collins, CO", 805, 806),
+    ("Colorado Springs, CO", 808, 809), ("Pueblo, CO", 810, 810), ("Cheyenne, WY", 820, 820),
+    ("Boise, ID", 836, 837), ("Salt Lake City, UT", 840, 841), ("Phoenix, AZ", 850, 853),
+    ("Tucson, AZ", 856, 857), ("Albuquerque, NM", 870, 871), ("Santa Fe, NM", 875, 875),
+    ("Las Vegas, NV", 889, 891), ("Reno, NV", 894, 895), ("Los Angeles, CA", 900, 906),
+    ("Long Beach, CA", 907, 908), ("San Diego, CA", 919, 921), ("Fresno, CA", 936, 937),
+    ("San Francisco, CA", 940, 941), ("Oakland, CA", 945, 946), ("San Jose, CA", 950, 951),
+    ("Sacramento, CA", 956, 958), ("Honolulu, HI", 967, 968), ("Portland, OR", 970, 972),
+    ("Seattle, WA", 980, 981), ("Tacoma, WA", 983, 984), ("Spokane, WA", 990, 992),
+    ("Anchorage, AK", 995, 996),
+]
+
+def city_key(city: str, state: str) -> str:
+    """'City, ST' spelled the way CITY_COORDINATES spells it, or '' if unknown."""
+    name = " ".join(city.split()).lower()
+    name = CITY_ALIASES.get(name, name)
+    key = f"{name}, {state}".lower()
+    return _city_keys().get(key, '')
+
+@functools.lru_cache(maxsize=1)
+def _city_keys() -> dict:
+    return {key.lower(): key for key in CITY_COORDINATES}
+
+def _unit_vector(lat: float, lon: float) -> tuple:
+    import math
+    lat, lon = math.radians(lat), math.radians(lon)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+def chord_to_miles(chord: float) -> float:
+    import math
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(chord / 2, 1.0))
+
+def miles_to_chord(miles: float) -> float:
+    import math
+    return 2 * math.sin(min(miles / EARTH_RADIUS_MILES, math.pi) / 2)
+
+class KDTree:
+    """3-d tree over points on the unit sphere.
+
+    Straight-line (chord) distance between unit vectors grows with
+    great-circle distance, so nearest by chord is nearest on the map, and
+    the usual k-d pruning on one coordinate at a time stays exact.
+    """
+
+    def __init__(self, vectors: list):
+        self.vectors = vectors
+        # Node i: (point index, split axis, left node, right node), -1 = none
+        self.nodes = []
+        self.root = self._build(list(range(len(vectors))), 0)
+
+    def _build(self, indexes: list, depth: int) -> int:
+        if not indexes:
+            return -1
+        axis = depth % 3
+        indexes.sort(key=lambda i: self.vectors[i][axis])
+        mid = len(indexes) // 2
+        node = len(self.nodes)
+        self.nodes.append(None)
+        left = self._build(indexes[:mid], depth + 1)
+        right = self._build(indexes[mid + 1:], depth + 1)
+        self.nodes[node] = (indexes[mid], axis, left, right)
+        return node
+
+    def nearest(self, vector: tuple, n: int, max_chord: float = 2.0) -> list:
+        """[(chord, point index)] for the n closest points within max_chord.
+
+        Equally distant points are taken lowest index first, so the answer
+        is the first n of the full sorted list.
+        """
+        import heapq
+        if n <= 0:
+            return []
+        best = []  # max-heap of (-chord_sq, -index)
+        limit = max_chord * max_chord
+        qx, qy, qz = vector
+        stack = [self.root]
+        vectors, nodes = self.vectors, self.nodes
+        while stack:
+            node = stack.pop()
+            if node < 0:
+                continue
+            index, axis, left, right = nodes[node]
+            px, py, pz = vectors[index]
+            d2 = (px - qx) ** 2 + (py - qy) ** 2 + (pz - qz) ** 2
+            if len(best) < n:
+                if d2 <= limit:
+                    heapq.heappush(best, (-d2, -index))
+            elif (-d2, -index) > best[0]:
+                heapq.heapreplace(best, (-d2, -index))
+            bound = -best[0][0] if len(best) == n else limit
+            diff = vector[axis] - vectors[index][axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            # Visit the near side first (pushed last), the far side only if
+            # the splitting plane is closer than the current worst match
+            if diff * diff <= bound:
+                stack.append(far)
+            stack.append(near)
+        return sorted(((-d) ** 0.5, -i) for d, i in best)
+
+class PlaceIndex:
+    """Raids, organizations, city halls, institutions and protests by location."""
+
+    KINDS = ("org", "raid", "city_hall", "institution", "protest")
+
+    def __init__(self, places: list):
+        self.places = places
+        self.trees = {}
+        for kind in self.KINDS:
+            ids = [i for i, p in enumerate(places) if p["kind"] == kind]
+            tree = KDTree([_unit_vector(places[i]["lat"], places[i]["lon"]) for i in ids])
+            self.trees[kind] = (tree, ids)
+        self._zip3_metros = self._zip3_table()
+
+    @classmethod
+    def build(cls) -> "PlaceIndex":
+        places = []
+
+        def add(kind, name, city, state, detail):
+            key = city_key(city, state)
+            if key:
+                lat, lon = CITY_COORDINATES[key]
+            elif state in STATE_CENTERS:
+                lat, lon = STATE_CENTERS[state]
+            else:
+                return
+            places.append({"kind": kind, "name": name, "city": key.rsplit(", ", 1)[0] if key else "",
+                           "state": state, "lat": lat, "lon": lon, "statewide": not key,
+                           "detail": detail})
+
+        for raid in load_site_table("documentedRaids"):
+            city = raid["location"].rsplit(", ", 1)[0]
+            add("raid", f"{raid['type']} raid, {raid['date']}", city, raid["state"], raid)
+        for state, orgs in load_site_table("localOrgsDB").items():
+            cities = sorted((k.rsplit(", ", 1)[0] for k in CITY_COORDINATES if k.endswith(", " + state)),
+                            key=len, reverse=True)
+            for org in orgs:
+                text = f"{org['name']} {org.get('desc', '')}"
+                city = next((c for c in cities if c in text), '')
+                add("org", org["name"], city, state, org)
+        for state, cities in load_site_table("majorCitiesDB").items():
+            for city in cities:
+                add("city_hall", f"Mayor {city['mayor']} ({city['city']})", city["city"], state, city)
+        for state, institutions in load_site_table("localInstitutionsDB").items():
+            for inst in institutions:
+                add("institution", inst["name"], inst.get("city", ""), state, inst)
+        for protest in load_site_table("upcomingProtests"):
+            if protest["state"] != "ALL":
+                add("protest", protest["name"], protest["city"], protest["state"], protest)
+        return cls(places)
+
+    @staticmethod
+    def _zip3_table() -> dict:
+        table = {}
+        for key, lo, hi in ZIP3_METROS:
+            for z3 in range(lo, hi + 1):
+                table[z3] = key
+        return table
+
+    def locate_zip(self, zip_code: str) -> dict:
+        """{"lat", "lon", "label", "precision"} for a ZIP, or None if unplaceable."""
+        zip_code = zip_code.strip()[:5]
+        if len(zip_code) < 3 or not zip_code[:3].isdigit():
+            return None
+        state = get_rep_index().state_for_zip(zip_code)
+        city = load_site_table("zipToCityMap").get(zip_code)
+        key = city_key(city, state) if city else ''
+        precision = "city"
+        if not key:
+            z3 = int(zip_code[:3])
+            key = self._zip3_metros.get(z3, '')
+            precision = "metro"
+            if not key and state:
+                # Nearby prefixes are usually nearby places within a state
+                same_state = [(abs(z - z3), k) for z, k in self._zip3_metros.items()
+                              if k.endswith(", " + state)]
+                key = min(same_state)[1] if same_state else ''
+                precision = "region"
+        if key:
+            lat, lon = CITY_COORDINATES[key]
+            return {"lat": lat, "lon": lon, "label": key, "precision": precision}
+        if state in STATE_CENTERS:
+            lat, lon = STATE_CENTERS[state]
+            return {"lat": lat, "lon": lon, "label": state, "precision": "state"}
+        return None
+
+    @instrumented
+    def near(self, lat: float, lon: float, kind: str, n: int = 5, miles: float = None) -> list:
+        """The n closest places of one kind, each with its distance in miles."""
+        tree, ids = self.trees[kind]
+        max_chord = miles_to_chord(miles) if miles else 2.0
+        found = tree.nearest(_unit_vector(lat, lon), n, max_chord)
+        return [dict(self.places[ids[i]], miles=round(chord_to_miles(c), 1)) for c, i in found]
+
+    def near_zip(self, zip_code: str, kind: str, n: int = 5, miles: float = None) -> dict:
+        where = self.locate_zip(zip_code)
+        if not where:
+            return {"zip": zip_code, "located": None, "results": []}
+        return {"zip": zip_code, "located": where,
+                "results": self.near(where["lat"], where["lon"], kind, n, miles)}
+
+_place_index = None
+
+@instrumented
+def get_place_index() -> PlaceIndex:
+    global _place_index
+    if _place_index is None:
+        _place_index = PlaceIndex.build()
+    return _place_index
+
+# ============================================================================
+# SEARCH - full-text index over resources, organizations, news and raids
+# ============================================================================
+# Each dataset is indexed into its own segment file under SEARCH_DIR, tagged
+# with a fingerprint of the documents it was built from. When index.html
+# changes, only datasets whose documents actually changed are re-tokenized.
+# Queries rank across every segment with BM25; "state:CO" and "type:org" in
+# a query narrow the results, and facet counts show what else matched.
+
+SEARCH_DIR = os.path.expanduser("~/.ice_advocacy_search")
+SEARCH_DATASETS = ("resources", "localOrgsDB", "localNewsDB", "nationalNews", "documentedRaids")
+SEARCH_TYPES = ("resource", "org", "news", "raid")
+SEARCH_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the to with".split())
+# Words ending in "s" that are not plurals; "news" must not fold into "new"
+SEARCH_UNSTEMMED = frozenset("news always perhaps this was does yes lens series species".split())
+# Bump when tokenizing changes, so segments on disk are re-tokenized
+SEARCH_TOKENIZER = 2
+# Nationwide documents carry this in place of a state
+NATIONWIDE = "US"
+# A title word counts as this many occurrences of it in the text
+TITLE_WEIGHT = 3
+BM25_K1 = 1.2
+BM25_B = 0.75
+# How many vocabulary words a trailing partial word may expand to
+PREFIX_EXPANSIONS = 20
+
+@functools.lru_cache(maxsize=1)
+def _token_pattern():
+    import re
+    return re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+@functools.lru_cache(maxsize=65536)
+def _stem(word: str) -> str:
+    """Fold simple plurals: raids -> raid, rights -> right."""
+    if word in SEARCH_UNSTEMMED:
+        return word
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word.removesuffix("'s")
+
+def search_tokens(text: str) -> list:
+    return [_stem(w) for w in _token_pattern().findall(text.lower()) if w not in SEARCH_STOPWORDS]
+
+def search_documents(dataset: str) -> list:
+    """One dataset as search documents: type, state, title, text and display fields."""
+    if dataset == "resources":
+        return [{"type": "resource", "state": NATIONWIDE, "title": r["name"],
+                 "text": r["section"], "url": r.get("url", ""), "phone": r.get("phone", "")}
+                for r in RESOURCES]
+    table = load_site_table(dataset)
+    if dataset == "localOrgsDB":
+        return [{"type": "org", "state": state, "title": org["name"], "text": org.get("desc", ""),
+                 "url": org.get("website", ""), "phone": org.get("phone", ""),
+                 "email": org.get("email", "")}
+                for state, orgs in table.items() for org in orgs]
+    if dataset == "localNewsDB":
+        return [{"type": "news", "state": state, "title": item["headline"],
+                 "text": item.get("source", ""), "date": item.get("date", ""), "url": item.get("link", "")}
+                for state, items in table.items() for item in items]
+    if dataset == "nationalNews":
+        return [{"type": "news", "state": NATIONWIDE, "title": item["headline"],
+                 "text": item.get("source", ""), "date": item.get("date", ""), "url": item.get("link", "")}
+                for item in table]
+    if dataset == "documentedRaids":
+        return [{"type": "raid", "state": raid.get("state") or NATIONWIDE,
+                 "title": f"{raid.get('type', 'ICE')} raid - {raid.get('location', '')}",
+                 "text": f"{raid.get('description', '')} {raid.get('source', '')}",
+                 "date": raid.get("date", "")}
+                for raid in table]
+    raise KeyError(f"No searchable dataset named {dataset!r}")
+
+def _documents_fingerprint(docs: list) -> str:
+    import hashlib
+    return hashlib.blake2b(json.dumps([SEARCH_TOKENIZER, docs], sort_keys=True).encode('utf-8'),
+                           digest_size=16).hexdigest()
+
+def build_search_segment(dataset: str, docs: list) -> dict:
+    """Postings {term: [[doc, weighted tf], ...]} and lengths for one dataset."""
+    from collections import Counter
+    state_words = {code: name for name, code in STATE_NAMES.items()}
+    postings, lengths = {}, []
+    for i, doc in enumerate(docs):
+        counts = Counter(search_tokens(doc["title"]) * TITLE_WEIGHT)
+        counts.update(search_tokens(" ".join((doc["text"], doc["type"], doc["state"],
+                                              state_words.get(doc["state"], "")))))
+        lengths.append(sum(counts.values()))
+        for term, tf in counts.items():
+            postings.setdefault(term, []).append([i, tf])
+    return {"dataset": dataset, "fingerprint": _documents_fingerprint(docs),
+            "docs": docs, "lengths": lengths, "postings": postings}
+
+class SearchIndex:
+    """BM25 search over the segments of every dataset, with state/type facets."""
+
+    def __init__(self, segments: list):
+        import bisect
+        self._bisect = bisect.bisect_left
+        self.docs, self.lengths, self.postings = [], [], {}
+        for segment in segments:
+            base = len(self.docs)
+            self.docs.extend(segment["docs"])
+            self.lengths.extend(segment["lengths"])
+            for term, entries in segment["postings"].items():
+                self.postings.setdefault(term, []).extend((base + i, tf) for i, tf in entries)
+        self.average_length = sum(self.lengths) / len(self.lengths) if self.lengths else 1.0
+        self.vocabulary = sorted(self.postings)
+        self.rebuilt = []
+
+    @classmethod
+    def open(cls, folder: str = SEARCH_DIR) -> "SearchIndex":
+        """Load the segments on disk, rebuilding any whose dataset has changed."""
+        manifest_path = os.path.join(folder, "manifest.json")
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        stamp = _site_stamp() + [_documents_fingerprint(RESOURCES)]
+        fresh = manifest.get("stamp") == stamp
+
+        segments, rebuilt, fingerprints = [], [], {}
+        for dataset in SEARCH_DATASETS:
+            path = os.path.join(folder, f"{dataset}.json")
+            segment = None
+            docs = None if fresh else search_documents(dataset)
+            if fresh or manifest.get("segments", {}).get(dataset) == _documents_fingerprint(docs):
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        segment = json.load(f)
+                except (OSError, ValueError):
+                    pass
+            if segment is None:
+                segment = build_search_segment(dataset, docs or search_documents(dataset))
+                rebuilt.append(dataset)
+                try:
+                    os.makedirs(folder, exist_ok=True)
+                    atomic_write_json(path, segment, durable=False)
+                except OSError:
+                    pass
+            segments.append(segment)
+            fingerprints[dataset] = segment["fingerprint"]
+
+        if rebuilt or not fresh:
+            try:
+                atomic_write_json(manifest_path, {"stamp": stamp, "segments": fingerprints},
+                                  durable=False)
+            except OSError:
+                pass
+        index = cls(segments)
+        index.rebuilt = rebuilt
+        return index
+
+    def _expand(self, prefix: str) -> list:
+        i = self._bisect(self.vocabulary, prefix)
+        words = []
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(prefix) \
+                and len(words) < PREFIX_EXPANSIONS:
+            words.append(self.vocabulary[i])
+            i += 1
+        return words
+
+    def _scores(self, terms: list) -> dict:
+        """{doc: BM25 score} summed over terms (a doc matching any of them)."""
+        import math
+        n, scores = len(self.docs), {}
+        lengths, average = self.lengths, self.average_length
+        for term in terms:
+            entries = self.postings.get(term, ())
+            idf = math.log(1 + (n - len(entries) + 0.5) / (len(entries) + 0.5))
+            for doc, tf in entries:
+                norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc] / average)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+        return scores
+
+    def search(self, query: str, state: str = '', type: str = '', limit: int = 10) -> dict:
+        """Ranked matches for every word of the query (the last may be partial)."""
+        import heapq
+        words = []
+        for word in query.split():
+            key, sep, value = word.partition(":")
+            if sep and key.lower() == "state":
+                state = value
+            elif sep and key.lower() == "type":
+                type = value
+            else:
+                words.append(word)
+        state = normalize_state(state) if state else ''
+        type = type.lower() if type else ''
+        type = type if type in SEARCH_TYPES else type.removesuffix("s")
+        terms = search_tokens(" ".join(words))
+        if not terms:
+            return {"query": query, "total": 0, "results": [], "facets": {"type": {}, "state": {}}}
+
+        # Every word must match; the last also matches words it is the start of
+        groups = [[term] for term in terms]
+        if query[-1:].isalnum():
+            groups[-1] = list(dict.fromkeys([terms[-1]] + self._expand(terms[-1])))
+        scores = None
+        for group in groups:
+            group_scores = self._scores(group)
+            if scores is None:
+                scores = group_scores
+            else:
+                scores = {doc: score + group_scores[doc] for doc, score in scores.items()
+                          if doc in group_scores}
+
+        docs = self.docs
+        type_facet, state_facet, matches = {}, {}, []
+        for doc in scores:
+            doc_type, doc_state = docs[doc]["type"], docs[doc]["state"]
+            state_ok = not state or doc_state == state
+            type_ok = not type or doc_type == type
+            if state_ok:
+                type_facet[doc_type] = type_facet.get(doc_type, 0) + 1
+            if type_ok:
+                state_facet[doc_state] = state_facet.get(doc_state, 0) + 1
+            if state_ok and type_ok:
+                matches.append(doc)
+        top = heapq.nlargest(limit, matches, key=lambda doc: (scores[doc], -doc))
+        return {
+            "query": query,
+            "total": len(matches),
+            "results": [dict(docs[doc], score=round(scores[doc], 3)) for doc in top],
+            "facets": {"type": type_facet, "state": state_facet},
+        }
+
+_search_index = None
+
+@instrumented
+def get_search_index() -> SearchIndex:
+    global _search_index
+    if _search_index is None:
+        _search_index = SearchIndex.open()
+    return _search_index
+
+# ============================================================================
+# UTILITY FUNCTIONS
+# ============================================================================
+
+CLEAR_SCREEN = "\033[2J\033[H"
+
+@functools.lru_cache(maxsize=None)
+def _enable_ansi() -> bool:
+    """Turn on escape-sequence handling in the Windows console (once)."""
+    if os.name != 'nt':
+        return True
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)
+        mode = ctypes.c_uint32()
+        kernel32.GetConsoleMode(handle, ctypes.byref(mode))
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except (AttributeError, OSError):
+        return False
+
+def clear_screen():
+    """Clear the terminal with ANSI escapes rather than spawning `clear`."""
+    if _enable_ansi():
+        sys.stdout.write(CLEAR_SCREEN)
+        sys.stdout.flush()
+    else:
+        os.system('cls')
+
+def read_key() -> str:
+    """Read a single keypress without waiting for Enter.
+
+    Falls back to reading a line when stdin is not a terminal (pipes, IDEs).
+    """
+    if not sys.stdin.isatty():
+        try:
+            return input().strip()[:1].lower()
+        except EOFError:
+            return 'q'
+    if os.name == 'nt':
+        import msvcrt
+        return msvcrt.getwch().lower()
+    import termios
+    import tty
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+    try:
+        tty.setcbreak(fd)
+        return sys.stdin.read(1).lower()
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+# The desktop "open" command is looked up once, and launches run on a
+# background thread so a slow xdg-open never freezes the menu. Failures are
+# collected and shown the next time a menu is drawn.
+
+class Launcher:
+    """Hands tel:, mailto: and https: links to the desktop without blocking.
+
+    Other slow work started from a menu, like sending queued email, runs
+    on the same background threads; its failures are shown on the next menu.
+    """
+
+    def __init__(self):
+        import platform
+        system = platform.system()
+        if system == 'Darwin':  # macOS
+            self.opener = 'open'
+        elif system == 'Linux':
+            self.opener = 'xdg-open'
+        else:
+            self.opener = None
+        self._pool = None
+        self._errors = []
+        self._jobs = []
+
+    def _executor(self):
+        if self._pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="launcher")
+        return self._pool
+
+    def launch(self, uri: str) -> bool:
+        """Start opening uri in the background. False if no handler exists."""
+        if self.opener is None:
+            return False
+        self._executor().submit(self._run, uri)
+        return True
+
+    def run_in_background(self, func, *args):
+        """Start func(*args) off the menu thread; an exception it raises becomes a launch error."""
+        self._jobs = [job for job in self._jobs if not job.done()]
+        self._jobs.append(self._executor().submit(self._run_job, func, *args))
+
+    def _run_job(self, func, *args):
+        try:
+            func(*args)
+        except Exception as e:
+            self._errors.append(str(e))
+
+    def wait(self, timeout: float = None):
+        """Wait for work started with run_in_background to finish."""
+        from concurrent.futures import wait
+        wait(self._jobs, timeout)
+
+    @instrumented
+    def _run(self, uri: str):
+        import subprocess
+        try:
+            result = subprocess.run([self.opener, uri], check=False,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        except OSError as e:
+            self._errors.append(f"Could not run {self.opener}: {e}")
+            return
+        if result.returncode != 0:
+            detail = result.stderr.decode(errors='replace').strip().splitlines()
+            self._errors.append(f"{self.opener} failed for {uri[:60]}"
+                                + (f": {detail[-1]}" if detail else ""))
+
+    def take_errors(self) -> list:
+        errors, self._errors = self._errors, []
+        return errors
+
+_launcher = None
+
+def get_launcher() -> Launcher:
+    global _launcher
+    if _launcher is None:
+        _launcher = Launcher()
+    return _launcher
+
+def show_launch_errors():
+    """Print any background launch failures since the last menu."""
+    if _launcher is None:
+        return
+    for error in _launcher.take_errors():
+        print(f"  ⚠ {error}")
+
+@instrumented
+def open_phone_dialer(phone_number: str):
+    """Open phone dialer with the number."""
+    clean_number = ''.join(c for c in phone_number if c.isdigit() or c == '+')
+    if not get_launcher().launch(f'tel:{clean_number}'):
+        print(f"\n>>> CALL THIS NUMBER: {phone_number}")
+
+@instrumented
+def open_email_client(to: str, subject: str, body: str, sender: str = ''):
+    """Open default email client with pre-filled email.
+
+    When an SMTP server is configured the message is queued in the outbox
+    and sent in the background instead of launching the mail client, so
+    a slow or unreachable server never holds up the menu.
+    """
+    if SMTP_SERVER:
+        if body.startswith("Subject:"):
+            body = body.partition("\n\n")[2]
+        spool = MailSpool()
+        spool.enqueue({"from": sender, "to": to, "subject": subject, "body": body})
+        get_launcher().run_in_background(deliver_outbox, spool)
+        return
+
+    import urllib.parse
+    subject_encoded = urllib.parse.quote(subject)
+    body_encoded = urllib.parse.quote(body)
+    mailto_url = f"mailto:{to}?subject={subject_encoded}&body={body_encoded}"
+
+    if not get_launcher().launch(mailto_url):
+        print(f"\n>>> Send email to: {to}")
+        print(f">>> Subject: {subject}")
+
+@instrumented
+def open_url(url: str):
+    """Open URL in default browser."""
+    if not get_launcher().launch(url):
+        print(f"\n>>> Open this URL: {url}")
+
+# ============================================================================
+# MAIL DELIVERY - outbox spool sent over one pooled SMTP connection
+# ============================================================================
+# Set ICE_ADVOCACY_SMTP=host:port (plus ICE_ADVOCACY_SMTP_USER/_PASSWORD and
+# ICE_ADVOCACY_SMTP_TLS=1 if needed) to send email directly rather than
+# through mailto: links.
+
+SMTP_SERVER = os.environ.get("ICE_ADVOCACY_SMTP", "")
+OUTBOX_DIR = os.path.expanduser("~/.ice_advocacy_outbox")
+
+def message_to_eml(message: dict) -> bytes:
+    from email.message import EmailMessage
+    eml = EmailMessage()
+    eml['Subject'] = message['subject']
+    if message.get('from'):
+        eml['From'] = message['from']
+    if message.get('to'):
+        eml['To'] = message['to']
+    eml.set_content(message['body'])
+    return bytes(eml)
+
+class MailSpool:
+    """A directory of queued .eml files, delivered in order over SMTP.
+
+    Messages are written to the outbox before any network I/O, so nothing
+    is lost if sending fails; flush() reuses a single SMTP connection for
+    the whole queue, reconnecting only after an error. Only one flush()
+    runs at a time per outbox, so no message is sent twice.
+    """
+
+    def __init__(self, path: str = OUTBOX_DIR, server: str = None,
+                 rate: float = 10.0, retries: int = 3):
+        self.path = path
+        self.server = server if server is not None else SMTP_SERVER
+        self.rate = rate
+        self.retries = retries
+        self._seq = 0
+        self._smtp = None
+        os.makedirs(os.path.join(self.path, "failed"), exist_ok=True)
+
+    def enqueue(self, message: dict) -> str:
+        import time
+        self._seq += 1
+        name = f"{time.time_ns()}-{os.getpid()}-{self._seq:06d}.eml"
+        tmp_path = os.path.join(self.path, name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(message_to_eml(message))
+        os.replace(tmp_path, os.path.join(self.path, name))
+        return name
+
+    def pending(self) -> list:
+        return sorted(n for n in os.listdir(self.path) if n.endswith(".eml"))
+
+    def _connect(self):
+        import smtplib
+        host, _, port = self.server.partition(":")
+        smtp = smtplib.SMTP(host, int(port or 25), timeout=30)
+        if os.environ.get("ICE_ADVOCACY_SMTP_TLS"):
+            smtp.starttls()
+        user = os.environ.get("ICE_ADVOCACY_SMTP_USER")
+        if user:
+            smtp.login(user, os.environ.get("ICE_ADVOCACY_SMTP_PASSWORD", ""))
+        return smtp
+
+    def _send(self, raw: bytes):
+        from email import message_from_bytes
+        msg = message_from_bytes(raw)
+        if self._smtp is None:
+            self._smtp = self._connect()
+        self._smtp.send_message(msg, from_addr=msg.get('From') or 'advocate@localhost')
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+
+    @instrumented
+    def flush(self) -> dict:
+        """Send everything in the outbox. Returns throughput metrics."""
+        import smtplib
+        import time
+
+        started = time.perf_counter()
+        interval = 1.0 / self.rate if self.rate else 0.0
+        next_send = started
+        sent = failed = retried = 0
+
+        with FileLock(self.path):
+            try:
+                for name in self.pending():
+                    path = os.path.join(self.path, name)
+                    with open(path, 'rb') as f:
+                        raw = f.read()
+                    for attempt in range(self.retries + 1):
+                        delay = next_send - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+                        next_send = time.perf_counter() + interval
+                        try:
+                            self._send(raw)
+                        except (smtplib.SMTPException, OSError):
+                            self.close()
+                            if attempt < self.retries:
+                                retried += 1
+                                time.sleep(min(2 ** attempt * 0.5, 10))
+                                continue
+                            os.replace(path, os.path.join(self.path, "failed", name))
+                            failed += 1
+                        else:
+                            os.remove(path)
+                            sent += 1
+                        break
+            finally:
+                self.close()
+
+        elapsed = time.perf_counter() - started
+        return {"sent": sent, "failed": failed, "retried": retried,
+                "seconds": elapsed, "per_sec": sent / elapsed if elapsed else 0.0}
+
+def deliver_outbox(spool: MailSpool):
+    """Send the outbox; raises if anything had to be set aside in failed/."""
+    metrics = spool.flush()
+    if metrics['failed']:
+        raise OSError(f"Could not send {metrics['failed']} email(s) - kept in "
+                      f"{os.path.join(spool.path, 'failed')}")
+
+def make_action_record(action_type: str, target: str, method: str) -> dict:
+    from datetime import datetime
+    return {
+        "date": datetime.now().isoformat(),
+        "type": action_type,
+        "target": target,
+        "method": method
+    }
+
+@instrumented
+def log_action(config: dict, action_type: str, target: str, method: str):
+    """Log an advocacy action taken."""
+    record = make_action_record(action_type, target, method)
+    get_action_store().append(record)
+    note_contacts([record])
+
+# ============================================================================
+# MENU SCREENS
+# ============================================================================
+
+def print_banner():
+    clear_screen()
+    print("""
+╔══════════════════════════════════════════════════════════════════╗
+║                                                                  ║
+║     ██╗ ██████╗███████╗     █████╗  ██████╗████████╗██╗ ██████╗  ║
+║     ██║██╔════╝██╔════╝    ██╔══██╗██╔════╝╚══██╔══╝██║██╔═══██╗ ║
+║     ██║██║     █████╗      ███████║██║        ██║   ██║██║   ██║ ║
+║     ██║██║     ██╔══╝      ██╔══██║██║        ██║   ██║██║   ██║ ║
+║     ██║╚██████╗███████╗    ██║  ██║╚██████╗   ██║   ██║╚██████╔╝ ║
+║     ╚═╝ ╚═════╝╚══════╝    ╚═╝  ╚═╝ ╚═════╝   ╚═╝   ╚═╝ ╚═════╝  ║
+║                                                                  ║
+║         TELL CORPORATIONS: DON'T COOPERATE WITH ICE              ║
+║         One-stop advocacy hub - no research needed               ║
+║                                                                  ║
+╚══════════════════════════════════════════════════════════════════╝
+    """)
+
+def setup_user(config: dict) -> dict:
+    """Quick setup for new users."""
+    print("\n" + "="*60)
+    print("QUICK SETUP - We need a few details to personalize your messages")
+    print("="*60 + "\n")
+
+    config["user_name"] = input("Your full name: ").strip()
+    config["user_address"] = input("Street address: ").strip()
+    config["user_city"] = input("City (press Enter to fill in from your ZIP): ").strip()
+    config["user_state"] = input("State (e.g., CA, NY): ").strip()
+    config["zip_code"] = input("ZIP code: ").strip()
+    config["user_email"] = input("Email (optional, press Enter to skip): ").strip()
+    config["phone"] = input("Phone (optional, press Enter to skip): ").strip()
+
+    config = normalize_profile(config)
+    issues = config.pop("address_issues", [])
+    print(f"\nYour address: {config['user_address']}, {config['user_city']}, "
+          f"{config['user_state']} {config['zip_code']}")
+    if issues:
+        print(f"  Please double-check: {'; '.join(issues)} (you can fix it later in Settings)")
+
+    save_config(config)
+    print("\n✓ Setup complete! Your info is saved for future use.")
+    input("\nPress Enter to continue...")
+    return config
+
+def main_menu():
+    print("""
+┌──────────────────────────────────────────────────────────────────┐
+│  MAIN MENU                                                       │
+├──────────────────────────────────────────────────────────────────┤
+│                                                                  │
+│  1. 📞 CONTACT CORPORATE CEOs                                    │
+│     Call or email CEOs of companies complicit with ICE           │
+│                                                                  │
+│  2. 🏛️  CONTACT CONGRESS                                         │
+│     Call your senators and representatives about ICE funding     │
+│                                                                  │
+│  3. 📝 STAND UP AMERICA PETITION                                 │
+│     Quick online petition to freeze ICE funding                  │
+│                                                                  │
+│  4. 📊 VIEW YOUR ADVOCACY STATS                                  │
+│     See how many actions you've taken                            │
+│                                                                  │
+│  5. ⚙️  UPDATE YOUR INFO                                          │
+│     Change your name, address, etc.                              │
+│                                                                  │
+│  6. 📚 RESOURCES & KNOW YOUR RIGHTS                              │
+│                                                                  │
+│  7. ✊ PROTESTS NEAR ME                                          │
+│     Rallies, vigils and ICE watches in your state                │
+│                                                                  │
+│  8. 📍 ORGANIZATIONS & RAIDS NEAR ME                             │
+│     Closest rapid-response groups, reported raids, city halls    │
+│                                                                  │
+│  9. 🔎 SEARCH                                                    │
+│     Organizations, news, raids and resources by keyword          │
+│                                                                  │
+│  0. Exit                                                         │
+│                                                                  │
+└──────────────────────────────────────────────────────────────────┘
+    """)
+    show_launch_errors()
+    return input("Select an option: ").strip()
+
+# ============================================================================
+# CORPORATE CEO ACTIONS
+# ============================================================================
+
+def corporate_menu(config: dict):
+    """Menu for contacting corporate CEOs."""
+    while True:
+        clear_screen()
+        print("""
+╔══════════════════════════════════════════════════════════════════╗
+║  TELL CORPORATIONS: DON'T COOPERATE WITH ICE                     ║
+╠══════════════════════════════════════════════════════════════════╣
+║  Select a company to contact their CEO:                          ║
+╚══════════════════════════════════════════════════════════════════╝
+""")
+
+        registry = get_target_registry()
+        featured = registry.featured()
+        complicit = [c for c in featured if c.get("complicit")]
+        others = [c for c in featured if not c.get("complicit")]
+
+        print("  COMPANIES WITH ICE TIES:")
+        print("  " + "─"*60)
+        for i, target in enumerate(complicit, 1):
+            status = "🔴" if target.get("complicit") else "⚪"
+            print(f"  {i:2}. {status} {target['company']:<15} - {target['ceo']} ({target['title']})")
+
+        if others:
+            print("\n  OTHER MAJOR CORPORATIONS:")
+            print("  " + "─"*60)
+            for i, target in enumerate(others, len(complicit) + 1):
+                print(f"  {i:2}. ⚪ {target['company']:<15} - {target['ceo']} ({target['title']})")
+
+        more = len(registry.targets) - len(featured)
+        if more:
+            print(f"\n  + {more} more ICE contractors - type a company or CEO name to search")
+        suggested = get_scheduler().assign(LOCAL_VOLUNTEER)
+        print()
+        if suggested:
+            print(f"  N. ➡️  NEXT UP: {suggested['company']} - the company that most needs to hear from you")
+        print("  S. 📞 CALL SESSION - call company after company, one key each")
+        print("  0. Back to main menu")
+        print()
+
+        show_launch_errors()
+        choice = input("  Select company number or search: ").strip()
+
+        if choice == '0':
+            return
+
+        if choice.lower() == 's':
+            call_session(config, session_queue(registry))
+            continue
+
+        if choice.lower() == 'n' and suggested:
+            contact_ceo(config, suggested)
+            continue
+
+        if choice.isdigit():
+            idx = int(choice) - 1
+            if 0 <= idx < len(featured):
+                contact_ceo(config, featured[idx])
+        elif choice:
+            target = pick_search_result(registry.search(choice))
+            if target:
+                contact_ceo(config, target)
+
+def pick_search_result(matches: list):
+    """Let the user choose one of a list of search matches."""
+    if not matches:
+        print("\n  No matching companies.")
+        input("  Press Enter to continue...")
+        return None
+    if len(matches) == 1:
+        return matches[0]
+    print()
+    for i, target in enumerate(matches, 1):
+        print(f"  {i:2}. {target['company']:<30} - {target['ceo']}")
+    choice = input("\n  Select number (Enter to cancel): ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(matches):
+        return matches[int(choice) - 1]
+    return None
 
 def contact_ceo(config: dict, target: dict):
     """Contact a specific CEO."""
     clear_screen()
     print(f"""
 ╔══════════════════════════════════════════════════════════════════╗
-║  CONTACT: {target['company'].upper():<53} ║
-╠══════════════════════════════════════════════════════════════════╣
-║  CEO: {target['ceo']:<57} ║
-║  Title: {target['title']:<55} ║
-║  Phone: {target['phone']:<55} ║
-║  Email: {target['email']:<55} ║
-╠══════════════════════════════════════════════════════════════════╣
-║  Notes: {target.get('notes', 'N/A'):<55} ║
+║  CONTACT: {target['company'].upper():<53} ║
+╠══════════════════════════════════════════════════════════════════╣
+║  CEO: {target['ceo']:<57} ║
+║  Title: {target['title']:<55} ║
+║  Phone: {target['phone']:<55} ║
+║  Email: {target['email']:<55} ║
+╠══════════════════════════════════════════════════════════════════╣
+║  Notes: {target.get('notes', 'N/A'):<55} ║
+╚══════════════════════════════════════════════════════════════════╝
+
+  What would you like to do?
+
+  1. 📞 CALL - Opens phone dialer with script
+  2. 📧 EMAIL - Opens email with pre-written message
+  3. 📋 COPY SCRIPT - View/copy the call script
+  4. 📋 COPY EMAIL - View/copy the email template
+
+  0. Back
+""")
+
+    choice = input("  Select action: ").strip()
+
+    if choice == '1' and not target.get('phone'):
+        print("\n  No phone number on file for this company - try email instead.")
+        input("Press Enter to continue...")
+
+    elif choice == '1':
+        # Show script and open dialer
+        print(render_ceo_call_script(config, target))
+        input("\nPress Enter to open phone dialer...")
+        open_phone_dialer(target['phone'])
+        log_action(config, "corporate", target['company'], "call")
+        print("\n✓ Action logged! Great work!")
+        input("Press Enter to continue...")
+
+    elif choice == '2':
+        # Open email client
+        subject = f"Urging {target['company']} to Commit to Non-Cooperation with ICE"
+        body = render_ceo_email(config, target)
+        print("\n  Opening email client...")
+        open_email_client(target['email'], subject, body, config.get('user_email', ''))
+        log_action(config, "corporate", target['company'], "email")
+        print("\n✓ Action logged! Great work!")
+        input("Press Enter to continue...")
+
+    elif choice == '3':
+        # Show script
+        print(render_ceo_call_script(config, target))
+        input("\nPress Enter to continue...")
+
+    elif choice == '4':
+        # Show email
+        print(f"\n  TO: {target['email']}")
+        print(render_ceo_email(config, target))
+        input("\nPress Enter to continue...")
+
+# Call session keys -> (outcome, logged as a call?)
+CALL_OUTCOMES = {
+    '1': ("spoke with someone", True),
+    '2': ("left voicemail", True),
+    '3': ("no answer", False),
+    'n': ("skipped", False),
+}
+
+def session_queue(registry) -> list:
+    """Ask which companies to call; default is every company with ICE ties."""
+    print("\n  Call which companies? Enter for all with ICE ties,")
+    query = input("  or a state (e.g. CO) or search text: ").strip()
+    if len(query) == 2 and query.upper() in STATE_CODES:
+        targets = registry.in_state(query.upper())
+    elif query:
+        targets = registry.search(query, limit=50)
+    else:
+        targets = [t for t in registry.targets if t.get("complicit")]
+    return [t for t in targets if t.get("phone")]
+
+def call_session(config: dict, targets: list):
+    """Work through a queue of calls, one keypress per call.
+
+    Every script is rendered before the first call, screens are redrawn
+    with a single write, and the calls are logged together at the end.
+    """
+    if not targets:
+        print("\n  No companies with phone numbers matched.")
+        input("  Press Enter to continue...")
+        return
+
+    scripts = [render_ceo_call_script(config, target) for target in targets]
+    outcomes = {}
+    i = 0
+    while i < len(targets):
+        target = targets[i]
+        done = sum(1 for key in outcomes.values() if CALL_OUTCOMES[key][1])
+        screen = [
+            "╔══════════════════════════════════════════════════════════════════╗",
+            f"║  CALL SESSION  {i + 1:>3} of {len(targets):<3}  ✓ {done:<3} calls logged{'':<20}║",
+            "╚══════════════════════════════════════════════════════════════════╝",
+            "",
+            f"  {target['company']} - {target['ceo']} ({target['title']})",
+            f"  📞 {target['phone']}",
+        ]
+        if target.get('notes'):
+            screen.append(f"  {target['notes']}")
+        if i in outcomes:
+            screen.append(f"  (marked: {CALL_OUTCOMES[outcomes[i]][0]})")
+        screen += [
+            scripts[i],
+            "  [d] dial   [1] spoke with someone   [2] left voicemail   [3] no answer",
+            "  [n] skip   [p] previous   [q] finish",
+        ]
+        clear_screen()
+        sys.stdout.write("\n".join(screen) + "\n")
+        sys.stdout.flush()
+        show_launch_errors()
+
+        key = read_key()
+        if key == 'd':
+            open_phone_dialer(target['phone'])
+        elif key in CALL_OUTCOMES:
+            outcomes[i] = key
+            i += 1
+        elif key == 'p':
+            i = max(i - 1, 0)
+        elif key == 'q':
+            break
+
+    records = [make_action_record("corporate", targets[i]['company'], "call")
+               for i, key in sorted(outcomes.items()) if CALL_OUTCOMES[key][1]]
+    if records:
+        get_action_store().extend(records)
+        note_contacts(records)
+
+    clear_screen()
+    print("\n  CALL SESSION COMPLETE\n")
+    for key, (label, _) in CALL_OUTCOMES.items():
+        count = sum(1 for k in outcomes.values() if k == key)
+        if count:
+            print(f"  {label:<20} {count}")
+    print(f"\n  ✓ {len(records)} calls logged. Great work!")
+    input("  Press Enter to continue...")
+
+# ============================================================================
+# CONGRESS ACTIONS
+# ============================================================================
+
+def congress_menu(config: dict):
+    """Menu for contacting Congress."""
+    while True:
+        clear_screen()
+        zip_code = config.get('zip_code', '')
+
+        print(f"""
+╔══════════════════════════════════════════════════════════════════╗
+║  CONTACT CONGRESS - FREEZE ICE FUNDING                           ║
+╠══════════════════════════════════════════════════════════════════╣
+║  Your ZIP: {zip_code:<52} ║
+╚══════════════════════════════════════════════════════════════════╝
+
+  1. 🔍 FIND MY REPRESENTATIVES
+     Your senators and House rep by ZIP code
+
+  2. 📞 GET CALL SCRIPT
+     Pre-written script to read when you call
+
+  3. 📧 GET EMAIL TEMPLATE
+     Pre-written email to send to your reps
+
+  4. 🌐 OPEN 5 CALLS APP
+     The 5 Calls app gives you scripts + direct dial
+
+  5. 📝 STAND UP AMERICA PETITION
+     Quick online petition - they email Congress for you
+
+  0. Back to main menu
+""")
+
+        show_launch_errors()
+        choice = input("  Select option: ").strip()
+
+        if choice == '0':
+            return
+        elif choice == '1':
+            find_representatives(config)
+        elif choice == '2':
+            show_congress_call_script(config)
+        elif choice == '3':
+            show_congress_email(config)
+        elif choice == '4':
+            print("\n  Opening 5 Calls...")
+            open_url("https://5calls.org/")
+            input("  Press Enter to continue...")
+        elif choice == '5':
+            open_petition()
+
+def find_representatives(config: dict):
+    """Show representatives for the user's ZIP, from the offline index."""
+    zip_code = config.get('zip_code', '')
+
+    print(f"""
+
+  Finding your representatives...
+
+  Your ZIP code: {zip_code}
+""")
+
+    found = get_rep_index().lookup(zip_code, config.get('user_state', '')) if zip_code else None
+    if found and CIVIC_API_KEY:
+        try:
+            member = get_rep_index().house_member(found['state'], civic_house_district(config))
+        except (OSError, ValueError):
+            member = None  # offline: the ZIP-prefix guess will do
+        if member:
+            found['house'] = [member]
+    if found and (found['senators'] or found['house']):
+        for sen in found['senators']:
+            print(f"  Senator {sen['name']} ({sen['party']}-{found['state']})")
+            print(f"     📞 {sen['phone']}   📧 {sen.get('email') or 'use senate.gov contact form'}")
+        for rep in found['house']:
+            print(f"  Rep. {rep['name']} ({rep['party']}-{found['state']}, District {rep['district']})")
+            print(f"     📞 {rep['phone']}   📧 {rep.get('email') or 'use house.gov contact form'}")
+        if not found['house']:
+            print("  House district not in our data yet - check house.gov below.")
+    else:
+        print("  Opening Congress.gov in your browser...")
+        if zip_code:
+            url = f"https://www.congress.gov/members?q=%7B%22address%22%3A%22{zip_code}%22%7D"
+        else:
+            url = "https://www.congress.gov/members"
+        open_url(url)
+
+    print("""
+  Also useful:
+  - House: https://www.house.gov/representatives/find-your-representative
+  - Senate: https://www.senate.gov/senators/senators-contact.htm
+  - 5 Calls app: https://5calls.org/
+""")
+    input("  Press Enter to continue...")
+
+def show_congress_call_script(config: dict):
+    """Show the call script for Congress."""
+    print(render_congress_call_script(config))
+
+    print("""
+  TIP: Find your rep's phone number at:
+  - https://www.house.gov/representatives/find-your-representative
+  - https://www.senate.gov/senators/senators-contact.htm
+  - Or use 5 Calls app which connects you directly
+""")
+
+    log_action(config, "congress", "Congress", "call_script_viewed")
+    input("  Press Enter to continue...")
+
+def show_congress_email(config: dict):
+    """Show email template for Congress."""
+    print(render_congress_email(config))
+    print("""
+  TIP: Find your rep's contact form at:
+  - https://www.house.gov/representatives/find-your-representative
+  - https://www.senate.gov/senators/senators-contact.htm
+""")
+
+    log_action(config, "congress", "Congress", "email_template_viewed")
+    input("  Press Enter to continue...")
+
+# ============================================================================
+# PETITION
+# ============================================================================
+
+def open_petition():
+    """Open Stand Up America petition."""
+    print("""
+
+  STAND UP AMERICA PETITION
+  ═════════════════════════
+
+  "Tell Congress: Freeze Funding for ICE!"
+
+  This petition lets you quickly email your senators and
+  representatives. Just fill in your info and they send
+  the message for you.
+
+  Opening petition page...
+""")
+    open_url("https://act.standupamerica.com/")
+    input("  Press Enter to continue...")
+
+# ============================================================================
+# PROTESTS NEAR ME
+# ============================================================================
+
+def show_protests(config: dict):
+    """Listed protests plus ingested community events for the user's state."""
+    clear_screen()
+    state = config.get('user_state', '') or input("  Your state (2 letters): ").strip().upper()
+    print(f"""
+╔══════════════════════════════════════════════════════════════════╗
+║  PROTESTS & EVENTS NEAR YOU                                      ║
+╚══════════════════════════════════════════════════════════════════╝
+""")
+    national, shard = load_bundle_shard("national"), load_bundle_shard(state)
+    if national is not None and shard is not None:
+        listed = national.get("upcomingProtests", []) + shard.get("upcomingProtests", [])
+    else:
+        listed = [p for p in load_site_table("upcomingProtests") if p['state'] in (state, 'ALL')]
+    community = events_near(state)
+    if not os.path.exists(EVENTS_INDEX_FILE):
+        print("  (Community events not downloaded yet - run: advocacy_tool.py ingest-events)\n")
+
+    events = listed + community
+    if not events:
+        print(f"  No events listed for {state or 'your area'} yet.")
+        print("  Contact a local organization to start one!")
+    for i, event in enumerate(events, 1):
+        where = event['city'] + (f", {event['state']}" if event['state'] != 'ALL' else '')
+        print(f"  {i:>2}. [{event['date']}] {event['name']} ({event['type']})")
+        print(f"      📍 {where} - {event['org']}")
+        print(f"      {event['desc']}")
+
+    print()
+    choice = input("  Enter a number to open its website, or press Enter to go back: ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(events) and events[int(choice) - 1]['link'] != '#':
+        open_url(events[int(choice) - 1]['link'])
+
+def show_nearby(config: dict):
+    """Closest organizations, reported raids and city halls to the user's ZIP."""
+    clear_screen()
+    zip_code = config.get('zip_code', '') or input("  Your ZIP code: ").strip()
+    index = get_place_index()
+    where = index.locate_zip(zip_code)
+    print("""
+╔══════════════════════════════════════════════════════════════════╗
+║  ORGANIZATIONS & RAIDS NEAR YOU                                  ║
+╚══════════════════════════════════════════════════════════════════╝
+""")
+    if not where:
+        print(f"  Couldn't place ZIP code {zip_code!r}.")
+        input("\n  Press Enter to continue...")
+        return
+    approx = "" if where['precision'] == "city" else f" (approximate - {where['precision']} level)"
+    print(f"  Near {where['label']}{approx}\n")
+
+    def distance(place):
+        return "statewide" if place['statewide'] else f"{place['miles']:.0f} mi"
+
+    print("  RAPID RESPONSE & ADVOCACY ORGANIZATIONS")
+    print("  " + "─"*60)
+    for place in index.near(where['lat'], where['lon'], "org", 5):
+        org = place['detail']
+        print(f"  {distance(place):>10}  {org['name']}")
+        print(f"              📞 {org.get('phone') or '-'}   🌐 {org.get('website') or '-'}")
+
+    raids = index.near(where['lat'], where['lon'], "raid", 10, miles=250)
+    print("\n  REPORTED ICE RAIDS WITHIN 250 MILES")
+    print("  " + "─"*60)
+    for place in raids:
+        raid = place['detail']
+        print(f"  {distance(place):>10}  {raid['date']} - {raid['location']} ({raid['type']})")
+        print(f"              {raid['description']}")
+    if not raids:
+        print("  None reported in our data.")
+
+    print("\n  CLOSEST CITY HALLS")
+    print("  " + "─"*60)
+    for place in index.near(where['lat'], where['lon'], "city_hall", 3):
+        city = place['detail']
+        print(f"  {distance(place):>10}  {city['city']}, {place['state']}: Mayor {city['mayor']}  📞 {city['phone']}")
+
+    input("\n  Press Enter to continue...")
+
+SEARCH_ICONS = {"org": "🤝", "news": "📰", "raid": "🚨", "resource": "📚"}
+
+def show_search(config: dict):
+    """Keyword search across organizations, news, raids and resources."""
+    index = get_search_index()
+    query = ''
+    while True:
+        clear_screen()
+        print("""
+╔══════════════════════════════════════════════════════════════════╗
+║  SEARCH                                                          ║
+╚══════════════════════════════════════════════════════════════════╝
+
+  Search organizations, news, raids and resources. Narrow with
+  state:CO or type:org|news|raid|resource (state:mine = your state).
+""")
+        if query:
+            found = index.search(query.replace("state:mine", f"state:{config.get('user_state', '')}"))
+            facets = "   ".join(f"{SEARCH_ICONS.get(t, '')} {t} {n}"
+                               for t, n in sorted(found['facets']['type'].items()))
+            print(f"  {found['total']} matches for {query!r}   {facets}\n")
+            for i, doc in enumerate(found['results'], 1):
+                where = "nationwide" if doc['state'] == NATIONWIDE else doc['state']
+                dated = f"{doc['date']}, " if doc.get('date') else ""
+                print(f"  {i:>2}. {SEARCH_ICONS.get(doc['type'], '')} {doc['title']}")
+                detail = doc.get('phone') or doc.get('url') or doc['text']
+                print(f"      {dated}{where} - {detail[:56]}")
+            if found['results']:
+                print("\n  Enter a number to open it, new words to search again, or 0 to go back.")
+        choice = input("\n  Search: ").strip()
+        if choice in ("", "0"):
+            return
+        if query and choice.isdigit() and 1 <= int(choice) <= len(found['results']):
+            doc = found['results'][int(choice) - 1]
+            if doc.get('url'):
+                open_url(doc['url'])
+            elif doc.get('phone'):
+                open_phone_dialer(doc['phone'])
+            continue
+        query = choice
+
+# ============================================================================
+# STATS & RESOURCES
+# ============================================================================
+
+def show_stats(config: dict):
+    """Show advocacy statistics."""
+    clear_screen()
+    rollup = get_action_store().rollup()
+
+    print("""
+╔══════════════════════════════════════════════════════════════════╗
+║  YOUR ADVOCACY STATS                                             ║
 ╚══════════════════════════════════════════════════════════════════╝
+""")
+
+    if not rollup.total:
+        print("  You haven't taken any logged actions yet.")
+        print("  Start by contacting a corporate CEO or your Congress member!")
+    else:
+        current, longest = rollup.streaks()
+        print(f"  Total actions: {rollup.total}")
+        print(f"  Corporate contacts: {rollup.by_type.get('corporate', 0)}")
+        print(f"  Congress contacts: {rollup.by_type.get('congress', 0)}")
+        print("  By method: " + ", ".join(f"{m} {n}" for m, n in sorted(rollup.by_method.items())))
+        print(f"  Days active: {len(rollup.by_day)} "
+              f"(current streak {current} day{'s' if current != 1 else ''}, longest {longest})")
+        print()
+        print("  Most contacted: " + ", ".join(f"{t} ({n})" for t, n in rollup.top_targets()))
+        print()
+        print("  Last 14 days:")
+        histogram = rollup.histogram(14)
+        peak = max(n for _, n in histogram) or 1
+        for day, count in histogram:
+            bar = "█" * round(count / peak * 30)
+            print(f"  {day[5:]} {bar} {count or ''}")
+        print()
+        print("  Recent actions:")
+        print("  " + "─"*50)
+        for action in rollup.recent:
+            date = action['date'][:10]
+            print(f"  {date} - {action['type']}: {action['target']} ({action['method']})")
+
+    print()
+    input("  Press Enter to continue...")
+
+# What the resources screen lists, in order; searchable too
+RESOURCES = [
+    {"section": "KNOW YOUR RIGHTS", "name": "ACLU Know Your Rights",
+     "url": "https://www.aclu.org/know-your-rights"},
+    {"section": "KNOW YOUR RIGHTS", "name": "National Immigration Law Center", "url": "https://www.nilc.org/"},
+    {"section": "KNOW YOUR RIGHTS", "name": "United We Dream", "url": "https://unitedwedream.org/"},
+    {"section": "KNOW YOUR RIGHTS", "name": "Immigrant Legal Resource Center", "url": "https://www.ilrc.org/"},
+    {"section": "BUSINESS RIGHTS (for businesses)",
+     "name": "Businesses can require a JUDICIAL warrant (not ICE administrative warrants) "
+             "before allowing access to non-public areas"},
+    {"section": "BUSINESS RIGHTS (for businesses)",
+     "name": "Businesses can refuse to answer questions about employees"},
+    {"section": "BUSINESS RIGHTS (for businesses)", "name": "Businesses can refuse to consent to searches"},
+    {"section": "ADVOCACY ORGANIZATIONS", "name": "Stand Up America", "url": "https://standupamerica.com/"},
+    {"section": "ADVOCACY ORGANIZATIONS", "name": "50501 Minnesota", "url": "https://www.50501mn.org/"},
+    {"section": "ADVOCACY ORGANIZATIONS", "name": "5 Calls", "url": "https://5calls.org/"},
+    {"section": "ADVOCACY ORGANIZATIONS", "name": "Indivisible", "url": "https://indivisible.org/"},
+    {"section": "REPORTING ICE ACTIVITY", "name": "United We Dream hotline", "phone": "1-844-363-1423"},
+    {"section": "REPORTING ICE ACTIVITY", "name": "Local rapid response networks vary by city"},
+    {"section": "SANCTUARY CITY INFO",
+     "name": "Many cities limit cooperation with ICE. Check if your city has sanctuary "
+             "policies at your city government website.", "note": True},
+]
+
+def show_resources():
+    """Show resources and know your rights info."""
+    import textwrap
+    clear_screen()
+    print("""
+╔══════════════════════════════════════════════════════════════════╗
+║  RESOURCES & KNOW YOUR RIGHTS                                    ║
+╚══════════════════════════════════════════════════════════════════╝""")
+    section = None
+    for resource in RESOURCES:
+        if resource["section"] != section:
+            section = resource["section"]
+            print(f"\n  {section}\n  {'─' * len(section)}")
+        if resource.get("note"):
+            print(textwrap.fill(resource["name"], 64, initial_indent="  ", subsequent_indent="  "))
+            continue
+        contact = resource.get("url") or resource.get("phone")
+        line = f"{resource['name']}: {contact}" if contact else resource["name"]
+        print(textwrap.fill(line, 70, initial_indent="  - ", subsequent_indent="    "))
+    print("\n  Search all of these, plus local organizations and news, from the main menu (9).\n")
+    input("  Press Enter to continue...")
+
+# ============================================================================
+# ADDRESS NORMALIZATION - parseAddress() from index.html, for whole rosters
+# ============================================================================
+# Addresses come in as typed: "123 main street apt 4, st paul mn 55101",
+# separate fields with the state spelled out, a bare ZIP. normalize_profile()
+# turns any of these into USPS-style street, city, two-letter state and ZIP,
+# filling the state and city from the ZIP where index.html knows them.
+
+# USPS standard suffix -> the other spellings people type
+STREET_SUFFIX_SPELLINGS = {
+    "ALY": "ALLEY ALLY", "ANX": "ANNEX", "ARC": "ARCADE", "AVE": "AVENUE AV AVEN AVENU AVN AVNUE",
+    "BCH": "BEACH", "BLF": "BLUFF", "BLVD": "BOULEVARD BOUL BOULV", "BND": "BEND",
+    "BR": "BRANCH", "BRG": "BRIDGE", "BRK": "BROOK", "BYP": "BYPASS", "CIR": "CIRCLE CIRC CIRCL CRCL",
+    "CRES": "CRESCENT", "CRK": "CREEK", "CSWY": "CAUSEWAY", "CT": "COURT", "CTR": "CENTER CENTRE CNTR",
+    "CV": "COVE", "DR": "DRIVE DRIV DRV", "EXPY": "EXPRESSWAY EXPRESS", "EXT": "EXTENSION",
+    "FWY": "FREEWAY", "GDNS": "GARDENS", "GRV": "GROVE", "HBR": "HARBOR", "HL": "HILL",
+    "HOLW": "HOLLOW", "HTS": "HEIGHTS", "HWY": "HIGHWAY HIWAY HIWY", "JCT": "JUNCTION",
+    "LK": "LAKE", "LN": "LANE", "LNDG": "LANDING", "LOOP": "", "MALL": "", "MNR": "MANOR",
+    "PARK": "", "PASS": "", "PATH": "", "PIKE": "", "PKWY": "PARKWAY PARKWY PKWAY PKY",
+    "PL": "PLACE", "PLZ": "PLAZA", "PT": "POINT", "RD": "ROAD", "RDG": "RIDGE", "ROW": "",
+    "RTE": "ROUTE", "RUN": "", "SQ": "SQUARE SQR", "ST": "STREET STR STRT", "TER": "TERRACE TERR",
+    "TPKE": "TURNPIKE", "TRCE": "TRACE", "TRL": "TRAIL TRAILS TRLS", "VLY": "VALLEY",
+    "VW": "VIEW", "WALK": "", "WAY": "", "XING": "CROSSING",
+}
+DIRECTIONALS = {"NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W", "NORTHEAST": "NE",
+                "NORTHWEST": "NW", "SOUTHEAST": "SE", "SOUTHWEST": "SW"}
+UNIT_DESIGNATORS = {"APARTMENT": "Apt", "APT": "Apt", "SUITE": "Ste", "STE": "Ste",
+                    "UNIT": "Unit", "ROOM": "Rm", "RM": "Rm", "FLOOR": "Fl", "FL": "Fl",
+                    "BUILDING": "Bldg", "BLDG": "Bldg", "LOT": "Lot", "SPACE": "Spc",
+                    "SPC": "Spc", "TRAILER": "Trlr", "TRLR": "Trlr", "#": "#"}
+# ZIPs whose state differs from the rest of their ZIP3 prefix
+ZIP_STATE_EXCEPTIONS = {"06390": "NY"}
+
+@functools.lru_cache(maxsize=1)
+def _address_tables() -> dict:
+    """Every lookup the normalizer needs, built once per process."""
+    import re
+    suffixes = {}
+    for standard, spellings in STREET_SUFFIX_SPELLINGS.items():
+        for spelling in [standard] + spellings.split():
+            suffixes[spelling] = standard.title()
+    directionals = dict(DIRECTIONALS)
+    directionals.update((d, d) for d in DIRECTIONALS.values())
+    zip3 = [''] * 1000
+    for lo, hi, state in ZIP3_STATE_RANGES:
+        zip3[lo:hi + 1] = [state] * (hi - lo + 1)
+    try:
+        cities = load_site_table("zipToCityMap")
+    except (OSError, KeyError, ValueError):
+        cities = {}
+    return {
+        "suffixes": suffixes,
+        "directionals": directionals,
+        "zip3": zip3,
+        "cities": cities,
+        "zip": re.compile(r"(?<![\d-])(\d{5})(?:-(\d{4}))?(?![\d-])"),
+        "ordinal": re.compile(r"\d+(?:ST|ND|RD|TH)"),
+        "digits": re.compile(r"\d"),
+    }
+
+def state_from_zip(zip_code: str) -> str:
+    """State for a ZIP from its first three digits (getStateFromZip in index.html)."""
+    zip_code = zip_code[:5]
+    if zip_code in ZIP_STATE_EXCEPTIONS:
+        return ZIP_STATE_EXCEPTIONS[zip_code]
+    if len(zip_code) < 3 or not zip_code[:3].isdigit():
+        return ''
+    return _address_tables()["zip3"][int(zip_code[:3])]
+
+def city_from_zip(zip_code: str) -> str:
+    """City for a ZIP index.html knows (getCityFromZip), '' otherwise."""
+    return _address_tables()["cities"].get(zip_code[:5], '')
+
+def normalize_zip(value: str) -> str:
+    """'80202' or '80202-1234' from whatever was typed, '' if there is no ZIP in it."""
+    match = _address_tables()["zip"].search(value)
+    if not match:
+        return ''
+    return f"{match.group(1)}-{match.group(2)}" if match.group(2) else match.group(1)
+
+@functools.lru_cache(maxsize=16384)
+def normalize_city(city: str) -> str:
+    """'st. paul ' -> 'St Paul'; words keep their apostrophes and hyphens."""
+    return " ".join(word.capitalize() if word.isalpha() else word.title()
+                    for word in city.replace(".", " ").split())
+
+def normalize_street(street: str) -> str:
+    """'123 north main street apt. 4b' -> '123 N Main St Apt 4B'."""
+    number, _, rest = street.strip().partition(" ")
+    if number[:1].isdigit() and rest:
+        # Neighbours share street names: only the house number varies
+        return f"{number.upper()} {_street_after_number(rest)}"
+    return _normalize_street(street)
+
+@functools.lru_cache(maxsize=65536)
+def _street_after_number(rest: str) -> str:
+    return _normalize_street("0 " + rest)[2:]
+
+def _normalize_street(street: str) -> str:
+    tables = _address_tables()
+    suffixes, directionals = tables["suffixes"], tables["directionals"]
+    ordinal, digits = tables["ordinal"].fullmatch, tables["digits"].search
+    words = street.upper().replace("P.O.", "PO").replace(",", " ").replace(".", " ") \
+        .replace("#", " # ").split()
+    # The unit designator (if any) ends the street proper
+    end = next((i for i, w in enumerate(words) if w in UNIT_DESIGNATORS and i > 1), len(words))
+    # "100 South Park" is a name; "100 South Park Ave" and "1 Main St NW" have directionals
+    post = end - 1 if end > 3 and words[end - 1] in directionals else None
+    suffix_at = (post or end) - 1
+    out = []
+    for i, word in enumerate(words[:end]):
+        if (i == 1 or i == post) and end > 3 and word in directionals:
+            out.append(directionals[word])
+        elif i == suffix_at and i > 1 and word in suffixes:
+            out.append(suffixes[word])
+        elif digits(word):
+            out.append(word.lower() if ordinal(word) else word)
+        elif word == "PO":
+            out.append(word)
+        else:
+            out.append(word.capitalize() if word.isalpha() else word.title())
+    if end < len(words):
+        out.append(" ".join([UNIT_DESIGNATORS[words[end]]] + words[end + 1:]).replace("# ", "#"))
+    return " ".join(out)
+
+def _split_street_city(text: str) -> tuple:
+    """'123 Main St Apt 4 Denver' -> ('123 Main St Apt 4', 'Denver')."""
+    suffixes = _address_tables()["suffixes"]
+    words = text.split()
+    if not words:
+        return '', ''
+    if not words[0][0].isdigit():
+        return '', text
+    cut = None
+    for i, word in enumerate(words[1:], 1):
+        upper = word.upper().rstrip(".")
+        if upper in suffixes:
+            cut = i + 1
+        elif upper in UNIT_DESIGNATORS or upper.startswith("#"):
+            cut = min(len(words), i + (1 if upper.startswith("#") and len(upper) > 1 else 2))
+            break
+    if cut is None:
+        return text, ''
+    return " ".join(words[:cut]), " ".join(words[cut:])
+
+def parse_address(text: str, typed_zip: str = '') -> dict:
+    """Split a one-line address into street, city, state and ZIP (parseAddress in index.html).
+
+    typed_zip is a ZIP entered in its own field, used if the text has none.
+    "issues" lists anything a person should look at: a missing or invalid
+    ZIP, or a ZIP that belongs to a different state than the one given.
+    """
+    tables = _address_tables()
+    text = " ".join(text.split())
+    zip_code, issues = typed_zip.strip(), []
+    zips = [m for m in tables["zip"].finditer(text) if m.start() > 0 or m.end() == len(text)]
+    if zips:
+        match = zips[-1]
+        zip_code = match.group(1) + (f"-{match.group(2)}" if match.group(2) else '')
+        text = text[:match.start()] + text[match.end():]
+    parts = [part.strip() for part in text.split(",") if part.strip()]
+    if parts and parts[-1].upper() in ("USA", "US", "UNITED STATES"):
+        parts.pop()
+
+    state = ''
+    if parts:
+        words = parts[-1].split()
+        for n in (3, 2, 1):
+            if len(words) < n:
+                continue
+            candidate = normalize_state(" ".join(words[-n:]))
+            # "123 Oak Ct" is a street, not Connecticut
+            if candidate and candidate != "ALL" and not (
+                    n == 1 and len(parts) == 1 and not zip_code and len(words) > 1):
+                state = candidate
+                del words[-n:]
+                break
+        parts[-1] = " ".join(words)
+        if not parts[-1]:
+            parts.pop()
+
+    if len(parts) >= 2:
+        street, city = ", ".join(parts[:-1]), parts[-1]
+    elif parts:
+        street, city = _split_street_city(parts[0])
+    else:
+        street = city = ''
+    return finish_address(street, city, state, zip_code, issues)
+
+def finish_address(street: str, city: str, state: str, zip_code: str, issues: list = None) -> dict:
+    """Normalize the parts and fill state and city from the ZIP.
+
+    A ZIP that isn't one is kept as typed and reported, so the person can
+    correct it rather than lose it.
+    """
+    issues = [] if issues is None else issues
+    valid_zip = normalize_zip(zip_code) if zip_code else ''
+    zip_state = state_from_zip(valid_zip) if valid_zip else ''
+    if not zip_code:
+        issues.append("no ZIP")
+    elif not valid_zip:
+        issues.append(f"invalid ZIP {zip_code!r}")
+    elif state and zip_state and state != zip_state:
+        issues.append(f"ZIP {valid_zip[:5]} is in {zip_state}")
+    state = state or zip_state
+    city = normalize_city(city) if city else city_from_zip(valid_zip)
+    return {"street": normalize_street(street) if street else '', "city": city,
+            "state": state, "zip": valid_zip or zip_code, "issues": issues}
+
+def normalize_profile(profile: dict) -> dict:
+    """A copy of the profile with its address fields normalized.
+
+    Works with separate street/city/state/ZIP fields, or with the whole
+    address typed into user_address. Problems are listed under
+    "address_issues" rather than raised, so one bad row never stops a batch.
+    """
+    street = profile.get('user_address', '').strip()
+    city = profile.get('user_city', '').strip()
+    state = profile.get('user_state', '').strip()
+    zip_code = profile.get('zip_code', '').strip()
+    if not (city or state or zip_code) or ("," in street and not city):
+        parsed = parse_address(street, zip_code)
+    else:
+        issues = []
+        typed_state = normalize_state(state) if state else ''
+        if state and not typed_state:
+            issues.append(f"unknown state {state!r}")
+        if not state and not zip_code and street:
+            # Everything may have been typed on one line
+            parsed = parse_address(street)
+        else:
+            parsed = finish_address(street, city, typed_state, zip_code, issues)
+    result = dict(profile, user_address=parsed["street"], user_city=parsed["city"],
+                  user_state=parsed["state"], zip_code=parsed["zip"])
+    if parsed["issues"]:
+        result["address_issues"] = parsed["issues"]
+    else:
+        result.pop("address_issues", None)
+    return result
+
+def _normalize_chunk(profiles: list) -> list:
+    return [normalize_profile(p) for p in profiles]
+
+def normalize_profiles(profiles, workers: int = 1, chunk_size: int = 2000):
+    """Stream normalized profiles, on a process pool when workers > 1. Order is kept."""
+    for chunk in map_chunks(_normalize_chunk, profiles, workers, chunk_size):
+        yield from chunk
+
+def cmd_normalize(args):
+    """Normalize a roster's addresses and write it back out as CSV or JSONL."""
+    import csv
+    import time
+    started = time.perf_counter()
+    rows = flagged = 0
+    out = sys.stdout if args.out == '-' else open(args.out, 'w', newline='', encoding='utf-8')
+    try:
+        writer = None
+        for rows, profile in enumerate(normalize_profiles(read_profiles(args.roster),
+                                                          args.workers, args.chunk_size), 1):
+            issues = profile.pop("address_issues", [])
+            flagged += bool(issues)
+            if args.out.endswith(('.jsonl', '.ndjson')) or (args.out == '-' and args.format == 'jsonl'):
+                if issues:
+                    profile["address_issues"] = issues
+                out.write(json.dumps(profile, ensure_ascii=False) + "\n")
+                continue
+            if writer is None:
+                writer = csv.DictWriter(out, fieldnames=list(profile) + ["address_issues"],
+                                        extrasaction='ignore')
+                writer.writeheader()
+            profile["address_issues"] = "; ".join(issues)
+            writer.writerow(profile)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    seconds = time.perf_counter() - started
+    rate = rows / seconds if seconds else 0.0
+    print(f"Normalized {rows} addresses in {seconds:.2f}s ({rate:,.0f}/s); "
+          f"{flagged} need a look.", file=sys.stderr)
+
+# ============================================================================
+# BATCH MODE - render messages for a whole roster without prompts
+# ============================================================================
+
+# Roster columns we accept besides the config key names themselves
+PROFILE_ALIASES = {
+    "name": "user_name",
+    "email": "user_email",
+    "address": "user_address",
+    "street": "user_address",
+    "city": "user_city",
+    "state": "user_state",
+    "zip": "zip_code",
+}
+
+def read_profiles(path: str):
+    """Yield constituent profiles from a .csv or .jsonl roster, one at a time."""
+    import csv
+
+    def normalize(row: dict) -> dict:
+        profile = {}
+        for key, value in row.items():
+            key = (key or '').strip().lower()
+            key = PROFILE_ALIASES.get(key, key)
+            if key == 'zip_code' and isinstance(value, int) and value < 10_000:
+                # A spreadsheet turned 02134 into 2134. Padding would be a guess,
+                # so it stays four digits and fails as an invalid ZIP.
+                print(f"{path}: ZIP {value} has lost its leading zeros - fix it in the roster",
+                      file=sys.stderr)
+            profile[key] = '' if value is None else str(value).strip()
+        if profile.get('user_state'):
+            profile['user_state'] = profile['user_state'].upper()
+        return profile
+
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith(('.jsonl', '.ndjson')):
+            for line in f:
+                if line.strip():
+                    yield normalize(json.loads(line))
+        else:
+            for row in csv.DictReader(f):
+                yield normalize(row)
+
+def render_profile(profile: dict, targets: list, kind: str) -> list:
+    """Render every message one constituent should send."""
+    messages = []
+    if kind == 'congress':
+        text = render_congress_email(profile)
+        subject, _, body = text.partition("\n\n")
+        messages.append({
+            "user_name": profile.get('user_name', ''),
+            "from": profile.get('user_email', ''),
+            "to": "",
+            "company": "Congress",
+            "subject": subject.removeprefix("Subject: "),
+            "body": body,
+        })
+        return messages
+
+    for target in targets:
+        if kind == 'call':
+            subject, body = f"Call script for {target['company']}", render_ceo_call_script(profile, target)
+        else:
+            subject, _, body = render_ceo_email(profile, target).partition("\n\n")
+            subject = subject.removeprefix("Subject: ")
+        messages.append({
+            "user_name": profile.get('user_name', ''),
+            "from": profile.get('user_email', ''),
+            "to": target['phone'] if kind == 'call' else target['email'],
+            "company": target['company'],
+            "subject": subject,
+            "body": body,
+        })
+    return messages
+
+def _render_chunk(profiles: list, targets: list, kind: str) -> list:
+    if kind != 'email':
+        messages = []
+        for profile in profiles:
+            messages.extend(render_profile(profile, targets, kind))
+        return messages
+
+    # Bulk path: render each target's email across the whole chunk at once,
+    # bypassing the per-call cache since roster rows rarely repeat.
+    template = get_template("ceo_email")
+    per_target = [template.render_many([ceo_fields(p, t) for p in profiles]) for t in targets]
+    messages = []
+    for i, profile in enumerate(profiles):
+        for target, rendered in zip(targets, per_target):
+            subject, _, body = rendered[i].partition("\n\n")
+            messages.append({
+                "user_name": profile.get('user_name', ''),
+                "from": profile.get('user_email', ''),
+                "to": target['email'],
+                "company": target['company'],
+                "subject": subject.removeprefix("Subject: "),
+                "body": body,
+            })
+    return messages
+
+def _chunks(iterable, size: int):
+    import itertools
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def render_batch(profiles, targets: list, kind: str = 'email',
+                 workers: int = 1, chunk_size: int = 500, normalize: bool = False):
+    """Stream rendered messages for an iterable of profiles.
+
+    With workers > 1 profiles are rendered in chunks on a process pool.
+    Only a couple of chunks per worker are in flight at once, so memory
+    stays bounded however large the roster is. Output order matches input.
+    normalize=True cleans up each profile's address first.
+    """
+    if normalize:
+        profiles = normalize_profiles(profiles, workers, chunk_size)
+    for messages in map_chunks(_render_chunk, profiles, workers, chunk_size, targets, kind):
+        yield from messages
+
+def map_chunks(func, items, workers: int, chunk_size: int, *args):
+    """Yield func(chunk, *args) for each chunk of items, in order.
+
+    With workers > 1 chunks run on a process pool with only a couple per
+    worker in flight, so memory stays bounded however many items there are.
+    """
+    if workers <= 1:
+        for chunk in _chunks(items, chunk_size):
+            yield func(chunk, *args)
+        return
+
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in _chunks(items, chunk_size):
+            pending.append(pool.submit(func, chunk, *args))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def message_to_mailto(message: dict) -> str:
+    import urllib.parse
+    return (f"mailto:{message['to']}?subject={urllib.parse.quote(message['subject'])}"
+            f"&body={urllib.parse.quote(message['body'])}")
+
+def write_batch(messages, fmt: str, out: str) -> int:
+    """Write rendered messages as jsonl/mailto lines (file or stdout) or .eml files."""
+    count = 0
+    if fmt == 'eml':
+        os.makedirs(out, exist_ok=True)
+        for count, message in enumerate(messages, 1):
+            with open(os.path.join(out, f"{count:07d}.eml"), 'wb') as f:
+                f.write(message_to_eml(message))
+        return count
+
+    f = sys.stdout if out == '-' else open(out, 'w', encoding='utf-8')
+    try:
+        for count, message in enumerate(messages, 1):
+            if fmt == 'mailto':
+                f.write(message_to_mailto(message) + "\n")
+            else:
+                f.write(json.dumps(message, ensure_ascii=False) + "\n")
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    return count
+
+def cmd_batch(args):
+    registry = get_target_registry()
+    if args.company:
+        targets = [registry.targets[registry.by_company[company_key(c)]]
+                   for c in args.company if company_key(c) in registry.by_company]
+    else:
+        targets = registry.featured()
+    if args.complicit_only:
+        targets = [t for t in targets if t.get("complicit")]
+    messages = render_batch(read_profiles(args.roster), targets, args.kind,
+                            workers=args.workers, chunk_size=args.chunk_size,
+                            normalize=args.normalize)
+    if args.format == 'smtp':
+        spool = MailSpool(server=args.smtp or SMTP_SERVER)
+        count = 0
+        for count, message in enumerate(messages, 1):
+            spool.enqueue(message)
+        print(f"Queued {count} messages.", file=sys.stderr)
+        if spool.server:
+            print_send_metrics(spool.flush())
+        return
+    count = write_batch(messages, args.format, args.out)
+    print(f"Rendered {count} messages.", file=sys.stderr)
+
+def print_send_metrics(metrics: dict):
+    print(f"Sent {metrics['sent']}, failed {metrics['failed']}, retried {metrics['retried']} "
+          f"in {metrics['seconds']:.1f}s ({metrics['per_sec']:.1f} msg/s)", file=sys.stderr)
+
+def cmd_send_outbox(args):
+    server = args.smtp or SMTP_SERVER
+    if not server:
+        sys.exit("No SMTP server: pass --smtp host:port or set ICE_ADVOCACY_SMTP.")
+    spool = MailSpool(server=server, rate=args.rate, retries=args.retries)
+    print(f"{len(spool.pending())} messages in outbox.", file=sys.stderr)
+    print_send_metrics(spool.flush())
+
+# ============================================================================
+# SERVER MODE - the same actions over a local HTTP API for many users
+# ============================================================================
+# `advocacy_tool.py serve` runs a small asyncio HTTP/1.1 server for kiosks
+# and community centers. Each user gets their own directory under USERS_DIR
+# with a profile and an action journal.
+#
+#   GET  /targets[?q=search]            companies to contact
+#   GET  /reps?zip=80202                senators + House rep
+#   GET  /near?zip=80202&kind=org|raid|city_hall|institution|protest[&n=5&miles=100]
+#   GET  /search?q=rapid+response[&state=CO&type=org|news|raid|resource&n=10]
+#   GET  /users/<id>/profile            PUT the same path to update it
+#   GET  /users/<id>/script?company=Target&kind=call|email|congress
+#   GET  /users/<id>/next               the company to contact next; POST to skip it
+#   POST /users/<id>/actions            {"type", "target", "method"}
+#   GET  /users/<id>/stats
+
+USERS_DIR = os.path.expanduser("~/.ice_advocacy_users")
+LINGER_SECONDS = 2.0  # how long a rejected request's unread input is drained
+# Users whose lock, journal and profile stay in memory between requests
+MAX_ACTIVE_USERS = 1000
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+HTTP_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+async def read_http_message(reader, max_body: int = 1 << 20):
+    """Read one HTTP/1.1 message: (start line, lowercased headers, body)."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode('latin-1').split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(400, "Content-Length must be a number") from None
+    if length < 0:
+        raise HTTPError(400, "Content-Length must be a number")
+    if length > max_body:
+        raise HTTPError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return lines[0], headers, body
+
+class AdvocacyServer:
+    """Routes API requests; blocking disk work runs on the default executor.
+
+    Per-user state is kept for the MAX_ACTIVE_USERS most recently seen
+    users; the longest idle are dropped (their journals flushed) beyond that.
+    """
+
+    def __init__(self, users_dir: str = USERS_DIR, max_users: int = MAX_ACTIVE_USERS):
+        import asyncio
+        self.users_dir = users_dir
+        self.max_users = max_users
+        self.profiles = {}
+        self.stores = {}
+        self.locks = {}
+        self.recent = {}  # user id -> None, least recently seen first
+        self.busy = {}  # user id -> requests in flight
+        self._asyncio = asyncio
+        os.makedirs(users_dir, exist_ok=True)
+        # Built before the first request, so no logged action can slip past it
+        self.scheduler = CampaignScheduler.from_history(
+            schedule_targets(get_target_registry()), user_histories(users_dir))
+        # The first use of each parses index.html; do it now rather than
+        # stalling every connection on the first request that needs one
+        get_rep_index()
+        get_search_index()
+        get_place_index()
+
+    def _user_dir(self, user_id: str) -> str:
+        import re
+        if not re.fullmatch(r"[A-Za-z0-9_-]{1,64}", user_id):
+            raise HTTPError(400, "User ids may only use letters, digits, '-' and '_'")
+        return os.path.join(self.users_dir, user_id)
+
+    def _touch(self, user_id: str):
+        """Mark a user as just seen, forgetting the longest idle past max_users."""
+        import itertools
+        self.recent.pop(user_id, None)
+        self.recent[user_id] = None
+        excess = len(self.recent) - self.max_users
+        if excess > 0:
+            oldest = itertools.islice(self.recent, excess + len(self.busy))
+            for old in [u for u in oldest if u not in self.busy and u != user_id][:excess]:
+                self._forget(old)
+
+    def _forget(self, user_id: str):
+        del self.recent[user_id]
+        self.locks.pop(user_id, None)
+        self.profiles.pop(user_id, None)
+        store = self.stores.pop(user_id, None)
+        if store is not None:
+            self._asyncio.get_running_loop().run_in_executor(None, store.close)
+
+    def _lock(self, user_id: str):
+        if user_id not in self.locks:
+            self.locks[user_id] = self._asyncio.Lock()
+        return self.locks[user_id]
+
+    def _open_store(self, user_id: str) -> JournalStore:
+        user_dir = self._user_dir(user_id)
+        os.makedirs(user_dir, exist_ok=True)
+        return JournalStore(os.path.join(user_dir, "actions.jsonl"))
+
+    async def _store(self, user_id: str) -> JournalStore:
+        if user_id not in self.stores:
+            store = await self._blocking(self._open_store, user_id)
+            return self.stores.setdefault(user_id, store)
+        return self.stores[user_id]
+
+    def _read_profile(self, user_id: str) -> dict:
+        path = os.path.join(self._user_dir(user_id), "profile.json")
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {k: v for k, v in DEFAULT_CONFIG.items()}
+
+    async def _load_profile(self, user_id: str) -> dict:
+        if user_id not in self.profiles:
+            profile = await self._blocking(self._read_profile, user_id)
+            # A PUT that finished while we were reading wins
+            return self.profiles.setdefault(user_id, profile)
+        return self.profiles[user_id]
+
+    def _save_profile(self, user_id: str, profile: dict):
+        user_dir = self._user_dir(user_id)
+        os.makedirs(user_dir, exist_ok=True)
+        save_config(profile, os.path.join(user_dir, "profile.json"))
+
+    async def _blocking(self, func, *args):
+        return await self._asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    @instrumented
+    async def route(self, method: str, path: str, query: dict, body: bytes):
+        parts = [p for p in path.split("/") if p]
+
+        if parts == ["targets"] and method == "GET":
+            registry = get_target_registry()
+            q = query.get("q", "")
+            return 200, registry.search(q, limit=50) if q else registry.featured()
+
+        if parts == ["reps"] and method == "GET":
+            return 200, get_rep_index().lookup(query.get("zip", ""), query.get("state", ""))
+
+        if parts == ["search"] and method == "GET":
+            try:
+                n = min(int(query.get("n", 10)), 100)
+            except ValueError:
+                raise HTTPError(400, "n must be a number") from None
+            return 200, get_search_index().search(query.get("q", ""), query.get("state", ""),
+                                                  query.get("type", ""), n)
+
+        if parts == ["near"] and method == "GET":
+            kind = query.get("kind", "org")
+            if kind not in PlaceIndex.KINDS:
+                raise HTTPError(400, f"kind must be one of {', '.join(PlaceIndex.KINDS)}")
+            try:
+                n = min(int(query.get("n", 5)), 100)
+                miles = float(query["miles"]) if query.get("miles") else None
+            except ValueError:
+                raise HTTPError(400, "n and miles must be numbers") from None
+            return 200, get_place_index().near_zip(query.get("zip", ""), kind, n, miles)
+
+        if len(parts) == 3 and parts[0] == "users":
+            user_id = parts[1]
+            self._user_dir(user_id)
+            self._touch(user_id)
+            self.busy[user_id] = self.busy.get(user_id, 0) + 1
+            try:
+                response = await self._user_route(method, user_id, parts[2], query, body)
+            finally:
+                self.busy[user_id] -= 1
+                if not self.busy[user_id]:
+                    del self.busy[user_id]
+            if response:
+                return response
+
+        if parts and parts[0] in ("targets", "reps", "near", "users"):
+            raise HTTPError(405, "Method not allowed")
+        raise HTTPError(404, "Not found")
+
+    async def _user_route(self, method: str, user_id: str, resource: str, query: dict, body: bytes):
+        """/users/<id>/<resource>; None when the method doesn't apply."""
+        if resource == "profile" and method == "GET":
+            return 200, await self._load_profile(user_id)
+        if resource == "profile" and method in ("PUT", "POST"):
+            updates = self._json_body(body)
+            async with self._lock(user_id):
+                profile = dict(await self._load_profile(user_id))
+                profile.update({k: str(v) for k, v in updates.items() if k in DEFAULT_CONFIG})
+                # The same cleanup as setup in the menus
+                profile = await self._blocking(normalize_profile, profile)
+                issues = profile.pop("address_issues", [])
+                await self._blocking(self._save_profile, user_id, profile)
+                self.profiles[user_id] = profile
+            return 200, dict(profile, address_issues=issues) if issues else profile
+
+        if resource == "script" and method == "GET":
+            profile = await self._load_profile(user_id)
+            kind = query.get("kind", "call")
+            if kind == "congress":
+                return 200, {"text": render_congress_email(profile)}
+            matches = get_target_registry().search(query.get("company", ""), limit=1)
+            if not matches:
+                raise HTTPError(404, "Unknown company")
+            render = render_ceo_email if kind == "email" else render_ceo_call_script
+            return 200, {"company": matches[0]['company'], "text": render(profile, matches[0])}
+
+        if resource == "actions" and method == "POST":
+            data = self._json_body(body)
+            if not all(data.get(k) for k in ("type", "target", "method")):
+                raise HTTPError(400, "Actions need type, target and method")
+            record = make_action_record(data['type'], data['target'], data['method'])
+            store = await self._store(user_id)
+            async with self._lock(user_id):
+                await self._blocking(store.append, record)
+            if record['type'] == "corporate":
+                self.scheduler.record(user_id, record['target'], record['date'])
+            return 201, record
+
+        if resource == "next" and method in ("GET", "POST"):
+            target = self.scheduler.assign(user_id, skip=method == "POST")
+            if target is None:
+                raise HTTPError(404, "You've contacted every company recently - check back tomorrow")
+            return 200, target
+
+        if resource == "stats" and method == "GET":
+            store = await self._store(user_id)
+            return 200, await self._blocking(store.summary)
+
+    @staticmethod
+    def _json_body(body: bytes) -> dict:
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "Body must be JSON") from None
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Body must be a JSON object")
+        return data
+
+    async def handle_connection(self, reader, writer):
+        import urllib.parse
+        asyncio = self._asyncio
+        try:
+            while True:
+                # A request we can't read to its end leaves the stream out of
+                # step, so its error response closes the connection
+                complete = keep_alive = False
+                try:
+                    start_line, headers, body = await read_http_message(reader)
+                    complete = True
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    method, target, version = start_line.split(" ", 2)
+                    url = urllib.parse.urlsplit(target)
+                    query = dict(urllib.parse.parse_qsl(url.query))
+                    status, payload = await self.route(method.upper(), url.path, query, body)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except asyncio.LimitOverrunError:
+                    status, payload = 400, {"error": "Request headers too long"}
+                except ValueError:
+                    status, payload = 400, {"error": "Malformed request"}
+                except Exception as e:
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+                    + data)
+                await writer.drain()
+                if not complete:
+                    await self._linger(reader, writer)
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+    async def _linger(self, reader, writer):
+        """Half-close and discard what the client is still sending.
+
+        Closing with unread input makes the kernel reset the connection,
+        which can destroy the error response before the client reads it.
+        """
+        asyncio = self._asyncio
+
+        async def discard():
+            while await reader.read(65536):
+                pass
+
+        try:
+            if writer.can_write_eof():
+                writer.write_eof()
+            await asyncio.wait_for(discard(), LINGER_SECONDS)
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+
+async def serve(host: str, port: int, users_dir: str = USERS_DIR):
+    import asyncio
+    server = AdvocacyServer(users_dir)
+    listener = await asyncio.start_server(server.handle_connection, host, port, backlog=1024)
+    print(f"Serving on http://{host}:{port}/ (users in {users_dir})", file=sys.stderr, flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+def cmd_serve(args):
+    import asyncio
+    try:
+        asyncio.run(serve(args.host, args.port, args.users_dir))
+    except KeyboardInterrupt:
+        pass
+
+# ============================================================================
+# LOAD TEST - requests/sec and latency percentiles against a running server
+# ============================================================================
+
+async def _load_client(host: str, port: int, requests: list, latencies: list, errors: list):
+    import asyncio
+    import time
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for method, path, body in requests:
+            data = json.dumps(body).encode() if body is not None else b""
+            started = time.perf_counter()
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+                         f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+            await writer.drain()
+            status_line, _, _ = await read_http_message(reader)
+            latencies.append(time.perf_counter() - started)
+            if not status_line.split(" ")[1].startswith("2"):
+                errors.append(status_line)
+    finally:
+        writer.close()
+
+def load_test_plan(client: int, count: int) -> list:
+    """A mix of reads, renders and writes resembling a phone-bank session."""
+    import urllib.parse
+    user = f"loadtest-{client}"
+    plan = [("PUT", f"/users/{user}/profile",
+             {"user_name": f"Volunteer {client}", "user_city": "Denver", "user_state": "CO", "zip_code": "80202"})]
+    companies = [t['company'] for t in CEO_TARGETS]
+    for i in range(count - 1):
+        company = urllib.parse.quote(companies[i % len(companies)])
+        step = i % 5
+        if step == 0:
+            plan.append(("GET", "/targets", None))
+        elif step == 1:
+            plan.append(("GET", f"/users/{user}/script?company={company}&kind=call", None))
+        elif step == 2:
+            plan.append(("GET", f"/users/{user}/script?company={company}&kind=email", None))
+        elif step == 3:
+            plan.append(("POST", f"/users/{user}/actions",
+                         {"type": "corporate", "target": companies[i % len(companies)], "method": "call"}))
+        else:
+            plan.append(("GET", "/reps?zip=80202", None))
+    return plan
+
+async def run_load_test(host: str, port: int, clients: int, requests: int) -> dict:
+    import asyncio
+    import time
+    latencies, errors = [], []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _load_client(host, port, load_test_plan(c, requests), latencies, errors)
+        for c in range(clients)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else 0.0
+
+    return {"requests": len(latencies), "errors": len(errors), "seconds": elapsed,
+            "rps": len(latencies) / elapsed if elapsed else 0.0,
+            "p50_ms": pct(0.50) * 1000, "p99_ms": pct(0.99) * 1000, "max_ms": pct(1.0) * 1000}
+
+def cmd_loadtest(args):
+    import asyncio
+    import subprocess
+    import tempfile
+    import time
+
+    server = None
+    tmp = None
+    host, port = args.host, args.port
+    if not args.no_spawn:
+        # Start a throwaway server with its own users directory
+        tmp = tempfile.TemporaryDirectory()
+        server = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "serve", "--host", host,
+             "--port", str(port), "--users-dir", tmp.name],
+            stderr=subprocess.PIPE)
+        server.stderr.readline()
+        time.sleep(0.2)
+    try:
+        result = asyncio.run(run_load_test(host, port, args.clients, args.requests))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+            tmp.cleanup()
+    print(f"{result['requests']} requests from {args.clients} clients in {result['seconds']:.2f}s")
+    print(f"  {result['rps']:,.0f} req/s   p50 {result['p50_ms']:.2f} ms   "
+          f"p99 {result['p99_ms']:.2f} ms   max {result['max_ms']:.2f} ms   errors {result['errors']}")
+
+# ============================================================================
+# STRESS TEST - many processes logging to one history and saving one config
+# ============================================================================
+
+def _stress_writer(job: tuple) -> int:
+    kind, history, config_path, worker, count, interval = job
+    import time
+    store = open_action_store(kind, history)
+    for i in range(count):
+        store.append(make_action_record("corporate", f"Company {worker % 7}",
+                                        "call" if i % 2 else "email"))
+        if i % 10 == 0:
+            save_config(dict(DEFAULT_CONFIG, user_name=f"Volunteer {worker}",
+                             user_city="x" * (i % 500)), config_path)
+        if interval:
+            time.sleep(interval)
+    store.flush()
+    return store.writes
+
+def cmd_stress(args):
+    """Hammer one store and config from many processes, then check nothing was lost."""
+    import tempfile
+    import time
+    from concurrent.futures import ProcessPoolExecutor, wait
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = os.path.join(tmp, {"sqlite": "actions.db", "packed": "actions.bin"}.get(
+            args.store, "actions.jsonl"))
+        config_path = os.path.join(tmp, "config.json")
+        jobs = [(args.store, history, config_path, w, args.actions, args.interval)
+                for w in range(args.processes)]
+
+        started = time.perf_counter()
+        reads = bad_reads = 0
+        with ProcessPoolExecutor(max_workers=args.processes) as pool:
+            futures = [pool.submit(_stress_writer, job) for job in jobs]
+            # Read the config the whole time the writers are replacing it
+            while not all(f.done() for f in futures):
+                try:
+                    with open(config_path, encoding='utf-8') as f:
+                        json.load(f)
+                    reads += 1
+                except FileNotFoundError:
+                    pass
+                except ValueError:
+                    bad_reads += 1
+            wait(futures)
+            writes = sum(f.result() for f in futures)
+        seconds = time.perf_counter() - started
+
+        expected = args.processes * args.actions
+        store = open_action_store(args.store, history)
+        actions = store.all()
+        rollup = store.rollup()
+        recount = StatsRollup.from_actions(actions)
+        problems = []
+        if len(actions) != expected:
+            problems.append(f"history has {len(actions)} actions, expected {expected}")
+        if args.store == 'journal':
+            with open(history, 'rb') as f:
+                lines = f.read().splitlines()
+            if len(lines) != len(actions):
+                problems.append(f"{len(lines) - len(actions)} unreadable journal lines")
+        if rollup.total != expected or rollup.by_target != recount.by_target:
+            problems.append(f"stats say {rollup.total} actions, history has {len(actions)}")
+        if bad_reads:
+            problems.append(f"{bad_reads} of {reads + bad_reads} config reads saw a partial file")
+        with open(config_path, encoding='utf-8') as f:
+            json.load(f)
+
+    print(f"{args.processes} processes logged {expected} actions in {seconds:.2f}s "
+          f"using {writes} history writes; config read {reads} times while being rewritten.")
+    if problems:
+        sys.exit("FAILED: " + "; ".join(problems))
+    print("OK: no actions lost, stats consistent, config never seen half-written.")
+
+# ============================================================================
+# LINK CHECK - probe every URL the tool and its data send volunteers to
+# ============================================================================
+# `advocacy_tool.py check-links` collects the URLs in this file, index.html
+# and the data bundle and probes them concurrently: HEAD first (GET when a
+# server refuses HEAD), following redirects, over pooled keep-alive
+# connections with a few per host. Results are cached for LINK_TTL seconds
+# so a re-run only probes what has gone stale.
+
+LINKS_CACHE_FILE = os.path.expanduser("~/.ice_advocacy_links.json")
+LINK_TTL = 24 * 3600
+LINK_TIMEOUT = 10.0
+LINKS_PER_HOST = 4
+LINK_CONNECTIONS = 100
+MAX_REDIRECTS = 5
+# Bodies of GET fallbacks up to this size are read so the connection can be reused
+LINK_DRAIN_LIMIT = 256 * 1024
+URL_PATTERN = r"https?://[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)+(?::\d+)?(?:[/?#][^\s\"'<>`\\]*)?"
+# A person would get through; a bot may be turned away
+BLOCKED_STATUSES = {401, 403, 429, 999}
+DEAD_STATUSES = {404, 410}
+LINK_VERDICTS = ("ok", "blocked", "dead", "error")
+
+def default_link_sources() -> list:
+    paths = [os.path.abspath(__file__), SITE_HTML]
+    if os.path.isdir(BUNDLE_DIR):
+        paths.extend(os.path.join(BUNDLE_DIR, name) for name in sorted(os.listdir(BUNDLE_DIR))
+                     if name.endswith(".json"))
+    return paths
+
+def extract_urls(paths: list) -> dict:
+    """{url: ["file:line", ...]} for every http(s) URL in the given files.
+
+    URLs with template fields ({zip_code}) and string literals continued
+    on the next line are skipped - they are not links as written.
+    """
+    import re
+    pattern = re.compile(URL_PATTERN)
+    continued = re.compile(r"[\"']\s*\n\s*[\"']")
+    found = {}
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            text = f.read()
+        name = os.path.basename(path)
+        line, position = 1, 0
+        for match in pattern.finditer(text):
+            url = match.group().rstrip(".,;:!?)]}")
+            if "{" in url or continued.match(text, match.end()):
+                continue
+            line += text.count("\n", position, match.start())
+            position = match.start()
+            found.setdefault(url, []).append(f"{name}:{line}")
+    return found
 
-  What would you like to do?
+async def read_http_response(reader, method: str) -> tuple:
+    """Read one response: (status, lowercased headers, whether the connection can be reused)."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode('latin-1').split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    reusable = lines[0].startswith("HTTP/1.1") and headers.get("connection", "").lower() != "close"
+    if method == "HEAD" or status in (204, 304) or status < 200:
+        return status, headers, reusable
+    length = headers.get("content-length")
+    if length is None or "chunked" in headers.get("transfer-encoding", "").lower() \
+            or int(length) > LINK_DRAIN_LIMIT:
+        return status, headers, False
+    await reader.readexactly(int(length))
+    return status, headers, reusable
 
-  1. 📞 CALL - Opens phone dialer with script
-  2. 📧 EMAIL - Opens email with pre-written message
-  3. 📋 COPY SCRIPT - View/copy the call script
-  4. 📋 COPY EMAIL - View/copy the email template
+class ConnectionPool:
+    """Keep-alive HTTP/1.1 connections per (scheme, host, port).
 
-  0. Back
-""")
+    At most `per_host` requests are in flight to one host and `total`
+    overall; idle connections are reused by the next request to that host.
+    """
 
-    choice = input("  Select action: ").strip()
+    def __init__(self, per_host: int = LINKS_PER_HOST, total: int = LINK_CONNECTIONS,
+                 timeout: float = LINK_TIMEOUT):
+        import asyncio
+        import ssl
+        self._asyncio = asyncio
+        self.per_host = per_host
+        self.timeout = timeout
+        self.slots = asyncio.Semaphore(total)
+        self.hosts = {}
+        self.idle = {}
+        self.ssl = ssl.create_default_context()
+        self.opened = 0
 
-    user_name = config.get('user_name', 'A concerned citizen')
-    user_address = config.get('user_address', '')
-    user_city = config.get('user_city', '')
-    user_state = config.get('user_state', '')
-    zip_code = config.get('zip_code', '')
+    async def _connect(self, scheme: str, host: str, port: int):
+        self.opened += 1
+        return await self._asyncio.wait_for(self._asyncio.open_connection(
+            host, port, ssl=self.ssl if scheme == "https" else None), self.timeout)
 
-    if choice == '1':
-        # Show script and open dialer
-        script = CEO_CALL_SCRIPT.format(
-            company=target['company'],
-            ceo=target['ceo'],
-            user_name=user_name,
-            customer_type="customer and community member",
-            phone=target['phone']
-        )
-        print(script)
-        input("\nPress Enter to open phone dialer...")
-        open_phone_dialer(target['phone'])
-        log_action(config, "corporate", target['company'], "call")
-        print("\n✓ Action logged! Great work!")
-        input("Press Enter to continue...")
+    async def request(self, method: str, url: str) -> tuple:
+        """(status, headers) for a bodiless request to url."""
+        from urllib.parse import urlsplit
+        asyncio = self._asyncio
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"not a web address: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        message = (f"{method} {target} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+                   f"User-Agent: ice-advocacy-link-check\r\nAccept: */*\r\n\r\n").encode('latin-1')
+        if key not in self.hosts:
+            self.hosts[key] = asyncio.Semaphore(self.per_host)
+            self.idle[key] = []
+        async with self.hosts[key], self.slots:
+            while True:
+                reused = bool(self.idle[key])
+                reader, writer = self.idle[key].pop() if reused else await self._connect(*key)
+                try:
+                    writer.write(message)
+                    await writer.drain()
+                    status, headers, reusable = await asyncio.wait_for(
+                        read_http_response(reader, method), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if reused:
+                        continue  # the server closed an idle connection; use a fresh one
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                if reusable:
+                    self.idle[key].append((reader, writer))
+                else:
+                    writer.close()
+                return status, headers
 
-    elif choice == '2':
-        # Open email client
-        subject = f"Urging {target['company']} to Commit to Non-Cooperation with ICE"
-        body = CEO_EMAIL_TEMPLATE.format(
-            company=target['company'],
-            ceo=target['ceo'],
-            user_name=user_name,
-            user_address=user_address,
-            user_city=user_city,
-            user_state=user_state,
-            zip_code=zip_code,
-            customer_type="customer and community member"
-        )
-        print("\n  Opening email client...")
-        open_email_client(target['email'], subject, body)
-        log_action(config, "corporate", target['company'], "email")
-        print("\n✓ Action logged! Great work!")
-        input("Press Enter to continue...")
+    def close(self):
+        for connections in self.idle.values():
+            for _, writer in connections:
+                writer.close()
+        self.idle.clear()
 
-    elif choice == '3':
-        # Show script
-        script = CEO_CALL_SCRIPT.format(
-            company=target['company'],
-            ceo=target['ceo'],
-            user_name=user_name,
-            customer_type="customer and community member",
-            phone=target['phone']
-        )
-        print(script)
-        input("\nPress Enter to continue...")
+def link_verdict(status: int) -> str:
+    if 200 <= status < 400:
+        return "ok"
+    if status in BLOCKED_STATUSES:
+        return "blocked"
+    if status in DEAD_STATUSES:
+        return "dead"
+    return "error"
 
-    elif choice == '4':
-        # Show email
-        email = CEO_EMAIL_TEMPLATE.format(
-            company=target['company'],
-            ceo=target['ceo'],
-            user_name=user_name,
-            user_address=user_address,
-            user_city=user_city,
-            user_state=user_state,
-            zip_code=zip_code,
-            customer_type="customer and community member"
-        )
-        print(f"\n  TO: {target['email']}")
-        print(email)
-        input("\nPress Enter to continue...")
+async def check_url(pool: ConnectionPool, url: str) -> dict:
+    """Probe one URL, following redirects: {verdict, status, final, error, ms, checked}."""
+    import asyncio
+    import socket
+    import time
+    from urllib.parse import urljoin
+    started = time.perf_counter()
+    result = {"verdict": "error", "status": None, "final": None, "error": None}
+    method, current = "HEAD", url
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            status, headers = await pool.request(method, current)
+            if method == "HEAD" and status in (400, 403, 405, 501):
+                method = "GET"  # some servers only answer GET
+                status, headers = await pool.request(method, current)
+            if status in (301, 302, 303, 307, 308) and headers.get("location"):
+                current = urljoin(current, headers["location"])
+                continue
+            result.update(verdict=link_verdict(status), status=status)
+            break
+        else:
+            result["error"] = f"more than {MAX_REDIRECTS} redirects"
+        if current != url:
+            result["final"] = current
+    except asyncio.TimeoutError:
+        result["error"] = "timed out"
+    except socket.gaierror:
+        result.update(verdict="dead", error="host not found")
+    except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as exc:
+        result["error"] = str(exc) or type(exc).__name__
+    result.update(ms=round((time.perf_counter() - started) * 1000, 1), checked=time.time())
+    return result
 
-# ============================================================================
-# CONGRESS ACTIONS
-# ============================================================================
+async def check_links(urls, cache: dict, ttl: float = LINK_TTL, per_host: int = LINKS_PER_HOST,
+                      total: int = LINK_CONNECTIONS, timeout: float = LINK_TIMEOUT) -> dict:
+    """Probe every URL whose cached result is older than ttl, updating cache in place."""
+    import asyncio
+    import time
+    now = time.time()
+    stale = [url for url in urls if now - cache.get(url, {}).get("checked", 0) >= ttl]
+    pool = ConnectionPool(per_host, total, timeout)
 
-def congress_menu(config: dict):
-    """Menu for contacting Congress."""
-    while True:
-        clear_screen()
-        zip_code = config.get('zip_code', '')
+    async def probe(url):
+        cache[url] = await check_url(pool, url)
 
-        print(f"""
-╔══════════════════════════════════════════════════════════════════╗
-║  CONTACT CONGRESS - FREEZE ICE FUNDING                           ║
-╠══════════════════════════════════════════════════════════════════╣
-║  Your ZIP: {zip_code:<52} ║
-╚══════════════════════════════════════════════════════════════════╝
+    try:
+        await asyncio.gather(*(probe(url) for url in stale))
+    finally:
+        pool.close()
+    return {"probed": len(stale), "cached": len(urls) - len(stale), "connections": pool.opened}
 
-  1. 🔍 FIND MY REPRESENTATIVES
-     Opens Congress.gov to find your reps by ZIP code
+def load_link_cache(path: str = LINKS_CACHE_FILE) -> dict:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
 
-  2. 📞 GET CALL SCRIPT
-     Pre-written script to read when you call
+def cmd_check_links(args):
+    """Check every link and print the ones that need attention."""
+    import asyncio
+    import time
+    urls = extract_urls(args.files or default_link_sources())
+    if not args.files:
+        urls.setdefault(EVENTS_SHEET_URL, []).append("EVENTS_SHEET_URL")
+    cache = {} if args.refresh else load_link_cache(args.cache)
+    started = time.perf_counter()
+    run = asyncio.run(check_links(urls, cache, ttl=args.ttl, per_host=args.per_host,
+                                  total=args.connections, timeout=args.timeout))
+    seconds = time.perf_counter() - started
+    atomic_write_json(args.cache, cache, durable=False)
 
-  3. 📧 GET EMAIL TEMPLATE
-     Pre-written email to send to your reps
+    by_verdict = {verdict: [] for verdict in LINK_VERDICTS}
+    for url in sorted(urls):
+        by_verdict[cache[url]["verdict"]].append(url)
+    print(f"{len(urls)} links: " + ", ".join(f"{len(by_verdict[v])} {v}" for v in LINK_VERDICTS))
+    print(f"  probed {run['probed']} over {run['connections']} connections in {seconds:.2f}s; "
+          f"{run['cached']} from the last {args.ttl / 3600:g}h")
+    for verdict in ("dead", "error", "blocked"):
+        for url in by_verdict[verdict]:
+            result = cache[url]
+            print(f"  {verdict.upper():<8}{result['status'] or result['error']}  {url}")
+            print(f"          in {', '.join(urls[url][:3])}" + (" ..." if len(urls[url]) > 3 else ""))
 
-  4. 🌐 OPEN 5 CALLS APP
-     The 5 Calls app gives you scripts + direct dial
+    if args.json:
+        atomic_write_json(args.json, {url: dict(cache[url], sources=sources)
+                                      for url, sources in sorted(urls.items())},
+                          indent=2, durable=False)
+        print(f"Report written to {args.json}")
+    if by_verdict["dead"]:
+        sys.exit(1)
 
-  5. 📝 STAND UP AMERICA PETITION
-     Quick online petition - they email Congress for you
+# ============================================================================
+# ORGANIZATION REPORT - campaign-wide totals across many volunteers
+# ============================================================================
+# `advocacy_tool.py aggregate DIR...` merges volunteers' config files (with
+# their legacy inline history), action journals and server user directories
+# into one report. Files are parsed on a process pool; the same action seen
+# twice (say in a config backup and in the journal) is counted once.
 
-  0. Back to main menu
-""")
+# Journal -> the profile that names its owner
+JOURNAL_COMPANIONS = {
+    "actions.jsonl": "profile.json",
+    os.path.basename(JOURNAL_FILE): os.path.basename(CONFIG_FILE),
+}
 
-        choice = input("  Select option: ").strip()
+def find_volunteer_files(paths: list) -> list:
+    """Every .json / .jsonl file under the given files and directories."""
+    found = []
+    for path in paths:
+        if not os.path.isdir(path):
+            found.append(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            found.extend(os.path.join(root, name) for name in sorted(files)
+                         if name.endswith(('.json', '.jsonl')) and not name.endswith('.stats.json'))
+    return found
 
-        if choice == '0':
-            return
-        elif choice == '1':
-            find_representatives(config)
-        elif choice == '2':
-            show_congress_call_script(config)
-        elif choice == '3':
-            show_congress_email(config)
-        elif choice == '4':
-            print("\n  Opening 5 Calls...")
-            open_url("https://5calls.org/")
-            input("  Press Enter to continue...")
-        elif choice == '5':
-            open_petition()
+def _volunteer_id(profile: dict, fallback: str) -> str:
+    return (profile.get('user_email') or profile.get('user_name') or fallback).strip().lower()
 
-def find_representatives(config: dict):
-    """Open Congress.gov to find representatives."""
-    zip_code = config.get('zip_code', '')
+def _journal_owner(path: str) -> str:
+    folder, name = os.path.split(path)
+    stem = os.path.splitext(name)[0]
+    companion = os.path.join(folder, JOURNAL_COMPANIONS.get(name, stem + ".json"))
+    fallback = os.path.basename(folder) if name in JOURNAL_COMPANIONS else stem
+    try:
+        with open(companion, encoding='utf-8') as f:
+            return _volunteer_id(json.load(f), fallback)
+    except (OSError, ValueError):
+        return fallback.lower()
 
-    print(f"""
+def read_volunteer_file(path: str) -> tuple:
+    """(owner, [(date, type, target, method)]) from a config or a journal.
 
-  Finding your representatives...
+    Read-only: unlike JournalStore.all() a torn journal tail is skipped,
+    not truncated, since these are other people's files.
+    """
+    if path.endswith('.jsonl'):
+        owner = _journal_owner(path)
+        with open(path, encoding='utf-8') as f:
+            lines = [line for line in f.read().splitlines() if line.strip()]
+        try:
+            # One decode for the whole journal; line by line only if it is damaged
+            records = json.loads("[" + ",".join(lines) + "]")
+        except ValueError:
+            records = []
+            for line in lines:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    else:
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+        fallback = os.path.splitext(os.path.basename(path))[0]
+        if os.path.basename(path) in JOURNAL_COMPANIONS.values():
+            fallback = os.path.basename(os.path.dirname(path))
+        owner, records = _volunteer_id(config, fallback), config.get('actions_taken') or []
+    return owner, [(r['date'], r['type'], r['target'], r['method'])
+                   for r in records if isinstance(r, dict) and 'date' in r]
 
-  Your ZIP code: {zip_code}
+def _aggregate_files(paths: list) -> tuple:
+    """Worker: deduplicated (user, date, type, target, method) rows, records read, errors."""
+    rows, read, errors = set(), 0, []
+    for path in paths:
+        try:
+            owner, records = read_volunteer_file(path)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            errors.append(f"{path}: {e}")
+            continue
+        read += len(records)
+        rows.update((owner,) + record for record in records)
+    return rows, read, errors
 
-  Opening Congress.gov in your browser...
-""")
+@instrumented
+def aggregate_actions(paths: list, workers: int = None, chunk_size: int = 200) -> dict:
+    """Merge every volunteer file under `paths` into deduplicated rows."""
+    import time
+    started = time.perf_counter()
+    files = find_volunteer_files(paths)
+    workers = workers or os.cpu_count() or 1
+    chunks = list(_chunks(files, chunk_size))
 
-    if zip_code:
-        url = f"https://www.congress.gov/members?q=%7B%22address%22%3A%22{zip_code}%22%7D"
+    rows, errors, seen = set(), [], 0
+    if workers <= 1 or len(chunks) <= 1:
+        results = map(_aggregate_files, chunks)
     else:
-        url = "https://www.congress.gov/members"
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(_aggregate_files, chunks)
+    try:
+        for chunk_rows, chunk_read, chunk_errors in results:
+            seen += chunk_read
+            rows |= chunk_rows
+            errors.extend(chunk_errors)
+    finally:
+        if workers > 1 and len(chunks) > 1:
+            pool.shutdown()
 
-    open_url(url)
+    from operator import itemgetter
+    return {"files": len(files), "rows": sorted(rows, key=itemgetter(1, 0)),
+            "duplicates": seen - len(rows), "errors": errors,
+            "seconds": time.perf_counter() - started}
 
-    print("""
-  Also useful:
-  - House: https://www.house.gov/representatives/find-your-representative
-  - Senate: https://www.senate.gov/senators/senators-contact.htm
-  - 5 Calls app: https://5calls.org/
-""")
-    input("  Press Enter to continue...")
+def _epoch_seconds(stamp: str, day_starts: dict):
+    """Seconds since the epoch for an ISO timestamp, memoizing each day's start."""
+    import calendar
+    from datetime import date, datetime
+    try:
+        day = day_starts.get(stamp[:10])
+        if day is None:
+            day = day_starts[stamp[:10]] = calendar.timegm(date.fromisoformat(stamp[:10]).timetuple())
+        if len(stamp) == 10:
+            return day
+        return day + int(stamp[11:13]) * 3600 + int(stamp[14:16]) * 60 + int(stamp[17:19])
+    except ValueError:
+        try:
+            return calendar.timegm(datetime.fromisoformat(stamp).timetuple())
+        except ValueError:
+            return None
 
-def show_congress_call_script(config: dict):
-    """Show the call script for Congress."""
-    user_name = config.get('user_name', '[YOUR NAME]')
-    user_city = config.get('user_city', '[YOUR CITY]')
-    user_state = config.get('user_state', '[STATE]')
-    zip_code = config.get('zip_code', '[ZIP]')
+def columnar_summary(rows: list) -> dict:
+    """Dictionary-encoded columns plus campaign totals.
 
-    script = CONGRESS_CALL_SCRIPT.format(
-        user_name=user_name,
-        user_city=user_city,
-        user_state=user_state,
-        zip_code=zip_code
-    )
+    Each string column is stored once as `values` with per-row integer
+    `codes`, and timestamps as seconds since the epoch, which keeps the
+    file small enough to pass around and load straight into a dataframe.
+    Totals are counted from the codes rather than row by row.
+    """
+    from collections import Counter
 
-    print(script)
+    columns, totals = {}, {"total": len(rows)}
+    for i, name, field in ((0, "user", None), (2, "type", "by_type"),
+                           (3, "target", "by_target"), (4, "method", "by_method")):
+        values = {}
+        codes = [values.setdefault(row[i], len(values)) for row in rows]
+        columns[name] = {"values": list(values), "codes": codes}
+        if field:
+            counts = Counter(codes)
+            totals[field] = {value: counts[code] for value, code in values.items()}
 
-    print("""
-  TIP: Find your rep's phone number at:
-  - https://www.house.gov/representatives/find-your-representative
-  - https://www.senate.gov/senators/senators-contact.htm
-  - Or use 5 Calls app which connects you directly
-""")
+    day_starts = {}
+    columns["time"] = [_epoch_seconds(row[1], day_starts) for row in rows]
 
-    log_action(config, "congress", "Congress", "call_script_viewed")
-    input("  Press Enter to continue...")
+    totals["by_day"] = dict(Counter(row[1][:10] for row in rows))
+    by_week = Counter()
+    for day, count in totals["by_day"].items():
+        try:
+            by_week[_iso_week(day)] += count
+        except ValueError:
+            continue
+    totals["by_week"] = dict(by_week)
+    totals["volunteers"] = len(columns["user"]["values"])
+    return {"rows": len(rows), "columns": columns, "totals": totals}
 
-def show_congress_email(config: dict):
-    """Show email template for Congress."""
-    user_name = config.get('user_name', '[YOUR NAME]')
-    user_address = config.get('user_address', '[YOUR ADDRESS]')
-    user_city = config.get('user_city', '[YOUR CITY]')
-    user_state = config.get('user_state', '[STATE]')
-    zip_code = config.get('zip_code', '[ZIP]')
-
-    email = CONGRESS_EMAIL_TEMPLATE.format(
-        user_name=user_name,
-        user_address=user_address,
-        user_city=user_city,
-        user_state=user_state,
-        zip_code=zip_code
-    )
-
-    print(email)
-    print("""
-  TIP: Find your rep's contact form at:
-  - https://www.house.gov/representatives/find-your-representative
-  - https://www.senate.gov/senators/senators-contact.htm
-""")
+def write_summary(summary: dict, path: str):
+    import gzip
+    opener = gzip.open if path.endswith('.gz') else open
+    tmp_path = path + ".tmp"
+    with opener(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(summary, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
 
-    log_action(config, "congress", "Congress", "email_template_viewed")
-    input("  Press Enter to continue...")
+def cmd_aggregate(args):
+    result = aggregate_actions(args.paths, workers=args.workers)
+    summary = columnar_summary(result["rows"])
+    totals = summary["totals"]
+    for error in result["errors"]:
+        print(f"skipped {error}", file=sys.stderr)
+
+    print(f"Read {result['files']} files in {result['seconds']:.2f}s "
+          f"({result['duplicates']} duplicate actions dropped).")
+    print(f"{totals['volunteers']} volunteers took {totals['total']} actions "
+          f"over {len(totals['by_day'])} days.")
+    for field, label in (("by_type", "By type"), ("by_method", "By method")):
+        print(f"  {label}: " + ", ".join(f"{k} {n}" for k, n in sorted(totals[field].items())))
+    rollup = StatsRollup(totals)
+    print("  Most contacted: " + ", ".join(f"{t} ({n})" for t, n in rollup.top_targets(10)))
+    for week in sorted(totals["by_week"])[-8:]:
+        print(f"  {week}: {totals['by_week'][week]}")
+
+    if args.out:
+        write_summary(summary, args.out)
+        print(f"Wrote {args.out}")
 
 # ============================================================================
-# PETITION
+# CONTACT SCHEDULER - spread volunteers across every company
 # ============================================================================
+# Left to the menu order, everyone calls the first few companies on the list
+# and the rest hear from nobody. The scheduler hands each volunteer the
+# company with the fewest contacts today (then overall) that is under its
+# daily quota and that this volunteer hasn't contacted in CONTACT_COOLDOWN
+# days. Used by the "next company" menu option, GET /users/<id>/next, and
+# `advocacy_tool.py schedule` for organizers.
 
-def open_petition():
-    """Open Stand Up America petition."""
-    print("""
+DAILY_QUOTA = int(os.environ.get("ICE_ADVOCACY_DAILY_QUOTA", "50"))
+CONTACT_COOLDOWN = 14  # days before a volunteer is sent to the same company again
+LOCAL_VOLUNTEER = "local"  # the interactive tool's history is all one person's
 
-  STAND UP AMERICA PETITION
-  ═════════════════════════
+@functools.lru_cache(maxsize=4096)
+def _day_number(day: str) -> int:
+    from datetime import date
+    return date.fromisoformat(day).toordinal()
 
-  "Tell Congress: Freeze Funding for ICE!"
+def schedule_targets(registry) -> list:
+    """Companies the scheduler hands out: every one with ICE ties and a phone or email."""
+    return [t for t in registry.complicit if t.get('phone') or t.get('email')]
 
-  This petition lets you quickly email your senators and
-  representatives. Just fill in your info and they send
-  the message for you.
+class CampaignScheduler:
+    """Assigns each volunteer the least-contacted company they may still contact.
 
-  Opening petition page...
-""")
-    open_url("https://act.standupamerica.com/")
-    input("  Press Enter to continue...")
+    Companies wait in a heap of (contacts today, contacts ever, index). A
+    company whose load changes is pushed again and its outdated entries
+    are dropped as they surface; one at its quota leaves the heap until
+    the next day. Each volunteer's last contact per company sits in a
+    dict, so the cooldown check is one lookup and an assignment costs
+    O(log n), plus one pop for each company the volunteer is cooling
+    down from.
+
+    An assignment counts towards the company's load straight away, so
+    volunteers asking at the same moment are spread out too. It is held
+    until the volunteer logs that contact or asks to skip it, and lapses
+    at the end of the day.
+    """
+
+    def __init__(self, targets: list, quota: int = DAILY_QUOTA, cooldown: int = CONTACT_COOLDOWN,
+                 today: str = None):
+        self.targets = list(targets)
+        self.quota = quota
+        self.cooldown = cooldown
+        self._names = {}
+        self._keys = {company_key(t['company']): i for i, t in enumerate(self.targets)}
+        self.total = [0] * len(self.targets)
+        self.daily = [0] * len(self.targets)
+        self.recent = {}   # volunteer -> {company index: day number of last contact}
+        self.pending = {}  # volunteer -> company index assigned but not yet logged
+        self.today = None
+        self.heap = []
+        self._roll(today)
+
+    @classmethod
+    def from_history(cls, targets: list, rows, **options) -> "CampaignScheduler":
+        """Replay (volunteer, date, type, target, method) rows, as aggregate_actions returns."""
+        scheduler = cls(targets, **options)
+        for volunteer, stamp, action_type, target, _ in rows:
+            if action_type != "corporate":
+                continue
+            try:
+                scheduler.record(volunteer, target, stamp)
+            except ValueError:
+                continue
+        return scheduler
+
+    @classmethod
+    def from_totals(cls, targets: list, by_target: dict, last_contact: dict,
+                    volunteer: str = LOCAL_VOLUNTEER, **options) -> "CampaignScheduler":
+        """Start from one volunteer's stats rollup instead of replaying the history.
+
+        by_target gives each company's contacts ever; last_contact
+        ({company: [latest day, contacts that day]}) gives its cooldown and
+        today's load. O(companies), however long the history.
+        """
+        scheduler = cls(targets, **options)
+        for company, count in by_target.items():
+            i = scheduler._company(company)
+            if i is not None:
+                scheduler.total[i] += count
+        contacts = scheduler.recent.setdefault(volunteer, {})
+        for company, (day, count) in last_contact.items():
+            i = scheduler._company(company)
+            if i is None:
+                continue
+            contacts[i] = _day_number(day)
+            if contacts[i] == scheduler.today:
+                scheduler.daily[i] += count
+        scheduler._reheap()
+        return scheduler
+
+    def _company(self, name: str):
+        if name not in self._names:
+            self._names[name] = self._keys.get(company_key(name))
+        return self._names[name]
+
+    def _roll(self, today: str = None):
+        """Start a new day: today's counts reset and unlogged assignments lapse."""
+        from datetime import date
+        day = _day_number(today[:10]) if today else date.today().toordinal()
+        if day == self.today:
+            return
+        self.today = day
+        for i in self.pending.values():
+            self.total[i] -= 1
+        self.pending.clear()
+        self.daily = [0] * len(self.targets)
+        self._reheap()
+
+    def _reheap(self):
+        import heapq
+        self.heap = [(self.daily[i], self.total[i], i)
+                     for i in range(len(self.targets)) if self.daily[i] < self.quota]
+        heapq.heapify(self.heap)
+
+    def _push(self, i: int):
+        import heapq
+        if self.daily[i] < self.quota:
+            heapq.heappush(self.heap, (self.daily[i], self.total[i], i))
+        if len(self.heap) > 2 * len(self.targets) + 64:
+            self._reheap()  # mostly outdated entries by now
+
+    def record(self, volunteer: str, company: str, stamp: str = None) -> bool:
+        """Count one logged contact; False if the company isn't one the scheduler hands out."""
+        i = self._company(company)
+        if i is None:
+            return False
+        if stamp is None:
+            self._roll()
+            day = self.today
+        else:
+            day = _day_number(stamp[:10])
+        contacts = self.recent.setdefault(volunteer, {})
+        if day > contacts.get(i, day - 1):
+            contacts[i] = day
+        if day == self.today and self.pending.get(volunteer) == i:
+            del self.pending[volunteer]  # counted when it was assigned
+            return True
+        self.total[i] += 1
+        if day == self.today:
+            self.daily[i] += 1
+        self._push(i)
+        return True
+
+    @instrumented
+    def assign(self, volunteer: str, skip: bool = False, today: str = None):
+        """The company this volunteer should contact next, or None if none is due.
+
+        Asking again returns the same company until it is logged; with
+        skip=True it is released and a different one is chosen.
+        """
+        import heapq
+        self._roll(today)
+        current = self.pending.pop(volunteer, None)
+        if current is not None:
+            if not skip:
+                self.pending[volunteer] = current
+                return self.targets[current]
+            self.total[current] -= 1
+            self.daily[current] -= 1
+            self._push(current)
+
+        contacts = self.recent.get(volunteer, {})
+        held, choice = [], None
+        while self.heap:
+            entry = heapq.heappop(self.heap)
+            load, total, i = entry
+            if load != self.daily[i] or total != self.total[i]:
+                continue  # outdated: pushed again since with its new load
+            if i == current or self.today - contacts.get(i, self.today - self.cooldown) < self.cooldown:
+                held.append(entry)
+                continue
+            choice = i
+            break
+        for entry in held:
+            heapq.heappush(self.heap, entry)
+        if choice is None:
+            return None
+
+        self.pending[volunteer] = choice
+        self.total[choice] += 1
+        self.daily[choice] += 1
+        self._push(choice)
+        return self.targets[choice]
+
+    def load(self, company: str) -> tuple:
+        """(contacts today, contacts ever) for a company, assignments included."""
+        i = self._company(company)
+        return (0, 0) if i is None else (self.daily[i], self.total[i])
+
+_scheduler = None
+
+@instrumented
+def get_scheduler() -> CampaignScheduler:
+    global _scheduler
+    if _scheduler is None:
+        rollup = get_action_store().rollup()
+        _scheduler = CampaignScheduler.from_totals(
+            schedule_targets(get_target_registry()), rollup.by_target, rollup.last_contact)
+    return _scheduler
+
+def note_contacts(records: list):
+    """Tell the scheduler, if it has been started, about newly logged actions."""
+    if _scheduler is None:
+        return
+    for record in records:
+        if record['type'] == "corporate":
+            _scheduler.record(LOCAL_VOLUNTEER, record['target'], record['date'])
+
+def user_histories(users_dir: str):
+    """(user id, date, type, target, method) rows from every server user's journal."""
+    try:
+        users = sorted(os.listdir(users_dir))
+    except FileNotFoundError:
+        return
+    for user_id in users:
+        path = os.path.join(users_dir, user_id, "actions.jsonl")
+        try:
+            _, records = read_volunteer_file(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+        for record in records:
+            yield (user_id,) + record
+
+def cmd_schedule(args):
+    import csv
+    result = aggregate_actions(args.paths, workers=args.workers)
+    for error in result["errors"]:
+        print(f"skipped {error}", file=sys.stderr)
+    targets = schedule_targets(get_target_registry())
+    scheduler = CampaignScheduler.from_history(targets, result["rows"], quota=args.quota,
+                                               cooldown=args.cooldown)
+    volunteers = sorted({row[0] for row in result["rows"]})
+
+    out = sys.stdout if args.out == "-" else open(args.out, 'w', newline='', encoding='utf-8')
+    try:
+        writer = csv.writer(out)
+        writer.writerow(["volunteer", "company", "ceo", "phone", "email"])
+        waiting, companies = 0, set()
+        for volunteer in volunteers:
+            target = scheduler.assign(volunteer)
+            if target is None:
+                waiting += 1
+                writer.writerow([volunteer, "", "", "", ""])
+            else:
+                companies.add(target['company'])
+                writer.writerow([volunteer, target['company'], target['ceo'],
+                                 target.get('phone', ''), target.get('email', '')])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"Assigned {len(volunteers) - waiting} of {len(volunteers)} volunteers across "
+          f"{len(companies)} of {len(targets)} companies"
+          + (f"; {waiting} have contacted every company recently." if waiting else "."),
+          file=sys.stderr)
 
 # ============================================================================
-# STATS & RESOURCES
+# BENCHMARKS
 # ============================================================================
 
-def show_stats(config: dict):
-    """Show advocacy statistics."""
-    clear_screen()
-    actions = config.get('actions_taken', [])
+BENCHMARKS = {}
 
-    print("""
-╔══════════════════════════════════════════════════════════════════╗
-║  YOUR ADVOCACY STATS                                             ║
-╚══════════════════════════════════════════════════════════════════╝
-""")
+def benchmark(name: str):
+    """Register a function as a named benchmark for the 'bench' command."""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
 
-    if not actions:
-        print("  You haven't taken any logged actions yet.")
-        print("  Start by contacting a corporate CEO or your Congress member!")
-    else:
-        corporate_actions = [a for a in actions if a['type'] == 'corporate']
-        congress_actions = [a for a in actions if a['type'] == 'congress']
+def time_per_call(func, number: int) -> float:
+    """Best-of-three seconds per call."""
+    import timeit
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
 
-        print(f"  Total actions: {len(actions)}")
-        print(f"  Corporate contacts: {len(corporate_actions)}")
-        print(f"  Congress contacts: {len(congress_actions)}")
-        print()
-        print("  Recent actions:")
-        print("  " + "─"*50)
-        for action in actions[-10:]:
-            date = action['date'][:10]
-            print(f"  {date} - {action['type']}: {action['target']} ({action['method']})")
+@benchmark("templates")
+def bench_templates() -> dict:
+    """str.format vs compiled template vs cached render for the CEO email."""
+    profile = {"user_name": "Alex Doe", "user_address": "1 Main St",
+               "user_city": "Denver", "user_state": "CO", "zip_code": "80202"}
+    target = CEO_TARGETS[0]
+    fields = ceo_fields(profile, target)
+    profiles = [dict(profile, user_name=f"Person {i}") for i in range(1000)]
+    bulk_fields = [ceo_fields(p, target) for p in profiles]
+    template = get_template("ceo_email")
 
-    print()
-    input("  Press Enter to continue...")
+    results = {
+        "str_format": time_per_call(lambda: CEO_EMAIL_TEMPLATE.format(**fields), 20000),
+        "compiled": time_per_call(lambda: template.render(fields), 20000),
+        "cached": time_per_call(lambda: render_ceo_email(profile, target), 20000),
+        "bulk_str_format_1000": time_per_call(
+            lambda: [CEO_EMAIL_TEMPLATE.format(**f) for f in bulk_fields], 20),
+        "bulk_compiled_1000": time_per_call(lambda: template.render_many(bulk_fields), 20),
+    }
+    return {name: {"seconds": t, "per_sec": (1000 if name.startswith("bulk") else 1) / t}
+            for name, t in results.items()}
 
-def show_resources():
-    """Show resources and know your rights info."""
-    clear_screen()
-    print("""
-╔══════════════════════════════════════════════════════════════════╗
-║  RESOURCES & KNOW YOUR RIGHTS                                    ║
-╚══════════════════════════════════════════════════════════════════╝
+@benchmark("reps")
+def bench_reps() -> dict:
+    """Index build/load time and ZIP lookups across every 5-digit ZIP."""
+    import time
+    started = time.perf_counter()
+    index = RepresentativeIndex.build()
+    build = time.perf_counter() - started
 
-  KNOW YOUR RIGHTS
-  ────────────────
-  - ACLU Know Your Rights: https://www.aclu.org/know-your-rights
-  - National Immigration Law Center: https://www.nilc.org/
-  - United We Dream: https://unitedwedream.org/
-  - Immigrant Legal Resource Center: https://www.ilrc.org/
-
-  BUSINESS RIGHTS (for businesses)
-  ─────────────────────────────────
-  - Businesses can require a JUDICIAL warrant (not ICE administrative
-    warrants) before allowing access to non-public areas
-  - Businesses can refuse to answer questions about employees
-  - Businesses can refuse to consent to searches
-
-  ADVOCACY ORGANIZATIONS
-  ──────────────────────
-  - Stand Up America: https://standupamerica.com/
-  - 50501 Minnesota: https://www.50501mn.org/
-  - 5 Calls: https://5calls.org/
-  - Indivisible: https://indivisible.org/
-
-  REPORTING ICE ACTIVITY
-  ──────────────────────
-  - United We Dream hotline: 1-844-363-1423
-  - Local rapid response networks vary by city
-
-  SANCTUARY CITY INFO
-  ───────────────────
-  Many cities limit cooperation with ICE. Check if your city
-  has sanctuary policies at your city government website.
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "reps.idx")
+        index.save(path, [0, 0])
+        load = time_per_call(lambda: RepresentativeIndex.load(path).close(), 50)
+        mapped = RepresentativeIndex.load(path)
+        zips = [f"{z:05d}" for z in range(100000)]
+        started = time.perf_counter()
+        for z in zips:
+            mapped.lookup(z)
+        lookup = (time.perf_counter() - started) / len(zips)
+        mapped.close()
 
-""")
-    input("  Press Enter to continue...")
+    return {
+        "build_index": {"seconds": build, "per_sec": 1 / build},
+        "load_prebuilt": {"seconds": load, "per_sec": 1 / load},
+        "lookup_all_100k_zips": {"seconds": lookup, "per_sec": 1 / lookup},
+    }
+
+@benchmark("targets")
+def bench_targets() -> dict:
+    """Registry build and search latency over a synthetic 5,000-company list."""
+    import random
+    rng = random.Random(42)
+    words = ["acme", "global", "north", "star", "data", "secure", "systems", "air",
+             "logistics", "capital", "health", "prison", "transit", "cloud", "labs"]
+    fake = [{"company": f"{rng.choice(words).title()} {rng.choice(words).title()} {n}",
+             "ceo": f"Person {n}", "title": "CEO", "phone": "", "email": "",
+             "complicit": n % 2 == 0, "state": rng.choice(["CO", "CA", "TX", "NY"])}
+            for n in range(5000)]
+    targets = CEO_TARGETS + site_targets() + fake
+    build = time_per_call(lambda: TargetRegistry(targets), 3)
+    registry = TargetRegistry(targets)
+    return {
+        "build_5k": {"seconds": build, "per_sec": 1 / build},
+        "exact": _per_sec(time_per_call(lambda: registry.search("palantir"), 2000)),
+        "prefix": _per_sec(time_per_call(lambda: registry.search("secure"), 2000)),
+        "ceo_prefix": _per_sec(time_per_call(lambda: registry.search("person 12"), 2000)),
+        "fuzzy": _per_sec(time_per_call(lambda: registry.search("palantr"), 20)),
+        "by_state": _per_sec(time_per_call(lambda: registry.in_state("CO"), 2000)),
+    }
+
+@benchmark("aggregate")
+def bench_aggregate() -> dict:
+    """Merge 10,000 synthetic volunteer configs and journals."""
+    import random
+    import tempfile
+    import time
+    rng = random.Random(7)
+    companies = [t["company"] for t in CEO_TARGETS]
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in range(10000):
+            actions = [{"date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00",
+                        "type": "corporate", "target": rng.choice(companies),
+                        "method": rng.choice(["call", "email"])} for _ in range(20)]
+            with open(os.path.join(tmp, f"v{n}.json"), 'w') as f:
+                json.dump({"user_email": f"v{n}@example.org", "actions_taken": actions[:10]}, f)
+            with open(os.path.join(tmp, f"v{n}.jsonl"), 'w') as f:
+                f.writelines(json.dumps(a) + "\n" for a in actions[5:])
+        serial = aggregate_actions([tmp], workers=1)["seconds"]
+        parallel = aggregate_actions([tmp])["seconds"]
+        started = time.perf_counter()
+        columnar_summary(aggregate_actions([tmp])["rows"])
+        summarize = time.perf_counter() - started
+    # Rates are volunteers per second
+    return {name: {"seconds": t, "per_sec": 10000 / t} for name, t in (
+        ("merge_10k_serial", serial), ("merge_10k_pool", parallel),
+        ("merge_and_summarize_10k", summarize))}
+
+@benchmark("bundle")
+def bench_bundle() -> dict:
+    """Bytes and parse time of each data shard vs. every table in index.html."""
+    import tempfile
+    html = _site_source()
+    tables = ("zipToCityMap", "zipToDistrictDB") + STATE_KEYED_TABLES + STATE_FIELD_TABLES + NATIONAL_TABLES
+
+    def parse_page():
+        import re
+        for name in tables:
+            match = re.search(rf"\bconst {re.escape(name)}\s*=\s*", html)
+            _JSLiteralParser(html, match.end()).value()
+
+    results = {"index_html_all_tables": dict(_per_sec(time_per_call(parse_page, 3)),
+                                             bytes=len(html.encode('utf-8')))}
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = write_bundle(build_dataset(), tmp)
+        for name, info in sorted(manifest["shards"].items(), key=lambda kv: -kv[1]["bytes"]):
+            with open(os.path.join(tmp, info["file"]), 'rb') as f:
+                raw = f.read()
+            results[f"shard_{name}"] = dict(_per_sec(time_per_call(lambda: json.loads(raw), 200)),
+                                            bytes=info["bytes"], gzip_bytes=info["gzip_bytes"])
+    return results
+
+@benchmark("nearby")
+def bench_nearby() -> dict:
+    """Index build, ZIP placement and nearest-N queries over the site data."""
+    import random
+    import time
+    started = time.perf_counter()
+    index = PlaceIndex.build()
+    build = time.perf_counter() - started
+
+    rng = random.Random(3)
+    zips = [f"{rng.randint(1000, 99999):05d}" for _ in range(2000)]
+    spots = [w for w in map(index.locate_zip, zips) if w]
+
+    def queries(kind, n, miles=None):
+        for w in spots:
+            index.near(w["lat"], w["lon"], kind, n, miles)
+
+    # Synthetic: 100k points scattered over the continental US
+    vectors = [_unit_vector(rng.uniform(25, 49), rng.uniform(-124, -67)) for _ in range(100000)]
+    tree = KDTree(vectors)
+    probes = [_unit_vector(rng.uniform(25, 49), rng.uniform(-124, -67)) for _ in range(2000)]
+    cases = {
+        "build_index": build,
+        "locate_zip": time_per_call(lambda: [index.locate_zip(z) for z in zips], 3) / len(zips),
+        "nearest_5_orgs": time_per_call(lambda: queries("org", 5), 3) / len(spots),
+        "raids_within_250mi": time_per_call(lambda: queries("raid", 10, 250), 3) / len(spots),
+        "nearest_10_of_100k": time_per_call(lambda: [tree.nearest(p, 10) for p in probes], 1) / len(probes),
+    }
+    return {name: _per_sec(t) for name, t in cases.items()}
+
+class Headless:
+    """Run menu code without a terminal: scripted input, no screen, no launches.
+
+    `answers` are returned by input() in order, then "0" (back/exit) forever.
+    Output is discarded, and anything that would open the dialer, mail
+    client or browser is recorded in `launched` instead.
+    """
+
+    def __init__(self, answers=()):
+        self.answers = list(answers)
+        self.launched = []
+
+    def _input(self, prompt=''):
+        return self.answers.pop(0) if self.answers else "0"
+
+    def __enter__(self):
+        import builtins
+        import io
+        module = sys.modules[__name__]
+        launcher = get_launcher()
+        self._saved = (builtins.input, module.clear_screen, sys.stdout, launcher.launch)
+        builtins.input = self._input
+        module.clear_screen = lambda: None
+        sys.stdout = io.StringIO()
+        launcher.launch = lambda uri: self.launched.append(uri) or True
+        return self
+
+    def __exit__(self, *exc):
+        import builtins
+        module = sys.modules[__name__]
+        builtins.input, module.clear_screen, sys.stdout, get_launcher().launch = self._saved
+
+# History sizes for the persistence benchmark
+PERSISTENCE_SIZES = (10, 10_000, 1_000_000)
+
+def _size_label(n: int) -> str:
+    return f"{n // 1_000_000}M" if n >= 1_000_000 else f"{n // 1000}k" if n >= 1000 else str(n)
+
+def _synthetic_history(n: int) -> list:
+    from datetime import date, timedelta
+    start = date(2024, 1, 1)
+    companies = [t["company"] for t in CEO_TARGETS]
+    return [{"date": f"{start + timedelta(days=i % 700)}T12:00:00",
+             "type": "corporate" if i % 3 else "congress",
+             "target": companies[i % len(companies)],
+             "method": "call" if i % 2 else "email"} for i in range(n)]
+
+BENCH_PROFILE = {"user_name": "Alex Doe", "user_email": "alex@example.org",
+                 "user_address": "1 Main St", "user_city": "Denver", "user_state": "CO",
+                 "zip_code": "80202", "phone": ""}
+
+@benchmark("persistence")
+def bench_persistence() -> dict:
+    """log_action, save_config, load_config and stats against 10 / 10k / 1M past actions."""
+    import tempfile
+    global _action_store
+    saved_store, results = _action_store, {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            config_path = os.path.join(tmp, "config.json")
+            save_config(BENCH_PROFILE, config_path)
+            for size in PERSISTENCE_SIZES:
+                label = _size_label(size)
+                store = _action_store = JournalStore(os.path.join(tmp, f"actions-{label}.jsonl"))
+                store.compact(_synthetic_history(size))
+
+                def log_one():
+                    log_action(BENCH_PROFILE, "corporate", "Target", "call")
+                    store.flush()
+
+                def log_burst():
+                    for _ in range(100):
+                        log_action(BENCH_PROFILE, "corporate", "Target", "call")
+                    store.flush()
+
+                results[f"log_action_{label}"] = _per_sec(time_per_call(log_one, 20))
+                results[f"log_action_x100_{label}"] = _per_sec(time_per_call(log_burst, 5) / 100)
+                results[f"save_config_{label}"] = _per_sec(
+                    time_per_call(lambda: save_config(BENCH_PROFILE, config_path), 20))
+                results[f"load_config_{label}"] = _per_sec(
+                    time_per_call(lambda: load_config(config_path), 200))
+                results[f"stats_{label}"] = _per_sec(
+                    time_per_call(lambda: StatsRollup(store.summary()), 200))
+    finally:
+        _action_store = saved_store
+    return results
+
+@benchmark("history")
+def bench_history() -> dict:
+    """Journal vs packed store for 100k actions: size on disk, full load and stats rebuild."""
+    import tempfile
+    history = _synthetic_history(100_000)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind, name in (("journal", "actions.jsonl"), ("packed", "actions.bin")):
+            folder = os.path.join(tmp, kind)
+            os.mkdir(folder)
+            store = open_action_store(kind, os.path.join(folder, name))
+            store.compact(history)
+            size = sum(os.path.getsize(os.path.join(folder, f)) for f in os.listdir(folder)
+                       if not f.endswith((".stats.json", ".lock")))
+            load = time_per_call(lambda: open_action_store(kind, store.path).all(), 1)
+            results[f"{kind}_load"] = dict(_per_sec(load), bytes=size)
+            results[f"{kind}_rebuild"] = _per_sec(time_per_call(store.rebuild, 1))
+    return results
+
+def stand_in_link_server(delay: float = 0.0):
+    """A local HTTP/1.1 server standing in for remote sites.
+
+    For link checks /dead/* 404s, /moved/* redirects, /get-only/* refuses
+    HEAD and anything else is 200. For the fetch cache /etag/* serves a
+    body with an ETag (304 when it matches) and /divisions answers like
+    the Civic API. Each reply waits `delay` seconds to stand in for
+    network latency; server.requests counts them. Returns (server, base URL).
+    """
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status: int, body: bytes = b"", location: str = None, etag: str = None):
+            if delay:
+                time.sleep(delay)
+            server.requests += 1
+            self.send_response(status)
+            if location:
+                self.send_header("Location", location)
+            if etag:
+                self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_HEAD(self):
+            if self.path.startswith("/get-only/"):
+                self._reply(405)
+            elif self.path.startswith("/dead/"):
+                self._reply(404)
+            elif self.path.startswith("/moved/"):
+                self._reply(301, location="/" + self.path[len("/moved/"):])
+            else:
+                self._reply(200)
+
+        def do_GET(self):
+            if self.path.startswith("/get-only/"):
+                self._reply(200, b"<html>ok</html>")
+            elif self.path.startswith("/etag/"):
+                etag = '"v1"'
+                if self.headers.get("If-None-Match") == etag:
+                    self._reply(304, etag=etag)
+                else:
+                    self._reply(200, b"date,title,state\n" * 2000, etag=etag)
+            elif self.path.startswith("/divisions"):
+                self._reply(200, json.dumps({"divisions": {
+                    "ocd-division/country:us/state:co": {"name": "Colorado"},
+                    "ocd-division/country:us/state:co/cd:1": {"name": "Colorado's 1st district"},
+                }}).encode())
+            else:
+                self.do_HEAD()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+@benchmark("links")
+def bench_links() -> dict:
+    """2000 links on a stand-in server 20 ms away: pooled and concurrent vs a serial urllib loop."""
+    import asyncio
+    server, base = stand_in_link_server(delay=0.02)
+    kinds = ("page", "dead", "moved", "get-only")
+    urls = [f"{base}/{kinds[i % 4]}/{i}" for i in range(2000)]
+    try:
+        results = {}
+        for case, per_host in (("pooled_2000", LINKS_PER_HOST), ("pooled_32_2000", 32)):
+            cache = {}
+            seconds = time_per_call(lambda: asyncio.run(
+                check_links(urls, cache, ttl=0, per_host=per_host)), 1)
+            verdicts = [cache[url]["verdict"] for url in urls[:4]]
+            assert verdicts == ["ok", "dead", "ok", "ok"], verdicts
+            results[case] = _per_sec(seconds / len(urls))
+        import urllib.error
+        import urllib.request
+
+        def serial():
+            for url in urls[:100]:
+                try:
+                    urllib.request.urlopen(urllib.request.Request(url, method="HEAD")).close()
+                except urllib.error.HTTPError:
+                    pass
+        results["serial_urllib_100"] = _per_sec(time_per_call(serial, 1) / 100)
+        cache = {}
+        asyncio.run(check_links(urls, cache, ttl=0))
+        results["cached_2000"] = _per_sec(time_per_call(
+            lambda: asyncio.run(check_links(urls, cache)), 1) / len(urls))
+    finally:
+        server.shutdown()
+        server.server_close()
+    return results
+
+@benchmark("addresses")
+def bench_addresses() -> dict:
+    """Address normalization, one process: separate fields, one-line addresses, mixed roster."""
+    streets = ["main street", "n elm ave apt 3", "oak ct", "sunset blvd ste 200", "w 3rd st #4"]
+    places = [("denver", "co", "80202"), ("st. paul", "minnesota", "55101"), ("", "", "60601")]
+    fields = [{"user_name": "Volunteer", "user_address": f"{100 + i} {streets[i % 5]}",
+               "user_city": places[i % 3][0], "user_state": places[i % 3][1],
+               "zip_code": places[i % 3][2]} for i in range(10_000)]
+    lines = [{"user_name": "Volunteer", "user_address": f"{100 + i} {streets[i % 5]}, "
+              f"{places[i % 3][0] or 'chicago'} {places[i % 3][1] or 'il'} {places[i % 3][2]}"}
+             for i in range(10_000)]
+    mixed = [row for pair in zip(fields, lines) for row in pair]
+    return {
+        "fields_10000": _per_sec(time_per_call(lambda: _normalize_chunk(fields), 1) / 10_000),
+        "one_line_10000": _per_sec(time_per_call(lambda: _normalize_chunk(lines), 1) / 10_000),
+        "roster_20000": _per_sec(time_per_call(
+            lambda: list(normalize_profiles(mixed)), 1) / 20_000),
+    }
+
+@benchmark("search")
+def bench_search() -> dict:
+    """Search index: full build, warm open, rebuild after one dataset changes, and queries."""
+    import tempfile
+    queries = ["rapid response", "raid state:IL", "know your rig", "legal type:org state:CO",
+               "workplace raid chicago"]
+    with tempfile.TemporaryDirectory() as tmp:
+        build = time_per_call(lambda: SearchIndex.open(os.path.join(tmp, "cold")), 1)
+        SearchIndex.open(tmp)
+        results = {"build": _per_sec(build),
+                   "open_warm": _per_sec(time_per_call(lambda: SearchIndex.open(tmp), 10))}
+
+        changes = iter(range(1_000_000))
+
+        def change_one_dataset():
+            RESOURCES.append({"section": "BENCHMARK", "name": f"Temporary resource {next(changes)}"})
+            try:
+                index = SearchIndex.open(tmp)
+            finally:
+                RESOURCES.pop()
+            assert index.rebuilt == ["resources"], index.rebuilt
+        results["reindex_one_dataset"] = _per_sec(time_per_call(change_one_dataset, 1))
+        index = SearchIndex.open(tmp)
+    results["query"] = _per_sec(time_per_call(
+        lambda: [index.search(q) for q in queries], 200) / len(queries))
+    return results
+
+@benchmark("fetch")
+def bench_fetch() -> dict:
+    """Fetch cache against a stand-in server 20 ms away: uncached, fresh, 304, stale-while-revalidate."""
+    import tempfile
+    server, base = stand_in_link_server(delay=0.02)
+    url = f"{base}/etag/events.csv"
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = HTTPCache(tmp)
+            results = {"uncached": _per_sec(time_per_call(
+                lambda: cache.fetch(url, {"n": os.urandom(4).hex()}), 3))}
+            cache.fetch(url)
+            before = server.requests
+            results["fresh"] = _per_sec(time_per_call(lambda: cache.fetch(url), 100))
+            assert server.requests == before, "fresh hits went to the network"
+            results["revalidate_304"] = _per_sec(time_per_call(
+                lambda: cache.fetch(url, ttl=0, stale=0), 3))
+            results["stale_while_revalidate"] = _per_sec(time_per_call(
+                lambda: cache.fetch(url, ttl=0, stale=3600), 100))
+            cache.wait()
+            for case in results.values():
+                case["bytes"] = len(cache.fetch(url)["body"])
+    finally:
+        server.shutdown()
+        server.server_close()
+    return results
+
+@benchmark("menus")
+def bench_menus() -> dict:
+    """Menu screens driven headlessly: list building, stats, and a full email action."""
+    import tempfile
+    global _action_store, _scheduler
+    saved_store, saved_scheduler, registry = _action_store, _scheduler, get_target_registry()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            _action_store, _scheduler = JournalStore(os.path.join(tmp, "actions.jsonl")), None
+            _action_store.compact(_synthetic_history(10_000))
+
+            def screen(func, *args, answers=()):
+                def run():
+                    with Headless(answers):
+                        func(*args)
+                return run
+
+            results = {
+                "corporate_menu": _per_sec(time_per_call(screen(corporate_menu, BENCH_PROFILE), 200)),
+                "corporate_search": _per_sec(time_per_call(
+                    screen(corporate_menu, BENCH_PROFILE, answers=["geo", "", "0"]), 200)),
+                "show_stats_10k": _per_sec(time_per_call(screen(show_stats, BENCH_PROFILE), 200)),
+                "contact_ceo_email": _per_sec(time_per_call(
+                    screen(contact_ceo, BENCH_PROFILE, registry.featured()[0], answers=["2", ""]), 50)),
+            }
+            _action_store.flush()
+    finally:
+        _action_store, _scheduler = saved_store, saved_scheduler
+    return results
+
+@benchmark("schedule")
+def bench_schedule() -> dict:
+    """Contact scheduler with 5k volunteers and 2k companies: replaying 200k actions, then assigning."""
+    from datetime import date, timedelta
+    today = date(2025, 3, 1)
+    targets = [{"company": f"Contractor {i}", "ceo": "", "phone": "555-0100", "complicit": True}
+               for i in range(2000)]
+    volunteers = [f"volunteer-{v}" for v in range(5000)]
+    rows = [(volunteers[i % 5000], f"{today - timedelta(days=i % 30)}T12:00:00", "corporate",
+             targets[(i * 7919) % 2000]["company"], "call") for i in range(200_000)]
+
+    build = lambda: CampaignScheduler.from_history(targets, rows, today=today.isoformat())
+    results = {"replay_history": _per_sec(time_per_call(build, 1) / len(rows))}
+    scheduler = build()
+    turns = iter(range(1 << 62))
+
+    def assign_one():
+        scheduler.assign(volunteers[next(turns) % 5000], skip=True, today=today.isoformat())
+
+    def log_one():
+        volunteer = volunteers[next(turns) % 5000]
+        target = scheduler.assign(volunteer, today=today.isoformat())
+        scheduler.record(volunteer, target["company"], today.isoformat())
+
+    def linear_scan():
+        # What assign() replaces: look at every company for the least loaded one
+        contacts = scheduler.recent.get(volunteers[next(turns) % 5000], {})
+        day = scheduler.today
+        min((scheduler.daily[i], scheduler.total[i], i) for i in range(len(targets))
+            if scheduler.daily[i] < scheduler.quota and day - contacts.get(i, -scheduler.cooldown) >= scheduler.cooldown)
+
+    results["assign"] = _per_sec(time_per_call(assign_one, 5000))
+    results["assign_and_log"] = _per_sec(time_per_call(log_one, 5000))
+    results["linear_scan"] = _per_sec(time_per_call(linear_scan, 200))
+    return results
+
+# Cold-start budget for importing this module, checked by 'bench startup'
+STARTUP_BUDGET_SECONDS = 0.020
+
+@benchmark("startup")
+def bench_startup() -> dict:
+    """Cold import cost measured with python -X importtime."""
+    import py_compile
+    import subprocess
+    here = os.path.dirname(os.path.abspath(__file__))
+    # Measure a normal start with up-to-date bytecode, not a recompile
+    py_compile.compile(os.path.join(here, "advocacy_tool.py"))
+    runs = []
+    for _ in range(5):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import advocacy_tool"],
+            cwd=here, capture_output=True, text=True, check=True)
+        for line in result.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == "advocacy_tool":
+                runs.append(int(fields[1]) / 1e6)
+    seconds = min(runs)
+    return {"import_cumulative": dict(_per_sec(seconds), budget=STARTUP_BUDGET_SECONDS)}
+
+def _per_sec(seconds: float) -> dict:
+    return {"seconds": seconds, "per_sec": 1 / seconds}
+
+def cmd_bench(args):
+    """Run benchmarks; optionally save results as JSON and compare to a baseline."""
+    import platform
+    import time
+    names = args.names or list(BENCHMARKS)
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)["results"]
+
+    results, regressions = {}, []
+    for name in names:
+        if name not in BENCHMARKS:
+            sys.exit(f"Unknown benchmark {name!r}. Available: {', '.join(BENCHMARKS)}")
+        print(f"{name}:")
+        results[name] = BENCHMARKS[name]()
+        for case, result in results[name].items():
+            line = f"  {case:<28} {result['per_sec']:>14,.0f}/s"
+            if 'bytes' in result:
+                line += f"  {result['seconds'] * 1000:7.3f} ms  {result['bytes'] / 1024:7.1f} KiB"
+                if 'gzip_bytes' in result:
+                    line += f" ({result['gzip_bytes'] / 1024:.1f} KiB gzipped)"
+            if 'budget' in result:
+                line += f"  {result['seconds'] * 1000:.1f} ms (budget {result['budget'] * 1000:.0f} ms"
+                if result['seconds'] > result['budget']:
+                    line += ", OVER BUDGET)"
+                    regressions.append(f"{name}.{case} (over budget)")
+                else:
+                    line += ")"
+            before = baseline.get(name, {}).get(case)
+            if before:
+                change = result['seconds'] / before['seconds'] - 1
+                line += f"  {change:+.0%} vs baseline"
+                if change > args.tolerance:
+                    line += "  REGRESSION"
+                    regressions.append(f"{name}.{case} ({change:+.0%})")
+            print(line, flush=True)
+
+    if args.json:
+        atomic_write_json(args.json, {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, indent=2, durable=False)
+        print(f"Results written to {args.json}")
+    if regressions:
+        sys.exit(f"{len(regressions)} regression(s) (tolerance {args.tolerance:.0%}): "
+                 f"{', '.join(regressions)}")
+
+def cmd_rebuild_stats(args):
+    """Recompute the stats rollup from history and report any drift."""
+    store = get_action_store()
+    saved = {}
+    if os.path.exists(store.stats_path):
+        with open(store.stats_path, encoding='utf-8') as f:
+            saved = StatsRollup(json.load(f)).to_dict()
+    fresh = store.rebuild().to_dict()
+
+    drift = [field for field in ("total",) + StatsRollup.FIELDS
+             if saved.get(field, 0 if field == "total" else {}) != fresh[field]]
+    if drift:
+        print(f"Stats were out of date ({', '.join(drift)}) - rebuilt from history.")
+    else:
+        print("Stats matched the history.")
+    print(f"{fresh['total']} actions over {len(fresh['by_day'])} days.")
 
 # ============================================================================
 # MAIN
 # ============================================================================
 
+def build_parser():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="ICE Non-Cooperation Advocacy Hub. Run with no arguments for the interactive menu.")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_FILE, metavar="PATH",
+                        help="time hot paths and write PATH.json / PATH.prom at exit")
+    sub = parser.add_subparsers(dest="command")
+
+    p = sub.add_parser("batch", help="render messages for a roster of constituents")
+    p.add_argument("roster", help="CSV or JSONL file of constituent profiles")
+    p.add_argument("--kind", choices=["email", "call", "congress"], default="email")
+    p.add_argument("--format", choices=["jsonl", "eml", "mailto", "smtp"], default="jsonl",
+                   help="smtp queues messages in the outbox and sends them if a server is set")
+    p.add_argument("--smtp", help="SMTP server host:port (default: $ICE_ADVOCACY_SMTP)")
+    p.add_argument("--out", default="-", help="output file, or directory for --format eml (default: stdout)")
+    p.add_argument("--company", action="append", help="only this company (repeatable)")
+    p.add_argument("--complicit-only", action="store_true", help="only companies with ICE ties")
+    p.add_argument("--workers", type=int, default=1, help="render on this many processes")
+    p.add_argument("--chunk-size", type=int, default=500)
+    p.add_argument("--normalize", action="store_true", help="clean up addresses before rendering")
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser("normalize", help="normalize the addresses in a roster")
+    p.add_argument("roster", help="CSV or JSONL file of constituent profiles")
+    p.add_argument("--out", default="-", help="output .csv or .jsonl file (default: stdout)")
+    p.add_argument("--format", choices=["csv", "jsonl"], default="csv", help="format for stdout")
+    p.add_argument("--workers", type=int, default=1, help="normalize on this many processes")
+    p.add_argument("--chunk-size", type=int, default=2000)
+    p.set_defaults(func=cmd_normalize)
+
+    p = sub.add_parser("send-outbox", help="send queued emails over SMTP")
+    p.add_argument("--smtp", help="SMTP server host:port (default: $ICE_ADVOCACY_SMTP)")
+    p.add_argument("--rate", type=float, default=10.0, help="max messages per second")
+    p.add_argument("--retries", type=int, default=3)
+    p.set_defaults(func=cmd_send_outbox)
+
+    p = sub.add_parser("rebuild-stats", help="recompute stats totals from the action history")
+    p.set_defaults(func=cmd_rebuild_stats)
+
+    p = sub.add_parser("build-data", help="compile site and target data into per-state JSON shards")
+    p.add_argument("--out", default=BUNDLE_DIR, help="output directory (default: data/ next to this script)")
+    p.set_defaults(func=cmd_build_data)
+
+    p = sub.add_parser("ingest-events", help="update the community events index from the sheet")
+    p.add_argument("source", nargs="?", default=EVENTS_SHEET_URL, help="CSV file or URL (default: the events sheet)")
+    p.add_argument("--index", default=EVENTS_INDEX_FILE)
+    p.add_argument("--ttl", type=float, default=FETCH_TTL,
+                   help="reuse a download younger than this many seconds (0: check for changes now)")
+    p.set_defaults(func=cmd_ingest_events)
+
+    p = sub.add_parser("check-links", help="probe every URL in the tool and its data for dead links")
+    p.add_argument("files", nargs="*", help="files to scan (default: this script, index.html, data/)")
+    p.add_argument("--cache", default=LINKS_CACHE_FILE)
+    p.add_argument("--ttl", type=float, default=LINK_TTL, help="seconds a result stays fresh")
+    p.add_argument("--refresh", action="store_true", help="ignore cached results")
+    p.add_argument("--per-host", type=int, default=LINKS_PER_HOST, help="connections per host")
+    p.add_argument("--connections", type=int, default=LINK_CONNECTIONS, help="connections in total")
+    p.add_argument("--timeout", type=float, default=LINK_TIMEOUT)
+    p.add_argument("--json", metavar="PATH", help="write the full report here")
+    p.set_defaults(func=cmd_check_links)
+
+    p = sub.add_parser("aggregate", help="combine many volunteers' histories into one report")
+    p.add_argument("paths", nargs="+", help="config files, journals, or directories of them")
+    p.add_argument("--out", help="write a columnar JSON summary here (.gz to compress)")
+    p.add_argument("--workers", type=int, help="parse on this many processes (default: all cores)")
+    p.set_defaults(func=cmd_aggregate)
+
+    p = sub.add_parser("schedule", help="assign each volunteer the company to contact next")
+    p.add_argument("paths", nargs="+", help="config files, journals, or directories of them")
+    p.add_argument("--quota", type=int, default=DAILY_QUOTA, help="contacts per company per day")
+    p.add_argument("--cooldown", type=int, default=CONTACT_COOLDOWN,
+                   help="days before a volunteer is sent to the same company again")
+    p.add_argument("--out", default="-", help="CSV call sheet (default: stdout)")
+    p.add_argument("--workers", type=int, help="parse on this many processes (default: all cores)")
+    p.set_defaults(func=cmd_schedule)
+
+    p = sub.add_parser("stress", help="check the action store and config under many concurrent writers")
+    p.add_argument("--store", choices=["journal", "sqlite", "packed"], default=ACTION_STORE)
+    p.add_argument("--processes", type=int, default=16)
+    p.add_argument("--actions", type=int, default=200, help="actions logged per process")
+    p.add_argument("--interval", type=float, default=0.002, help="seconds between one process's actions")
+    p.set_defaults(func=cmd_stress)
+
+    p = sub.add_parser("serve", help="serve the advocacy actions over a local HTTP API")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8750)
+    p.add_argument("--users-dir", default=USERS_DIR, help="where per-user profiles and journals live")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("loadtest", help="measure requests/sec and latency of the HTTP API")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8751)
+    p.add_argument("--clients", type=int, default=50, help="concurrent keep-alive connections")
+    p.add_argument("--requests", type=int, default=200, help="requests per client")
+    p.add_argument("--no-spawn", action="store_true", help="test an already running server")
+    p.set_defaults(func=cmd_loadtest)
+
+    p = sub.add_parser("bench", help="run performance benchmarks")
+    p.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    p.add_argument("--json", metavar="PATH", help="save the results here (usable as a later --baseline)")
+    p.add_argument("--baseline", metavar="PATH", help="compare against results saved with --json")
+    p.add_argument("--tolerance", type=float, default=0.25,
+                   help="slowdown vs baseline that counts as a regression (default: 0.25)")
+    p.set_defaults(func=cmd_bench)
+
+    return parser
+
 def main():
+    profile = os.environ.get("ICE_ADVOCACY_PROFILE", "")
+    profile = {"": None, "0": None, "1": PROFILE_FILE}.get(profile, profile)
+    if len(sys.argv) > 1:
+        args = build_parser().parse_args()
+        profile = args.profile or profile
+        if profile:
+            enable_instrumentation(profile)
+        if args.command:
+            return args.func(args)
+    elif profile:
+        enable_instrumentation(profile)
+
+    # Draw the banner before touching the disk so the screen appears at once
+    print_banner()
     config = load_config()
 
     # First-time setup
     if not config.get('user_name'):
-        print_banner()
         print("\n  Welcome! Let's get you set up for advocacy.\n")
         config = setup_user(config)
 
@@ -764,6 +6363,12 @@ def main():
             config = setup_user(config)
         elif choice == '6':
             show_resources()
+        elif choice == '7':
+            show_protests(config)
+        elif choice == '8':
+            show_nearby(config)
+        elif choice == '9':
+            show_search(config)
         elif choice == '0':
             print("\n  Thank you for taking action! Every voice matters.\n")
             sys.exit(0)
@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# The tool keeps its files under ~: point HOME somewhere disposable before
+# the module is imported so no test can touch a real profile or history.
+os.environ["HOME"] = tempfile.mkdtemp(prefix="ice-advocacy-tests-")
+os.environ["ICE_ADVOCACY_FLUSH_DELAY"] = "0"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
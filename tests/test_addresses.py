@@ -0,0 +1,82 @@
+import pytest
+
+import advocacy_tool as tool
+
+
+@pytest.mark.parametrize("typed, street", [
+    ("123 north main street apt. 4b", "123 N Main St Apt 4B"),
+    ("1 main st nw", "1 Main St NW"),
+    ("100 South Park", "100 South Park"),
+    ("100 south park avenue", "100 S Park Ave"),
+    ("7 elm ave #5", "7 Elm Ave #5"),
+    ("p.o. box 12", "PO Box 12"),
+    ("55 42nd street", "55 42nd St"),
+])
+def test_normalize_street(typed, street):
+    assert tool.normalize_street(typed) == street
+
+
+@pytest.mark.parametrize("text, street, city, state, zip_code", [
+    ("123 main street apt 4, st paul mn 55101", "123 Main St Apt 4", "St Paul", "MN", "55101"),
+    ("1 Main St, Denver, Colorado 80202-1234", "1 Main St", "Denver", "CO", "80202-1234"),
+    ("1 main st denver co 80202", "1 Main St", "Denver", "CO", "80202"),
+    ("55 Oak Ct, Denver CO 80202, USA", "55 Oak Ct", "Denver", "CO", "80202"),
+])
+def test_parse_address(text, street, city, state, zip_code):
+    parsed = tool.parse_address(text)
+    assert (parsed["street"], parsed["city"], parsed["state"], parsed["zip"]) == \
+        (street, city, state, zip_code)
+    assert parsed["issues"] == []
+
+
+def test_oak_court_is_not_connecticut():
+    parsed = tool.parse_address("123 Oak Ct")
+    assert (parsed["street"], parsed["state"]) == ("123 Oak Ct", "")
+    assert parsed["issues"] == ["no ZIP"]
+
+
+def test_state_and_city_come_from_the_zip():
+    profile = tool.normalize_profile({"user_address": "1 main st", "zip_code": "80202"})
+    assert (profile["user_state"], profile["zip_code"]) == ("CO", "80202")
+    assert "address_issues" not in profile
+    assert tool.state_from_zip("06390") == "NY"
+
+
+def test_zip_from_another_state_is_flagged():
+    profile = tool.normalize_profile({"user_address": "1 main st", "user_city": "denver",
+                                      "user_state": "ny", "zip_code": "80202"})
+    assert profile["user_state"] == "NY"
+    assert profile["address_issues"] == ["ZIP 80202 is in CO"]
+
+
+@pytest.mark.parametrize("fields", [
+    {"user_address": "1 main st", "user_city": "denver", "user_state": "co", "zip_code": "8020"},
+    {"user_address": "1 main st, denver co", "zip_code": "8020"},
+])
+def test_malformed_zip_is_kept_and_reported(fields):
+    profile = tool.normalize_profile(fields)
+    assert profile["zip_code"] == "8020"
+    assert profile["address_issues"] == ["invalid ZIP '8020'"]
+    assert (profile["user_city"], profile["user_state"]) == ("Denver", "CO")
+
+
+def test_unknown_state_is_reported():
+    profile = tool.normalize_profile({"user_address": "1 main st", "user_state": "zz",
+                                      "zip_code": "80202"})
+    assert "unknown state 'zz'" in profile["address_issues"]
+
+
+def test_setup_keeps_a_malformed_zip(monkeypatch):
+    saved = []
+    monkeypatch.setattr(tool, "save_config", lambda config, *args: saved.append(dict(config)))
+    answers = ["Alex Doe", "1 main st", "denver", "co", "8020", "", "", ""]
+    with tool.Headless(answers):
+        config = tool.setup_user(dict(tool.DEFAULT_CONFIG))
+    assert config["zip_code"] == saved[0]["zip_code"] == "8020"
+
+
+def test_normalize_profiles_in_parallel_keeps_order():
+    profiles = [{"user_address": f"{n} main st", "zip_code": "80202"} for n in range(50)]
+    serial = list(tool.normalize_profiles(profiles))
+    assert list(tool.normalize_profiles(profiles, workers=2, chunk_size=7)) == serial
+    assert [p["user_address"] for p in serial] == [f"{n} Main St" for n in range(50)]
@@ -0,0 +1,77 @@
+import argparse
+import gzip
+import json
+
+import pytest
+
+import advocacy_tool as tool
+
+
+def action(date, target, type="corporate", method="call"):
+    return {"date": date, "type": type, "target": target, "method": method}
+
+
+@pytest.fixture
+def volunteers(tmp_path):
+    """Server user dirs, a legacy config with its journal, and a corrupt file."""
+    alice = tmp_path / "users" / "alice"
+    alice.mkdir(parents=True)
+    (alice / "profile.json").write_text(json.dumps({"user_email": "Alice@Example.org"}))
+    (alice / "actions.jsonl").write_text(
+        json.dumps(action("2025-03-03T09:00:00", "Target")) + "\n"
+        + json.dumps(action("2025-03-04T10:30:00", "Delta", method="email")) + "\n"
+        + '{"date": "2025-03-05T1')  # torn tail
+    (alice / "actions.stats.json").write_text(json.dumps({"total": 99}))
+
+    shared = action("2025-03-10T12:00:00", "Home Depot")
+    (tmp_path / "bob.json").write_text(json.dumps({"user_name": "Bob", "actions_taken": [
+        action("2025-03-03T18:00:00", "Target"),
+        action("2025-03-11T08:15:00", "Senator Bennet", type="congress"),
+        shared,
+    ]}))
+    (tmp_path / "bob.jsonl").write_text(json.dumps(shared) + "\n")  # also in the config backup
+    (tmp_path / "broken.json").write_text('{"user_name": "Ca')
+    return tmp_path
+
+
+def test_aggregate_counts_every_volunteer_once(volunteers):
+    result = tool.aggregate_actions([str(volunteers)], workers=1)
+    assert result["files"] == 5
+    assert result["duplicates"] == 1
+    assert [error.split(":")[0] for error in result["errors"]] == [str(volunteers / "broken.json")]
+    assert {row[0] for row in result["rows"]} == {"alice@example.org", "bob"}
+    assert [row[1] for row in result["rows"]] == sorted(row[1] for row in result["rows"])
+
+
+def test_process_pool_gives_the_same_rows(volunteers):
+    serial = tool.aggregate_actions([str(volunteers)], workers=1)
+    pooled = tool.aggregate_actions([str(volunteers)], workers=2, chunk_size=1)
+    assert pooled["rows"] == serial["rows"] and pooled["errors"] == serial["errors"]
+
+
+def test_cmd_aggregate_writes_columnar_totals(volunteers, tmp_path, capsys):
+    out = str(tmp_path / "summary.json.gz")
+    tool.cmd_aggregate(argparse.Namespace(paths=[str(volunteers)], workers=1, out=out))
+
+    printed = capsys.readouterr()
+    assert "2 volunteers took 5 actions over 4 days." in printed.out
+    assert "1 duplicate actions dropped" in printed.out
+    assert "broken.json" in printed.err
+
+    with gzip.open(out, "rt", encoding="utf-8") as f:
+        summary = json.load(f)
+    totals = summary["totals"]
+    assert summary["rows"] == totals["total"] == 5
+    assert totals["volunteers"] == 2
+    assert totals["by_type"] == {"corporate": 4, "congress": 1}
+    assert totals["by_method"] == {"call": 4, "email": 1}
+    assert totals["by_target"] == {"Target": 2, "Delta": 1, "Home Depot": 1, "Senator Bennet": 1}
+    assert totals["by_day"] == {"2025-03-03": 2, "2025-03-04": 1, "2025-03-10": 1, "2025-03-11": 1}
+    assert totals["by_week"] == {"2025-W10": 3, "2025-W11": 2}
+
+    columns = summary["columns"]
+    decoded = [(columns["user"]["values"][u], columns["target"]["values"][t])
+               for u, t in zip(columns["user"]["codes"], columns["target"]["codes"])]
+    assert decoded == [("alice@example.org", "Target"), ("bob", "Target"), ("alice@example.org", "Delta"),
+                       ("bob", "Home Depot"), ("bob", "Senator Bennet")]
+    assert columns["time"][0] == 1740992400  # 2025-03-03T09:00:00 UTC
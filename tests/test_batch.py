@@ -0,0 +1,39 @@
+import json
+
+import advocacy_tool as tool
+
+
+def write_jsonl(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    return str(path)
+
+
+def test_read_profiles_coerces_non_string_values(tmp_path):
+    roster = write_jsonl(tmp_path / "roster.jsonl",
+                         [{"name": "Z", "zip": 80202, "state": "co", "email": None}])
+    [profile] = tool.read_profiles(roster)
+    assert profile == {"user_name": "Z", "zip_code": "80202", "user_state": "CO", "user_email": ""}
+
+
+def test_read_profiles_keeps_zip_that_lost_its_zeros_invalid(tmp_path, capsys):
+    roster = write_jsonl(tmp_path / "roster.jsonl", [{"name": "Y", "zip": 2134}])
+    [profile] = tool.read_profiles(roster)
+    assert profile["zip_code"] == "2134"
+    assert "leading zeros" in capsys.readouterr().err
+    assert tool.normalize_profile(profile)["address_issues"]
+
+
+def test_batch_survives_numeric_fields(tmp_path):
+    roster = write_jsonl(tmp_path / "roster.jsonl",
+                         [{"name": "Z", "zip": 80202}, {"name": "A", "zip": "10001", "phone": 5551234}])
+    targets = tool.get_target_registry().featured()[:2]
+    messages = list(tool.render_batch(tool.read_profiles(roster), targets, "email"))
+    assert len(messages) == 4
+    assert all("Z" in m["body"] or "A" in m["body"] for m in messages)
+
+
+def test_read_profiles_csv(tmp_path):
+    path = tmp_path / "roster.csv"
+    path.write_text("Name,ZIP,State\nAlex Doe, 80202 ,co\n", encoding="utf-8")
+    [profile] = tool.read_profiles(str(path))
+    assert profile == {"user_name": "Alex Doe", "zip_code": "80202", "user_state": "CO"}
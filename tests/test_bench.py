@@ -0,0 +1,43 @@
+import argparse
+import json
+
+import pytest
+
+import advocacy_tool as tool
+
+
+def bench_args(names, **options):
+    defaults = {"json": None, "baseline": None, "tolerance": 0.25}
+    return argparse.Namespace(names=names, **dict(defaults, **options))
+
+
+@pytest.fixture
+def fake_benchmarks(monkeypatch):
+    benchmarks = {}
+    monkeypatch.setattr(tool, "BENCHMARKS", benchmarks)
+    return benchmarks
+
+
+def test_over_budget_fails_the_run(fake_benchmarks, capsys):
+    fake_benchmarks["startup"] = lambda: {
+        "import_cumulative": dict(tool._per_sec(0.05), budget=0.02)}
+    with pytest.raises(SystemExit) as exit_info:
+        tool.cmd_bench(bench_args(["startup"]))
+    assert "startup.import_cumulative (over budget)" in str(exit_info.value.code)
+    assert "OVER BUDGET" in capsys.readouterr().out
+
+
+def test_within_budget_passes(fake_benchmarks):
+    fake_benchmarks["startup"] = lambda: {
+        "import_cumulative": dict(tool._per_sec(0.01), budget=0.02)}
+    tool.cmd_bench(bench_args(["startup"]))
+
+
+def test_slowdown_against_baseline_fails_the_run(fake_benchmarks, tmp_path):
+    fake_benchmarks["demo"] = lambda: {"case": tool._per_sec(0.02)}
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": {"demo": {"case": tool._per_sec(0.01)}}}))
+    with pytest.raises(SystemExit) as exit_info:
+        tool.cmd_bench(bench_args(["demo"], baseline=str(baseline)))
+    assert "demo.case (+100%)" in str(exit_info.value.code)
+    tool.cmd_bench(bench_args(["demo"], baseline=str(baseline), tolerance=1.5))
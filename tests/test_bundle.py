@@ -0,0 +1,76 @@
+import json
+import shutil
+
+import pytest
+
+import advocacy_tool as tool
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return tool.build_dataset()
+
+
+@pytest.fixture
+def bundle(tmp_path, dataset):
+    folder = str(tmp_path / "data")
+    return folder, tool.write_bundle(dataset, folder)
+
+
+def test_shards_round_trip(bundle, dataset):
+    folder, manifest = bundle
+    assert manifest["source"] == dataset["source"] == tool.bundle_source_hash()
+    assert set(manifest["shards"]) == {"national", *dataset["states"]}
+    assert tool.load_bundle_shard("national", folder) == dataset["national"]
+    for state, shard in dataset["states"].items():
+        assert tool.load_bundle_shard(state, folder) == shard
+    assert tool.load_bundle_shard("ZZ", folder) == {}
+
+
+def test_every_state_row_lands_in_its_shard(dataset):
+    co = dataset["states"]["CO"]
+    assert co["senatorsDB"] == tool.load_site_table("senatorsDB")["CO"]
+    assert all(row["state"] == "CO" for row in co.get("upcomingProtests", []))
+    assert all(row.get("state") in (None, "", "ALL") for row in dataset["national"].get("upcomingProtests", []))
+    protests = tool.load_site_table("upcomingProtests")
+    assert len(protests) == len(dataset["national"].get("upcomingProtests", [])) + sum(
+        len(shard.get("upcomingProtests", [])) for shard in dataset["states"].values())
+
+
+def test_unchanged_shards_keep_their_names_and_stale_ones_are_pruned(bundle, dataset, tmp_path):
+    folder, manifest = bundle
+    again = tool.write_bundle(dataset, folder)
+    assert again == manifest
+
+    changed = json.loads(json.dumps(dataset))
+    changed["states"]["CO"]["senatorsDB"] = []
+    rebuilt = tool.write_bundle(changed, folder)
+    old_file, new_file = manifest["shards"]["CO"]["file"], rebuilt["shards"]["CO"]["file"]
+    assert old_file != new_file
+    assert rebuilt["shards"]["TX"] == manifest["shards"]["TX"]
+    files = {path.name for path in (tmp_path / "data").iterdir()}
+    assert files == {"manifest.json"} | {info["file"] for info in rebuilt["shards"].values()}
+    assert tool.load_bundle_shard("CO", folder)["senatorsDB"] == []
+
+
+def test_no_bundle_means_none(tmp_path):
+    assert tool.load_bundle_shard("national", str(tmp_path)) is None
+
+
+def test_bundle_is_ignored_once_ceo_targets_change(bundle, monkeypatch):
+    folder, _ = bundle
+    monkeypatch.setattr(tool, "CEO_TARGETS", tool.CEO_TARGETS + [{"company": "New Co"}])
+    assert tool.load_bundle_shard("national", folder) is None
+
+
+def test_bundle_is_ignored_once_index_html_changes(tmp_path, monkeypatch, dataset):
+    page = tmp_path / "index.html"
+    shutil.copy(tool.SITE_HTML, page)
+    monkeypatch.setattr(tool, "SITE_HTML", str(page))
+    folder = str(tmp_path / "data")
+    tool.write_bundle(dataset, folder)
+    assert tool.load_bundle_shard("CO", folder) is not None
+
+    with open(page, "a", encoding="utf-8") as f:
+        f.write("<!-- edited -->\n")
+    assert tool.load_bundle_shard("CO", folder) is None
@@ -0,0 +1,85 @@
+import os
+import sys
+
+import pytest
+
+import advocacy_tool as tool
+
+PROFILE = {"user_name": "Alex Doe", "user_address": "1 Main St", "user_city": "Denver",
+           "user_state": "CO", "zip_code": "80202"}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = tool.JournalStore(str(tmp_path / "actions.jsonl"))
+    monkeypatch.setattr(tool, "_action_store", store)
+    return store
+
+
+@pytest.fixture
+def targets():
+    return [t for t in tool.get_target_registry().targets if t.get("complicit") and t.get("phone")][:4]
+
+
+def run_session(keys, targets, monkeypatch):
+    """Run a session on scripted keys: (screen text, tel: links dialed, renders before the first key)."""
+    rendered, first_key = [], []
+    render = tool.render_ceo_call_script
+    read_key = tool.read_key
+    monkeypatch.setattr(tool, "render_ceo_call_script",
+                        lambda profile, target: rendered.append(target["company"]) or render(profile, target))
+    monkeypatch.setattr(tool, "read_key", lambda: first_key.append(len(rendered)) or read_key())
+    with tool.Headless(keys + [""]) as headless:
+        tool.call_session(PROFILE, targets)
+        screen = sys.stdout.getvalue()
+    assert rendered == [t["company"] for t in targets]  # each script rendered once
+    return screen, headless.launched, first_key[0]
+
+
+def test_scripts_are_rendered_before_the_first_call(targets, store, monkeypatch):
+    screen, _, rendered_before_first_key = run_session(["q"], targets, monkeypatch)
+    assert rendered_before_first_key == len(targets)
+    assert f"CALL SESSION    1 of {len(targets)}" in screen
+    assert tool.render_ceo_call_script(PROFILE, targets[0]) in screen
+
+
+def test_keys_dial_log_skip_go_back_and_finish(targets, store, monkeypatch):
+    # dial, spoke -> 2nd, skip -> 3rd, back -> 2nd, voicemail -> 3rd, no answer -> 4th, finish
+    screen, launched, _ = run_session(["d", "1", "n", "p", "2", "3", "q"], targets, monkeypatch)
+
+    digits = "".join(c for c in targets[0]["phone"] if c.isdigit() or c == "+")
+    assert launched == [f"tel:{digits}"]
+    assert "(marked: skipped)" in screen  # the skipped call, seen again after going back
+    assert [(r["target"], r["type"], r["method"]) for r in store.all()] == [
+        (targets[0]["company"], "corporate", "call"), (targets[1]["company"], "corporate", "call")]
+    assert "✓ 2 calls logged" in screen
+    for label in ("spoke with someone", "left voicemail", "no answer"):
+        assert label in screen
+
+
+def test_calls_are_logged_in_one_write(targets, store, monkeypatch):
+    run_session(["1", "1", "2", "1"], targets, monkeypatch)  # runs off the end of the queue
+    assert store.writes == 1
+    assert store.rollup().total == 4
+
+
+def test_empty_queue(store, monkeypatch):
+    with tool.Headless([""]):
+        tool.call_session(PROFILE, [])
+        assert "No companies with phone numbers matched" in sys.stdout.getvalue()
+    assert store.all() == []
+
+
+def test_session_from_the_corporate_menu_filters_by_state(store, monkeypatch):
+    queued = []
+    monkeypatch.setattr(tool, "call_session", lambda config, targets: queued.extend(targets))
+    with tool.Headless(["s", "co", "0"]):
+        tool.corporate_menu(PROFILE)
+    registry = tool.get_target_registry()
+    assert queued and queued == [t for t in registry.in_state("CO") if t.get("phone")]
+
+
+def test_screens_are_cleared_with_ansi_not_a_subprocess(monkeypatch, capsys):
+    monkeypatch.setattr(os, "system", lambda command: pytest.fail(f"spawned {command!r}"))
+    tool.clear_screen()
+    assert capsys.readouterr().out == tool.CLEAR_SCREEN
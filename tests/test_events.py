@@ -0,0 +1,102 @@
+import argparse
+import io
+
+import pytest
+
+import advocacy_tool as tool
+
+HEADER = "Email Address,Event Name,Event Date,City,State,Organization,Website Link,Description,Event Type,Approved\n"
+RALLY = "a@example.org,Rally at City Hall,2025-05-01,Denver,CO,Denver Rapid Response,denverrr.org,\"Bring signs, water\",rally,yes\n"
+VIGIL = "b@example.org,Vigil,05/03/2025,Austin,Texas,,,,vigil,TRUE\n"
+WEEKLY = "c@example.org,Weekly Watch,weekly,Boulder,co,,https://example.org/w,,,yes\n"
+
+
+def ingest(text, index=None):
+    index = index if index is not None else tool.load_events_index("/nonexistent")
+    return tool.ingest_events(io.StringIO(text, newline=""), index), index
+
+
+def names(index, state):
+    return [index["events"][digest]["name"] for _, digest in index["by_state"].get(state, [])]
+
+
+def test_rows_are_validated_and_indexed_by_state_and_date():
+    counts, index = ingest(HEADER + WEEKLY + RALLY + VIGIL)
+    assert counts == {"rows": 3, "unchanged": 0, "added": 3, "removed": 0, "skipped": 0, "rejected": 0}
+    assert names(index, "CO") == ["Rally at City Hall", "Weekly Watch"]  # recurring after dated
+    rally = index["events"][index["by_state"]["CO"][0][1]]
+    assert rally == {"date": "May 1, 2025", "day": "2025-05-01", "city": "Denver", "state": "CO",
+                     "name": "Rally at City Hall", "org": "Denver Rapid Response",
+                     "link": "https://denverrr.org", "desc": "Bring signs, water", "type": "rally"}
+    vigil = index["events"][index["by_state"]["TX"][0][1]]
+    assert (vigil["day"], vigil["org"], vigil["link"]) == ("2025-05-03", "Community Submitted", "#")
+
+
+def test_duplicate_rows_are_indexed_once():
+    counts, index = ingest(HEADER + RALLY + RALLY + VIGIL + RALLY)
+    assert (counts["rows"], counts["added"]) == (4, 2)
+    assert names(index, "CO") == ["Rally at City Hall"]
+
+
+def test_reingesting_the_same_sheet_changes_nothing():
+    sheet = HEADER + RALLY + VIGIL + "d@example.org,No State,2025-05-01,Nowhere,ZZ,,,,,yes\n"
+    _, index = ingest(sheet)
+    before = repr(index)
+    counts, index = ingest(sheet, index)
+    assert counts == {"rows": 3, "unchanged": 3, "added": 0, "removed": 0, "skipped": 0, "rejected": 0}
+    assert repr(index) == before
+
+
+def test_edited_and_deleted_rows_are_replaced_and_removed():
+    _, index = ingest(HEADER + RALLY + VIGIL)
+    edited = RALLY.replace("2025-05-01", "2025-05-08")
+    counts, index = ingest(HEADER + edited, index)
+    assert (counts["added"], counts["removed"], counts["unchanged"]) == (1, 2, 0)
+    assert names(index, "CO") == ["Rally at City Hall"] and names(index, "TX") == []
+    assert [e["day"] for e in index["events"].values()] == ["2025-05-08"]
+
+
+@pytest.mark.parametrize("row, reason", [
+    (",,2025-05-01,Denver,CO,,,,,yes\n", "no event name"),
+    ("a@b,Rally,2025-05-01,Denver,Atlantis,,,,,yes\n", "unknown state 'Atlantis'"),
+    ("a@b,Rally,2025-05-01,Denver,CO\n", "incomplete row (5 of 10 columns)"),
+    ('a@b,Rally,2025-05-01,Denver,CO,Org,,"never closed\n', "incomplete row (8 of 10 columns)"),
+])
+def test_malformed_rows_are_rejected_with_a_reason(row, reason):
+    counts, index = ingest(HEADER + RALLY + row)
+    assert (counts["added"], counts["rejected"]) == (1, 1)
+    assert list(index["rejected"].values()) == [f"line 3: {reason}"]
+
+
+def test_unapproved_rows_wait_and_hostile_values_stay_inert():
+    rows = ("e@b,Pending,2025-05-01,Denver,CO,,,,,\n"
+            "f@b,Sneaky,2025-05-01,Denver,CO,,javascript:alert(1),,,yes\n"
+            "g@b,\x00Odd\x00,someday,Denver,CO,,,,,yes\n")
+    counts, index = ingest(HEADER + rows)
+    assert (counts["skipped"], counts["added"]) == (1, 2)
+    by_name = {e["name"]: e for e in index["events"].values()}
+    assert by_name["Sneaky"]["link"] == "#"
+    assert by_name["\x00Odd\x00"]["day"] == "" and by_name["\x00Odd\x00"]["date"] == "someday"
+
+
+def test_changed_columns_start_a_fresh_index():
+    _, index = ingest(HEADER + RALLY)
+    counts, index = ingest(HEADER.replace("Description", "Details") + RALLY, index)
+    assert counts["added"] == 1 and counts["unchanged"] == 0
+
+
+def test_events_near_skips_past_dates():
+    _, index = ingest(HEADER + RALLY + WEEKLY)
+    assert [e["name"] for e in tool.events_near("co", index, today="2025-05-02")] == ["Weekly Watch"]
+    assert len(tool.events_near("CO", index, today="2025-05-01")) == 2
+
+
+def test_cmd_ingest_events_saves_the_index(tmp_path, capsys):
+    sheet = tmp_path / "sheet.csv"
+    sheet.write_text(HEADER + RALLY + VIGIL, encoding="utf-8-sig")
+    args = argparse.Namespace(source=str(sheet), index=str(tmp_path / "events.json"), ttl=0)
+    tool.cmd_ingest_events(args)
+    tool.cmd_ingest_events(args)
+    out = capsys.readouterr().out
+    assert "2 added" in out and "2 unchanged" in out
+    assert len(tool.load_events_index(args.index)["events"]) == 2
@@ -0,0 +1,147 @@
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import advocacy_tool as tool
+
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+class Handler(BaseHTTPRequestHandler):
+    """/etag validates with an ETag, /modified with Last-Modified.
+
+    The body is f"v{server.version}"; while server.failing every request is a 503.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.seen.append({name: self.headers[name] for name in ("If-None-Match", "If-Modified-Since")
+                            if name in self.headers})
+        if server.failing:
+            return self.reply(503)
+        version = f"v{server.version}"
+        if self.path.startswith("/etag"):
+            validator = ("ETag", f'"{version}"')
+            unchanged = self.headers.get("If-None-Match") == validator[1]
+        else:
+            validator = ("Last-Modified", LAST_MODIFIED if server.version == 1 else self.date_time_string())
+            unchanged = self.headers.get("If-Modified-Since") == validator[1]
+        if unchanged:
+            return self.reply(304, headers=[validator])
+        self.reply(200, version.encode(), [validator, ("Content-Type", "text/plain")])
+
+    def reply(self, status, body=b"", headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def origin():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.version, server.failing, server.seen = 1, False, []
+    server.base = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return tool.HTTPCache(str(tmp_path / "http"))
+
+
+def fetch(cache, url, ttl=60, stale=0):
+    response = cache.fetch(url, ttl=ttl, stale=stale, timeout=5)
+    return response["source"], response["body"]
+
+
+def test_network_then_cache_then_revalidated(origin, cache):
+    url = origin.base + "/etag"
+    assert fetch(cache, url) == ("network", b"v1")
+    assert fetch(cache, url) == ("cache", b"v1")
+    assert len(origin.seen) == 1
+
+    assert fetch(cache, url, ttl=0) == ("revalidated", b"v1")
+    assert origin.seen[-1] == {"If-None-Match": '"v1"'}
+    assert fetch(cache, url) == ("cache", b"v1")  # revalidating restarts the TTL
+
+    origin.version = 2
+    assert fetch(cache, url, ttl=0) == ("network", b"v2")
+    assert cache.stats == {"fresh": 2, "stale": 0, "revalidated": 1, "downloaded": 2, "failed": 0}
+
+
+def test_last_modified_is_sent_back_as_if_modified_since(origin, cache):
+    url = origin.base + "/modified"
+    response = cache.fetch(url)
+    assert response["headers"] == {"last-modified": LAST_MODIFIED, "content-type": "text/plain"}
+
+    assert fetch(cache, url, ttl=0) == ("revalidated", b"v1")
+    assert origin.seen[-1] == {"If-Modified-Since": LAST_MODIFIED}
+
+    origin.version = 2
+    assert fetch(cache, url, ttl=0) == ("network", b"v2")
+
+
+def test_stale_copy_is_served_while_a_background_refresh_lands(origin, cache):
+    url = origin.base + "/etag"
+    fetch(cache, url)
+    origin.version = 2
+
+    assert fetch(cache, url, ttl=0, stale=3600) == ("stale", b"v1")
+    cache.wait(5)
+    assert origin.seen[-1] == {"If-None-Match": '"v1"'}
+    assert fetch(cache, url) == ("cache", b"v2")
+    assert cache.stats["stale"] == 1 and cache.stats["downloaded"] == 2
+
+
+def test_one_refresh_at_a_time_per_url(origin, cache):
+    url = origin.base + "/etag"
+    fetch(cache, url)
+    gate = threading.Event()
+    request = cache._request
+    cache._request = lambda *args: gate.wait(5) and request(*args)
+
+    assert [fetch(cache, url, ttl=0, stale=3600)[0] for _ in range(3)] == ["stale"] * 3
+    assert len(cache._refreshing) == 1
+    gate.set()
+    cache.wait(5)
+    assert len(origin.seen) == 2 and not cache._refreshing
+
+
+def test_failures_fall_back_to_the_last_copy(origin, cache):
+    url = origin.base + "/etag"
+    fetch(cache, url)
+
+    origin.failing = True
+    assert fetch(cache, url, ttl=0) == ("stale", b"v1")
+    origin.shutdown()
+    origin.server_close()
+    assert fetch(cache, url, ttl=0) == ("stale", b"v1")
+    assert cache.stats["failed"] == 2
+
+
+def test_failure_with_nothing_cached_raises(origin, cache):
+    origin.failing = True
+    with pytest.raises(urllib.error.HTTPError):
+        cache.fetch(origin.base + "/etag")
+    assert not cache._load(cache.key(origin.base + "/etag"))
+
+
+def test_params_are_part_of_the_key_but_not_stored(origin, cache, tmp_path):
+    url = origin.base + "/etag"
+    fetch(cache, url)
+    assert cache.fetch(url, params={"key": "secret"})["source"] == "network"
+    stored = "".join(path.read_text() for path in (tmp_path / "http").glob("*.json"))
+    assert "secret" not in stored
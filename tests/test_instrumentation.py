@@ -0,0 +1,66 @@
+import asyncio
+import io
+import json
+
+import pytest
+
+import advocacy_tool as tool
+
+
+def current(func):
+    owner_name, _, attr = func.__qualname__.rpartition(".")
+    return getattr(getattr(tool, owner_name) if owner_name else tool, attr)
+
+
+@pytest.fixture
+def profiling(tmp_path):
+    path = str(tmp_path / "profile")
+    tool.enable_instrumentation(path)
+    yield path
+    tool.disable_instrumentation()
+
+
+def test_marked_functions_are_wrapped_then_restored(tmp_path):
+    originals = list(tool._instrumented)
+    assert originals and all(current(func) is func for func in originals)
+
+    tool.enable_instrumentation(str(tmp_path / "profile"))
+    try:
+        assert all(current(func) is not func and current(func).__wrapped__ is func for func in originals)
+    finally:
+        tool.disable_instrumentation()
+    assert all(current(func) is func for func in originals)
+    assert tool._metrics is None
+
+
+def test_profile_counts_calls_errors_and_coroutines(profiling, tmp_path):
+    header = "Event Name,Date,City,State,Approved\n"
+    for _ in range(3):
+        tool.ingest_events(io.StringIO(header + "Rally,2025-05-01,Denver,CO,yes\n"),
+                           tool.load_events_index("/nonexistent"))
+    with pytest.raises(KeyError):
+        tool.load_site_table("noSuchTable")
+    server = tool.AdvocacyServer(str(tmp_path / "users"))
+    status, _ = asyncio.run(server.route("GET", "/targets", {}, b""))
+    assert status == 200
+
+    tool.write_profile(profiling)
+    with open(profiling + ".json", encoding="utf-8") as f:
+        ops = json.load(f)["ops"]
+    assert ops["ingest_events"]["count"] == 3 and ops["ingest_events"]["errors"] == 0
+    assert ops["ingest_events"]["buckets"]["+Inf"] == 3
+    assert ops["load_site_table"]["errors"] == 1
+    assert ops["AdvocacyServer.route"]["count"] == 1
+    assert ops["get_target_registry"]["count"] >= 1
+
+    with open(profiling + ".prom", encoding="utf-8") as f:
+        prom = f.read()
+    assert 'advocacy_op_duration_seconds_count{op="ingest_events"} 3' in prom
+    assert 'advocacy_op_errors_total{op="load_site_table"} 1' in prom
+    assert 'advocacy_op_duration_seconds_bucket{op="ingest_events",le="+Inf"} 3' in prom
+
+
+def test_enabling_twice_keeps_one_wrapper(profiling):
+    wrapped = current(tool.ingest_events.__wrapped__)
+    tool.enable_instrumentation(profiling)
+    assert current(tool.ingest_events.__wrapped__) is wrapped
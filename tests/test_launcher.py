@@ -0,0 +1,86 @@
+import os
+import stat
+import time
+
+import pytest
+
+import advocacy_tool as tool
+
+
+def fake_opener(tmp_path, body):
+    """A stand-in for xdg-open: a shell script that logs its argument."""
+    script = tmp_path / "opener"
+    script.write_text(f"#!/bin/sh\necho \"$1\" >> {tmp_path / 'opened'}\n{body}\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return str(script)
+
+
+def finish(launcher):
+    """Wait for every launch so far."""
+    if launcher._pool is not None:
+        launcher._pool.shutdown(wait=True)
+        launcher._pool = None
+
+
+@pytest.fixture
+def launcher():
+    launcher = tool.Launcher()
+    yield launcher
+    finish(launcher)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="shell-script opener")
+def test_launch_returns_before_the_opener_finishes(tmp_path, launcher):
+    launcher.opener = fake_opener(tmp_path, "sleep 0.5")
+    started = time.perf_counter()
+    assert launcher.launch("tel:+15555550100")
+    assert time.perf_counter() - started < 0.25
+    finish(launcher)
+    assert (tmp_path / "opened").read_text() == "tel:+15555550100\n"
+    assert launcher.take_errors() == []
+
+
+@pytest.mark.skipif(os.name == "nt", reason="shell-script opener")
+def test_opener_failures_are_collected_for_the_next_menu(tmp_path, launcher, capsys):
+    launcher.opener = fake_opener(tmp_path, "echo 'no handler for tel' >&2\nexit 3")
+    launcher.launch("tel:123")
+    finish(launcher)
+    assert launcher.take_errors() == [f"{launcher.opener} failed for tel:123: no handler for tel"]
+    assert launcher.take_errors() == []
+
+
+def test_missing_opener_is_reported(tmp_path, launcher):
+    launcher.opener = str(tmp_path / "no-such-opener")
+    launcher.launch("https://example.org")
+    finish(launcher)
+    [error] = launcher.take_errors()
+    assert error.startswith(f"Could not run {launcher.opener}")
+
+
+def test_without_an_opener_the_link_is_printed(monkeypatch, capsys):
+    launcher = tool.Launcher()
+    launcher.opener = None
+    monkeypatch.setattr(tool, "_launcher", launcher)
+    assert not launcher.launch("https://example.org")
+    tool.open_url("https://example.org")
+    tool.open_phone_dialer("(555) 555-0100")
+    out = capsys.readouterr().out
+    assert ">>> Open this URL: https://example.org" in out
+    assert ">>> CALL THIS NUMBER: (555) 555-0100" in out
+
+
+def test_background_jobs_report_their_failures(launcher, monkeypatch, capsys):
+    done = []
+
+    def fail(message):
+        raise OSError(message)
+
+    launcher.run_in_background(done.append, 1)
+    launcher.run_in_background(fail, "smtp.example.org refused the connection")
+    launcher.wait(5)
+    assert done == [1]
+
+    monkeypatch.setattr(tool, "_launcher", launcher)
+    tool.show_launch_errors()
+    assert "⚠ smtp.example.org refused the connection" in capsys.readouterr().out
+    assert launcher.take_errors() == []
@@ -0,0 +1,199 @@
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import advocacy_tool as tool
+
+TIMEOUT = 0.5
+
+
+class Traffic:
+    """Connections and in-flight requests seen by one or more stand-in servers."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+
+    def start(self, method, path):
+        with self.lock:
+            self.requests.append((method, path))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+    def finish(self):
+        with self.lock:
+            self.in_flight -= 1
+
+
+class Handler(BaseHTTPRequestHandler):
+    """/ok 200, /moved 301 -> /ok, /loop redirects to itself, /get-only 405s
+    HEAD, /forbidden 403, /gone 404, /broken 500, /slow outlives the timeout."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.traffic.lock:
+            self.server.traffic.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, body=b"", location=None):
+        # Out of flight before the client can see the answer and send its next request
+        self.server.traffic.finish()
+        self.send_response(status)
+        if location:
+            self.send_header("Location", location)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def answer(self):
+        self.server.traffic.start(self.command, self.path)
+        time.sleep(self.server.delay)
+        route = "/" + self.path.split("/")[1]
+        if route == "/moved":
+            self.reply(301, location="/ok")
+        elif route == "/loop":
+            self.reply(302, location=self.path)
+        elif route == "/get-only":
+            self.reply(405 if self.command == "HEAD" else 200, b"<html>ok</html>")
+        elif route == "/forbidden":
+            self.reply(403, b"no bots")
+        elif route == "/gone":
+            self.reply(404, b"not here")
+        elif route == "/broken":
+            self.reply(500, b"oops")
+        elif route == "/slow":
+            time.sleep(TIMEOUT * 3)
+            self.reply(200)
+        else:
+            self.reply(200, b"<html>ok</html>")
+
+    do_HEAD = do_GET = answer
+
+
+@pytest.fixture
+def serve():
+    """serve(traffic=None, delay=0.0) -> base URL of a running stand-in server."""
+    servers = []
+
+    def start(traffic=None, delay=0.0):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.traffic = traffic or Traffic()
+        server.delay = delay
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}", server.traffic
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def run_checks(urls, cache=None, **options):
+    cache = {} if cache is None else cache
+    options.setdefault("timeout", TIMEOUT)
+    run = asyncio.run(tool.check_links(urls, cache, **options))
+    return cache, run
+
+
+def test_each_route_gets_its_verdict(serve):
+    base, traffic = serve()
+    cache, _ = run_checks([base + path for path in (
+        "/ok", "/moved", "/loop", "/get-only", "/forbidden", "/gone", "/broken", "/slow")])
+    verdicts = {url[len(base):]: (result["verdict"], result["status"], result["error"])
+                for url, result in cache.items()}
+    assert verdicts == {
+        "/ok": ("ok", 200, None),
+        "/moved": ("ok", 200, None),
+        "/loop": ("error", None, f"more than {tool.MAX_REDIRECTS} redirects"),
+        "/get-only": ("ok", 200, None),
+        "/forbidden": ("blocked", 403, None),
+        "/gone": ("dead", 404, None),
+        "/broken": ("error", 500, None),
+        "/slow": ("error", None, "timed out"),
+    }
+    assert cache[base + "/moved"]["final"] == base + "/ok"
+    assert cache[base + "/ok"]["final"] is None
+
+
+def test_refused_head_falls_back_to_get(serve):
+    base, traffic = serve()
+    run_checks([base + "/get-only", base + "/ok"])
+    assert sorted(traffic.requests) == [("GET", "/get-only"), ("HEAD", "/get-only"), ("HEAD", "/ok")]
+
+
+def test_redirects_are_followed_up_to_the_limit(serve):
+    base, traffic = serve()
+    run_checks([base + "/loop"])
+    assert traffic.requests == [("HEAD", "/loop")] * (tool.MAX_REDIRECTS + 1)
+
+
+def test_connections_are_reused_within_the_per_host_cap(serve):
+    base, traffic = serve(delay=0.02)
+    cache, run = run_checks([f"{base}/ok/{i}" for i in range(24)]
+                            + [f"{base}/get-only/{i}" for i in range(6)], per_host=3)
+    assert all(result["verdict"] == "ok" for result in cache.values())
+    assert traffic.peak == 3
+    assert run["connections"] == traffic.connections == 3
+    assert len(traffic.requests) == 36
+
+
+def test_total_cap_spans_hosts(serve):
+    traffic = Traffic()
+    first, _ = serve(traffic, delay=0.02)
+    second, _ = serve(traffic, delay=0.02)
+    _, run = run_checks([f"{base}/ok/{i}" for base in (first, second) for i in range(10)],
+                        per_host=4, total=5)
+    assert traffic.peak == 5
+    assert run["connections"] <= 8
+
+
+def test_fresh_results_come_from_the_cache(serve):
+    base, traffic = serve()
+    urls = [base + "/ok", base + "/gone"]
+    cache, first = run_checks(urls)
+    assert (first["probed"], first["cached"]) == (2, 0)
+
+    cache, second = run_checks(urls, cache)
+    assert (second["probed"], second["cached"], second["connections"]) == (0, 2, 0)
+    assert len(traffic.requests) == 2
+
+    cache[base + "/gone"]["checked"] -= tool.LINK_TTL
+    cache, third = run_checks(urls, cache)
+    assert (third["probed"], third["cached"]) == (1, 1)
+    assert traffic.requests[-1] == ("HEAD", "/gone")
+
+
+def test_cmd_check_links_reports_and_fails_on_dead_links(serve, tmp_path, capsys):
+    base, _ = serve()
+    page = tmp_path / "page.html"
+    page.write_text(f'<a href="{base}/ok">ok</a>\n<a href="{base}/gone">gone</a>\n'
+                    f'<a href="{base}/forbidden">blocked</a>\n')
+    args = argparse.Namespace(files=[str(page)], refresh=False, cache=str(tmp_path / "links.json"),
+                              ttl=tool.LINK_TTL, per_host=2, connections=10, timeout=TIMEOUT,
+                              json=str(tmp_path / "report.json"))
+    with pytest.raises(SystemExit) as exit_info:
+        tool.cmd_check_links(args)
+    assert exit_info.value.code == 1
+
+    out = capsys.readouterr().out
+    assert "3 links: 1 ok, 1 blocked, 1 dead, 0 error" in out
+    assert f"DEAD    404  {base}/gone" in out
+    assert "in page.html:2" in out
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert report[base + "/forbidden"]["verdict"] == "blocked"
+    assert report[base + "/ok"]["sources"] == ["page.html:1"]
+    assert json.loads((tmp_path / "links.json").read_text()).keys() == report.keys()
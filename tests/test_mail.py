@@ -0,0 +1,142 @@
+import socketserver
+import threading
+import time
+from email import message_from_bytes
+
+import pytest
+
+import advocacy_tool as tool
+
+
+class StubSMTP(socketserver.ThreadingTCPServer):
+    """Just enough SMTP for smtplib: records each delivered message."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, delay=0.0, reject_data=False):
+        self.delay = delay
+        self.reject_data = reject_data
+        self.messages = []
+        self.connections = 0
+        super().__init__(("127.0.0.1", 0), StubHandler)
+
+    @property
+    def address(self):
+        return f"127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply("220 stub ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            time.sleep(server.delay)
+            command = line.decode().strip().upper()
+            if command.startswith("EHLO"):
+                self.reply("250 stub")
+            elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP", "HELO")):
+                self.reply("250 OK")
+            elif command == "DATA":
+                if server.reject_data:
+                    self.reply("451 try again later")
+                    continue
+                self.reply("354 go ahead")
+                data = []
+                while True:
+                    chunk = self.rfile.readline()
+                    if chunk in (b".\r\n", b""):
+                        break
+                    data.append(chunk[1:] if chunk.startswith(b"..") else chunk)
+                server.messages.append(message_from_bytes(b"".join(data)))
+                self.reply("250 queued")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("502 not implemented")
+
+
+@pytest.fixture
+def smtp_stub():
+    servers = []
+
+    def start(**options):
+        server = StubSMTP(**options)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def message(n):
+    return {"from": "alex@example.org", "to": "ceo@example.com",
+            "subject": f"Message {n}", "body": f"Body {n}\n"}
+
+
+def test_flush_delivers_queue_over_one_connection(tmp_path, smtp_stub):
+    server = smtp_stub()
+    spool = tool.MailSpool(str(tmp_path / "outbox"), server=server.address, rate=0)
+    for n in range(3):
+        spool.enqueue(message(n))
+
+    metrics = spool.flush()
+
+    assert (metrics["sent"], metrics["failed"], metrics["retried"]) == (3, 0, 0)
+    assert [m["Subject"] for m in server.messages] == ["Message 0", "Message 1", "Message 2"]
+    assert server.connections == 1
+    assert spool.pending() == []
+
+
+def test_flush_sets_aside_rejected_messages(tmp_path, smtp_stub):
+    server = smtp_stub(reject_data=True)
+    spool = tool.MailSpool(str(tmp_path / "outbox"), server=server.address, rate=0, retries=1)
+    name = spool.enqueue(message(0))
+
+    metrics = spool.flush()
+
+    assert (metrics["sent"], metrics["failed"], metrics["retried"]) == (0, 1, 1)
+    assert spool.pending() == []
+    assert (tmp_path / "outbox" / "failed" / name).exists()
+
+
+def test_concurrent_flushes_send_each_message_once(tmp_path, smtp_stub):
+    server = smtp_stub(delay=0.005)
+    path = str(tmp_path / "outbox")
+    tool.MailSpool(path, server=server.address).enqueue(message(0))
+    for n in range(1, 5):
+        tool.MailSpool(path, server=server.address).enqueue(message(n))
+
+    threads = [threading.Thread(target=tool.MailSpool(path, server=server.address, rate=0).flush)
+               for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(m["Subject"] for m in server.messages) == [f"Message {n}" for n in range(5)]
+
+
+def test_email_menu_does_not_wait_for_smtp(smtp_stub, monkeypatch):
+    # The outbox is the default one, under the test HOME
+    server = smtp_stub(delay=0.1)
+    monkeypatch.setattr(tool, "SMTP_SERVER", server.address)
+
+    started = time.perf_counter()
+    tool.open_email_client("ceo@example.com", "Hello", "Subject: Hello\n\nPlease stop.")
+    assert time.perf_counter() - started < 0.1
+
+    tool.get_launcher().wait(10)
+    assert [m["Subject"] for m in server.messages] == ["Hello"]
+    assert tool.get_launcher().take_errors() == []
@@ -0,0 +1,84 @@
+import math
+import random
+
+import pytest
+
+import advocacy_tool as tool
+
+
+def brute_force(vectors, query, n, max_chord=2.0):
+    qx, qy, qz = query
+    found = sorted(((x - qx) ** 2 + (y - qy) ** 2 + (z - qz) ** 2, i)
+                   for i, (x, y, z) in enumerate(vectors))
+    return [(d2 ** 0.5, i) for d2, i in found if d2 <= max_chord * max_chord][:n]
+
+
+def random_point(rng):
+    return rng.uniform(-90, 90), rng.uniform(-180, 180)
+
+
+def test_kdtree_matches_brute_force():
+    rng = random.Random(17)
+    points = [random_point(rng) for _ in range(500)]
+    points += points[:20]  # exact duplicates
+    vectors = [tool._unit_vector(lat, lon) for lat, lon in points]
+    tree = tool.KDTree(vectors)
+    for _ in range(200):
+        # Some queries sit exactly on a duplicated point, so ties are exercised
+        query = rng.choice([tool._unit_vector(*random_point(rng)), vectors[rng.randrange(20)]])
+        n = rng.randint(1, 12)
+        max_chord = rng.choice([2.0, rng.uniform(0.01, 1.0)])
+        found = tree.nearest(query, n, max_chord)
+        expected = brute_force(vectors, query, n, max_chord)
+        assert found == expected
+
+
+def test_kdtree_edge_cases():
+    assert tool.KDTree([]).nearest((1.0, 0.0, 0.0), 3) == []
+    vectors = [tool._unit_vector(10, 20), tool._unit_vector(-30, 40)]
+    assert [i for _, i in tool.KDTree(vectors).nearest(vectors[1], 5)] == [1, 0]
+
+
+@pytest.fixture(scope="module")
+def places():
+    return tool.get_place_index()
+
+
+def test_place_index_matches_brute_force(places):
+    rng = random.Random(3)
+    for _ in range(200):
+        lat, lon = rng.uniform(25, 49), rng.uniform(-124, -67)
+        kind = rng.choice(tool.PlaceIndex.KINDS)
+        n = rng.randint(1, 10)
+        candidates = [p for p in places.places if p["kind"] == kind]
+        query = tool._unit_vector(lat, lon)
+        expected = sorted(tool.chord_to_miles(math.dist(tool._unit_vector(p["lat"], p["lon"]), query))
+                          for p in candidates)[:n]
+        found = places.near(lat, lon, kind, n)
+        assert [p["miles"] for p in found] == [round(m, 1) for m in expected]
+        assert all(p["kind"] == kind for p in found)
+
+
+def test_miles_cutoff(places):
+    everything = places.near_zip("80202", "raid", n=1000)["results"]
+    within = places.near_zip("80202", "raid", n=1000, miles=300)["results"]
+    assert within == [p for p in everything if p["miles"] <= 300]
+    assert 0 < len(within) < len(everything)
+    assert places.near_zip("80202", "raid", n=2, miles=300)["results"] == within[:2]
+
+
+@pytest.mark.parametrize("zip_code", ["00000", "abc", "", "96910"])
+def test_unknown_zip_has_no_results(places, zip_code):
+    assert places.near_zip(zip_code, "org") == {"zip": zip_code, "located": None, "results": []}
+
+
+def test_zip_placement_precision(places):
+    assert places.locate_zip("80202")["label"] == "Denver, CO"
+    assert places.locate_zip("80202")["precision"] == "city"
+    assert places.locate_zip("59999")["precision"] in ("metro", "region", "state")
+
+
+def test_miles_and_chords_round_trip():
+    for miles in (0.0, 1.0, 250.0, 3000.0):
+        assert tool.chord_to_miles(tool.miles_to_chord(miles)) == pytest.approx(miles, abs=1e-6)
+    assert tool.chord_to_miles(2.0) == pytest.approx(math.pi * tool.EARTH_RADIUS_MILES)
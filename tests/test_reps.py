@@ -0,0 +1,104 @@
+import os
+import shutil
+
+import pytest
+
+import advocacy_tool as tool
+
+
+@pytest.fixture(scope="module")
+def index():
+    return tool.RepresentativeIndex.build()
+
+
+@pytest.fixture
+def saved(tmp_path, index):
+    path = str(tmp_path / "reps.idx")
+    index.save(path, [1, 2])
+    loaded = tool.RepresentativeIndex.load(path, [1, 2])
+    yield loaded
+    loaded.close()
+
+
+def test_every_listed_zip3_resolves_to_its_district(index):
+    for prefix, info in tool.load_site_table("zipToDistrictDB").items():
+        found = index.lookup(prefix + "01")
+        assert found["state"] == info["state"]
+        if found["house"]:
+            assert found["district"] == info["district"]
+            assert found["house"] == [index.house_member(info["state"], info["district"])]
+
+
+def test_at_large_state(index):
+    found = index.lookup("82001")
+    assert (found["state"], found["district"]) == ("WY", "At-Large")
+    assert found["house"] == [dict(tool.load_site_table("houseRepsDB")["WY"][0], state="WY")]
+    assert found["senators"] == tool.load_site_table("senatorsDB")["WY"]
+
+
+@pytest.mark.parametrize("zip_code", ["00001", "96910", "ab", ""])
+def test_unknown_zip3(index, zip_code):
+    found = index.lookup(zip_code)
+    assert (found["state"], found["senators"], found["house"]) == ("", [], [])
+
+
+def test_typed_state_wins_over_the_zip(index):
+    found = index.lookup("80202", "wy")
+    assert found["state"] == "WY" and found["house"][0]["district"] == "At-Large"
+
+
+def test_house_member_by_state_and_district(index):
+    member = index.house_member("CO", "1")
+    assert member["state"] == "CO" and member["district"] == "1"
+    assert index.house_member("CO", "99") is None
+
+
+def test_prebuilt_file_answers_like_the_built_index(index, saved):
+    for zip_code in ("80202", "82001", "10001", "94110", "00001"):
+        assert saved.lookup(zip_code) == index.lookup(zip_code)
+
+
+def test_close_unmaps_the_file(saved):
+    mapping = saved._map
+    saved.close()
+    assert mapping.closed
+    saved.close()  # idempotent
+
+
+@pytest.mark.parametrize("damage", ["magic", "payload", "stamp"])
+def test_damaged_or_stale_file_is_rejected(tmp_path, index, damage):
+    path = tmp_path / "reps.idx"
+    index.save(str(path), [1, 2])
+    data = path.read_bytes()
+    if damage == "magic":
+        path.write_bytes(b"NOTREPS!" + data[8:])
+    elif damage == "payload":
+        path.write_bytes(data[:-10])
+    assert tool.RepresentativeIndex.load(str(path), [1, 3] if damage == "stamp" else [1, 2]) is None
+
+
+def test_cache_file_is_rebuilt_when_index_html_changes(tmp_path, monkeypatch):
+    page = tmp_path / "index.html"
+    shutil.copy(tool.SITE_HTML, page)
+    cache = str(tmp_path / "reps.idx")
+    monkeypatch.setattr(tool, "SITE_HTML", str(page))
+    monkeypatch.setattr(tool, "REPS_INDEX_FILE", cache)
+    builds = []
+    build = tool.RepresentativeIndex.build
+    monkeypatch.setattr(tool.RepresentativeIndex, "build", classmethod(
+        lambda cls: builds.append(1) or build()))
+
+    def fresh_index():
+        monkeypatch.setattr(tool, "_rep_index", None)
+        return tool.get_rep_index()
+
+    fresh_index()
+    first_stamp = tool._site_stamp()
+    assert tool.RepresentativeIndex.load(cache, first_stamp) is not None
+    assert fresh_index()._map is not None and len(builds) == 1  # mapped from the file
+
+    os.utime(page, ns=(first_stamp[0] + 10**9, first_stamp[0] + 10**9))
+    assert fresh_index().lookup("80202")["state"] == "CO"
+    assert len(builds) == 2
+    assert tool.RepresentativeIndex.load(cache, first_stamp) is None
+    assert tool.RepresentativeIndex.load(cache, tool._site_stamp()) is not None
@@ -0,0 +1,210 @@
+import json
+import os
+from datetime import date, timedelta
+
+import pytest
+
+import advocacy_tool as tool
+
+TODAY = "2025-03-01"
+TARGETS = [{"company": name, "ceo": "", "phone": "555-0100"}
+           for name in ("Target", "Home Depot", "Acme", "Beta")]
+
+
+def scheduler(**options):
+    return tool.CampaignScheduler(TARGETS, today=TODAY, **dict({"quota": 2}, **options))
+
+
+def assign(s, volunteer, **options):
+    target = s.assign(volunteer, today=TODAY, **options)
+    return target and target["company"]
+
+
+def days_ago(n, day=TODAY):
+    return (date.fromisoformat(day) - timedelta(days=n)).isoformat()
+
+
+def test_volunteers_are_spread_round_robin():
+    s = scheduler()
+    assert [assign(s, f"v{n}") for n in range(4)] == ["Target", "Home Depot", "Acme", "Beta"]
+
+
+def test_assignment_is_held_until_logged_or_skipped():
+    s = scheduler()
+    assert assign(s, "v0") == assign(s, "v0") == "Target"
+    assert assign(s, "v0", skip=True) == "Home Depot"
+    assert s.load("Target") == (0, 0)
+    s.record("v0", "Home Depot", TODAY + "T10:00:00")
+    assert s.load("Home Depot") == (1, 1)  # the assignment, not counted twice
+    assert "v0" not in s.pending
+
+
+def test_daily_quota():
+    s = scheduler()
+    assigned = [assign(s, f"v{n}") for n in range(10)]
+    assert assigned[8:] == [None, None]
+    assert all(assigned.count(company) == 2 for company in ("Target", "Home Depot", "Acme", "Beta"))
+
+
+def test_cooldown_skips_companies_contacted_recently():
+    history = [("me", days_ago(3), "corporate", "Target", "call"),
+               ("me", days_ago(13), "corporate", "Home Depot Inc.", "email"),
+               ("me", days_ago(14), "corporate", "Acme", "call")]
+    s = tool.CampaignScheduler.from_history(TARGETS, history, today=TODAY)
+    offered = {assign(s, "me", skip=True) for _ in range(6)}
+    assert offered == {"Acme", "Beta"}
+    # Only "me" is cooling down from them
+    assert "Target" in {assign(s, f"other{n}") for n in range(4)}
+
+
+def test_cooldown_zero_allows_repeats():
+    s = scheduler(cooldown=0)
+    s.record("me", "Target", TODAY)
+    s.record("me", "Home Depot", TODAY)
+    s.record("me", "Acme", TODAY)
+    assert assign(s, "me") == "Beta"
+    assert assign(s, "me", skip=True) in {"Target", "Home Depot", "Acme"}
+
+
+def test_new_day_resets_loads_and_drops_unlogged_assignments():
+    s = scheduler()
+    assign(s, "v0")
+    assert s.load("Target") == (1, 1)
+    s.assign("v1", today="2025-03-02")
+    assert s.pending == {"v1": 0} and s.load("Target") == (1, 1)
+
+
+def test_unknown_companies_are_ignored():
+    s = scheduler()
+    assert s.record("me", "Senator Smith", TODAY) is False
+    assert assign(s, "me") == "Target"
+
+
+def realistic_history(n, today):
+    companies = [t["company"] for t in TARGETS]
+    return [{"date": f"{days_ago((n - i) // 7, today)}T12:00:00",
+             "type": "corporate" if i % 3 else "congress",
+             "target": companies[i % 4] if i % 3 else "Congress",
+             "method": "call"} for i in range(n)]
+
+
+def test_seeding_from_rollup_matches_replaying_history():
+    actions = realistic_history(500, TODAY)
+    rollup = tool.StatsRollup.from_actions(actions)
+    seeded = tool.CampaignScheduler.from_totals(TARGETS, rollup.by_target, rollup.last_contact,
+                                                volunteer="me", today=TODAY)
+    replayed = tool.CampaignScheduler.from_history(
+        TARGETS, [("me", r["date"], r["type"], r["target"], r["method"]) for r in actions],
+        today=TODAY)
+    assert (seeded.total, seeded.daily, seeded.recent) == \
+        (replayed.total, replayed.daily, replayed.recent)
+    assert [assign(seeded, f"v{n}") for n in range(6)] == [assign(replayed, f"v{n}") for n in range(6)]
+
+
+@pytest.mark.parametrize("kind", ["journal", "sqlite", "packed"])
+def test_rollup_keeps_last_contact_index(kind, tmp_path):
+    actions = realistic_history(300, TODAY)
+    store = tool.open_action_store(kind, str(tmp_path / f"actions.{kind}"))
+    store.extend(actions[:200])
+    store.extend(actions[200:])
+    expected = tool.StatsRollup.from_actions(actions).last_contact
+    assert store.rollup().last_contact == expected
+    assert store.rebuild().last_contact == expected
+
+
+@pytest.mark.parametrize("kind", ["journal", "sqlite", "packed"])
+def test_since_reads_only_what_it_needs(kind, tmp_path):
+    actions = realistic_history(30_000, TODAY)  # journal spans many 64 KiB blocks
+    store = tool.open_action_store(kind, str(tmp_path / f"actions.{kind}"))
+    store.extend(actions)
+    for start in (days_ago(0), days_ago(14), days_ago(2000), "2100-01-01"):
+        assert store.since(start) == [r for r in actions if r["date"] >= start]
+
+
+def test_journal_since_skips_a_torn_tail(tmp_path):
+    path = tmp_path / "actions.jsonl"
+    store = tool.JournalStore(str(path))
+    store.extend(realistic_history(10, TODAY))
+    with open(path, "ab") as f:
+        f.write(b'{"date": "2025-03-01T13:00')
+    assert len(store.since(days_ago(30))) == 10
+
+
+@pytest.fixture
+def local_store(tmp_path, monkeypatch):
+    store = tool.JournalStore(str(tmp_path / "actions.jsonl"))
+    monkeypatch.setattr(tool, "_action_store", store)
+    monkeypatch.setattr(tool, "_scheduler", None)
+    return store
+
+
+def test_local_scheduler_starts_from_the_rollup(local_store, monkeypatch):
+    today = date.today().isoformat()
+    local_store.extend(realistic_history(200, today))
+    local_store.rollup()
+    monkeypatch.setattr(tool.JournalStore, "_all", lambda self: pytest.fail("read the history"))
+    monkeypatch.setattr(tool.JournalStore, "since", lambda self, day: pytest.fail("read the tail"))
+    s = tool.get_scheduler()
+    by_target = local_store.rollup().by_target
+    last = local_store.rollup().last_contact
+    for company in ("Target", "Home Depot"):
+        today_count = last[company][1] if last[company][0] == today else 0
+        assert s.load(company) == (today_count, by_target[company])
+
+
+def drop_last_contact(store):
+    """Rewrite the saved stats as they were before the last_contact index existed."""
+    with open(store.stats_path, encoding="utf-8") as f:
+        saved = json.load(f)
+    del saved["last_contact"]
+    with open(store.stats_path, "w", encoding="utf-8") as f:
+        json.dump(saved, f)
+    store._rollup = None
+
+
+@pytest.mark.parametrize("kind", ["journal", "sqlite", "packed"])
+def test_stats_saved_before_last_contact_are_rebuilt(kind, tmp_path):
+    actions = realistic_history(200, TODAY)
+    path = str(tmp_path / f"actions.{kind}")
+    tool.open_action_store(kind, path).extend(actions)
+    store = tool.open_action_store(kind, path)
+    drop_last_contact(store)
+
+    expected = tool.StatsRollup.from_actions(actions).last_contact
+    assert store.rollup().last_contact == expected
+    with open(store.stats_path, encoding="utf-8") as f:
+        assert json.load(f)["last_contact"] == expected
+    assert tool.open_action_store(kind, path).rollup().last_contact == expected
+
+
+def test_local_scheduler_recounts_old_stats_once(local_store, monkeypatch):
+    today = date.today().isoformat()
+    local_store.extend(realistic_history(200, today))
+    drop_last_contact(local_store)
+    reads = []
+    real_all = tool.JournalStore._all
+    monkeypatch.setattr(tool.JournalStore, "_all", lambda self: reads.append(1) or real_all(self))
+    s = tool.get_scheduler()
+    local_store.rollup()
+    assert len(reads) == 1
+    expected = tool.StatsRollup.from_actions(realistic_history(200, today)).last_contact
+    assert s.recent[tool.LOCAL_VOLUNTEER] == {
+        s._company(company): tool._day_number(day) for company, (day, _) in expected.items()
+        if s._company(company) is not None and day >= days_ago(tool.CONTACT_COOLDOWN, today)}
+
+
+def test_logged_actions_reach_the_running_scheduler(local_store):
+    suggested = tool.get_scheduler().assign(tool.LOCAL_VOLUNTEER)
+    tool.log_action({}, "corporate", suggested["company"], "call")
+    assert tool.LOCAL_VOLUNTEER not in tool.get_scheduler().pending
+    assert tool.get_scheduler().assign(tool.LOCAL_VOLUNTEER) != suggested
+
+
+def test_server_next_route(tmp_path):
+    import asyncio
+    server = tool.AdvocacyServer(str(tmp_path))
+    route = lambda method, path, body=b"": asyncio.run(server.route(method, path, {}, body))
+    first = route("GET", "/users/a/next")[1]
+    assert route("GET", "/users/a/next")[1] == first
+    assert route("POST", "/users/a/next")[1] != first
+    assert route("GET", "/users/b/next")[1] == first
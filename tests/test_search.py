@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+import advocacy_tool as tool
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    return tool.SearchIndex.open(str(tmp_path_factory.mktemp("search")))
+
+
+@pytest.fixture(scope="module")
+def counts(index):
+    """Matches per type for a word that appears in every kind of document."""
+    facets = index.search("ice")["facets"]["type"]
+    assert set(facets) == set(tool.SEARCH_TYPES)
+    return facets
+
+
+@pytest.mark.parametrize("doc_type", tool.SEARCH_TYPES)
+@pytest.mark.parametrize("spelling", [str.lower, str.upper, lambda t: t + "s"])
+def test_type_facet_in_query(index, counts, doc_type, spelling):
+    result = index.search(f"ice type:{spelling(doc_type)}", limit=500)
+    assert result["total"] == counts[doc_type]
+    assert {doc["type"] for doc in result["results"]} == {doc_type}
+
+
+@pytest.mark.parametrize("doc_type", tool.SEARCH_TYPES)
+def test_type_facet_as_parameter(index, counts, doc_type):
+    assert index.search("ice", type=doc_type)["total"] == counts[doc_type]
+
+
+def test_type_facet_over_the_api(index, counts, monkeypatch, tmp_path):
+    monkeypatch.setattr(tool, "get_search_index", lambda: index)
+    server = tool.AdvocacyServer(str(tmp_path))
+    status, result = asyncio.run(server.route("GET", "/search", {"q": "ice", "type": "news"}, b""))
+    assert status == 200 and result["total"] == counts["news"]
+
+
+def test_unknown_type_matches_nothing(index):
+    assert index.search("ice type:podcast")["total"] == 0
+
+
+def test_state_facet(index):
+    everywhere = index.search("raid")
+    co = index.search("raid state:colorado", limit=500)
+    assert co["total"] == everywhere["facets"]["state"].get("CO", 0) > 0
+    assert {doc["state"] for doc in co["results"]} == {"CO"}
+    assert co["facets"]["type"] == index.search("raid", state="CO")["facets"]["type"]
+
+
+def test_last_word_matches_as_a_prefix(index):
+    assert index.search("know your rig")["total"] == index.search("know your rights")["total"] > 0
+    assert index.search("know your rig ")["total"] <= index.search("know your rig")["total"]
+
+
+def test_empty_query(index):
+    assert index.search("type:org")["total"] == 0
+
+
+@pytest.mark.parametrize("word", sorted(tool.SEARCH_UNSTEMMED))
+def test_protected_words_are_not_stemmed(word):
+    assert tool._stem(word) == word
+
+
+def test_news_is_not_folded_into_new(index):
+    news = index.search("news ", limit=20)
+    assert {doc["type"] for doc in news["results"]} == {"news"}
+    new = index.search("new ", limit=20)
+    assert news["total"] != new["total"] and news["results"] != new["results"]
+    assert not any(doc["type"] != "news" and doc["title"].startswith("New ")
+                   for doc in index.search("news ", limit=500)["results"])
+
+
+def test_segments_from_an_older_tokenizer_are_rebuilt(tmp_path, monkeypatch):
+    tool.SearchIndex.open(str(tmp_path))
+    assert tool.SearchIndex.open(str(tmp_path)).rebuilt == []
+    monkeypatch.setattr(tool, "SEARCH_TOKENIZER", tool.SEARCH_TOKENIZER + 1)
+    assert tool.SearchIndex.open(str(tmp_path)).rebuilt == list(tool.SEARCH_DATASETS)
@@ -0,0 +1,140 @@
+import asyncio
+import json
+
+import pytest
+
+import advocacy_tool as tool
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = dict(line.lower().split(": ", 1) for line in lines[1:] if ": " in line)
+    body = await reader.readexactly(int(headers["content-length"]))
+    return int(lines[0].split()[1]), headers, json.loads(body)
+
+
+def request(method, path, body=None, headers=""):
+    data = b"" if body is None else json.dumps(body).encode()
+    return (f"{method} {path} HTTP/1.1\r\nHost: test\r\n{headers}"
+            f"Content-Length: {len(data)}\r\n\r\n").encode() + data
+
+
+@pytest.fixture
+def exchange(tmp_path):
+    """Run the API in-process; exchange(raw bytes, responses=1) -> [(status, headers, json)]."""
+
+    def run(raw, responses=1):
+        async def go():
+            server = tool.AdvocacyServer(str(tmp_path / "users"))
+            listener = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            async with listener:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(raw)
+                await writer.drain()
+                results = [await read_response(reader) for _ in range(responses)]
+                closed = await reader.read() == b""
+                writer.close()
+                for store in server.stores.values():
+                    store.flush()
+                return results, closed
+        return asyncio.run(go())
+
+    return run
+
+
+def test_oversized_body_gets_413_and_close(exchange):
+    raw = b"POST /users/a/actions HTTP/1.1\r\nContent-Length: 99999999\r\n\r\n"
+    [(status, headers, payload)], closed = exchange(raw)
+    assert status == 413 and headers["connection"] == "close" and closed
+    assert "too large" in payload["error"]
+
+
+@pytest.mark.parametrize("length", ["abc", "-5"])
+def test_bad_content_length_gets_400_and_close(exchange, length):
+    raw = f"POST /users/a/actions HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode()
+    [(status, headers, payload)], closed = exchange(raw)
+    assert status == 400 and closed
+    assert "Content-Length" in payload["error"]
+
+
+def test_overlong_header_gets_400_and_close(exchange):
+    raw = b"GET /targets HTTP/1.1\r\nX-Padding: " + b"x" * 200_000 + b"\r\n\r\n"
+    [(status, _, payload)], closed = exchange(raw)
+    assert status == 400 and closed
+    assert payload == {"error": "Request headers too long"}
+
+
+def test_errors_after_a_complete_request_keep_the_connection(exchange):
+    raw = (request("GET", "/nowhere") + request("GET", "/users/bad%20id/profile")
+           + request("POST", "/users/a/actions", {"type": "corporate"})
+           + request("GET", "/targets", headers="Connection: close\r\n"))
+    responses, closed = exchange(raw, responses=4)
+    assert [status for status, _, _ in responses] == [404, 400, 400, 200]
+    assert closed
+
+
+def test_profile_actions_and_stats(exchange):
+    raw = (request("PUT", "/users/alex/profile", {"user_name": "Alex", "user_state": "co"})
+           + request("POST", "/users/alex/actions",
+                     {"type": "corporate", "target": "Target", "method": "call"})
+           + request("GET", "/users/alex/stats", headers="Connection: close\r\n"))
+    (s1, _, profile), (s2, _, action), (s3, _, stats) = exchange(raw, responses=3)[0]
+    assert (s1, s2, s3) == (200, 201, 200)
+    assert profile["user_state"] == "CO"
+    assert action["target"] == "Target"
+    assert stats["total"] == 1 and stats["by_target"] == {"Target": 1}
+
+
+def test_profile_put_normalizes_the_address(exchange, tmp_path):
+    raw = (request("PUT", "/users/alex/profile",
+                   {"user_address": "1437 bannock street", "zip_code": "80202", "user_state": "co"})
+           + request("PUT", "/users/sam/profile", {"zip_code": "8020", "user_state": "co"},
+                     headers="Connection: close\r\n"))
+    (_, _, alex), (_, _, sam) = exchange(raw, responses=2)[0]
+    assert (alex["user_address"], alex["user_city"], alex["user_state"], alex["zip_code"]) == \
+        ("1437 Bannock St", "Denver", "CO", "80202")
+    assert "address_issues" not in alex
+    assert sam["address_issues"] == ["invalid ZIP '8020'"]
+    saved = json.loads((tmp_path / "users" / "sam" / "profile.json").read_text())
+    assert saved["zip_code"] == "8020" and "address_issues" not in saved
+
+
+def test_indexes_are_loaded_before_the_first_request(tmp_path, monkeypatch):
+    for name in ("_rep_index", "_search_index", "_place_index"):
+        monkeypatch.setattr(tool, name, None)
+    tool.AdvocacyServer(str(tmp_path))
+    assert tool._rep_index and tool._search_index and tool._place_index
+
+
+def test_idle_users_are_forgotten_past_the_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(tool, "FLUSH_DELAY", 60)  # keep actions queued until the store is closed
+    action = json.dumps({"type": "corporate", "target": "Target", "method": "call"}).encode()
+
+    async def go():
+        server = tool.AdvocacyServer(str(tmp_path), max_users=2)
+        for user in ("a", "b", "a", "c"):
+            await server.route("POST", f"/users/{user}/actions", {}, action)
+            await server.route("GET", f"/users/{user}/profile", {}, b"")
+        await asyncio.sleep(0.1)  # let the evicted journal flush on the executor
+        return server
+
+    server = asyncio.run(go())
+    assert list(server.recent) == ["a", "c"]
+    assert set(server.stores) == set(server.profiles) == set(server.locks) == {"a", "c"}
+    assert not server.busy
+    assert tool.JournalStore(str(tmp_path / "b" / "actions.jsonl")).rollup().total == 1
+    for store in server.stores.values():
+        store.close()
+
+
+def test_users_with_requests_in_flight_are_kept(tmp_path):
+    async def go():
+        server = tool.AdvocacyServer(str(tmp_path), max_users=1)
+        server.busy["a"] = 1
+        server._touch("a")
+        server._touch("b")
+        return list(server.recent)
+
+    assert asyncio.run(go()) == ["a", "b"]
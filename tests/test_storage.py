@@ -0,0 +1,229 @@
+import argparse
+import json
+import os
+import random
+
+import pytest
+
+import advocacy_tool as tool
+
+
+def record(n, target="Target"):
+    return {"date": f"2025-01-{n % 28 + 1:02d}T12:00:00", "type": "corporate",
+            "target": target, "method": "call"}
+
+
+def test_journal_drops_and_truncates_a_torn_tail(tmp_path):
+    path = tmp_path / "actions.jsonl"
+    store = tool.JournalStore(str(path))
+    store.extend([record(1), record(2)])
+    with open(path, "ab") as f:
+        f.write(b'{"date": "2025-01-03T12:00:00", "ty')  # killed mid-append
+
+    assert store.all() == [record(1), record(2)]
+    assert path.read_bytes().endswith(b"}\n")
+
+    store.extend([record(3)])
+    assert store.all() == [record(1), record(2), record(3)]
+    assert store.rollup().total == 3
+
+
+def test_journal_skips_a_damaged_line_in_the_middle(tmp_path):
+    path = tmp_path / "actions.jsonl"
+    path.write_text(json.dumps(record(1)) + "\nnot json\n" + json.dumps(record(2)) + "\n")
+    assert tool.JournalStore(str(path)).all() == [record(1), record(2)]
+
+
+STORE_FILES = {"journal": "actions.jsonl", "sqlite": "actions.db", "packed": "actions.bin"}
+
+
+@pytest.fixture(params=sorted(STORE_FILES))
+def open_store(request, tmp_path):
+    """open_store() -> a new instance of the parametrized store kind, all on one file."""
+    path = str(tmp_path / STORE_FILES[request.param])
+    return lambda: tool.open_action_store(request.param, path)
+
+
+def varied_history(n=400):
+    rng = random.Random(7)
+    targets = ["Target", "Home Depot", "Delta", "Hilton", "Palantir", "Avelo"]
+    return [{"date": f"2025-{rng.randint(1, 3):02d}-{rng.randint(1, 28):02d}T"
+                     f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}",
+             "type": rng.choice(["corporate", "congress"]),
+             "target": rng.choice(targets),
+             "method": rng.choice(["call", "email"])} for _ in range(n)]
+
+
+def without_watermark(rollup):
+    data = rollup.to_dict()
+    del data["watermark"]
+    return data
+
+
+def test_rollup_follows_writes_from_another_store_instance(open_store):
+    first, second = open_store(), open_store()
+    first.extend([record(1)])
+    assert second.rollup().total == 1
+    second.extend([record(2, "Home Depot")])
+    assert first.rollup().by_target == {"Target": 1, "Home Depot": 1}
+
+
+def test_stats_match_the_journal(open_store, tmp_path):
+    history = varied_history()
+    journal = tool.JournalStore(str(tmp_path / "reference.jsonl"))
+    journal.extend(history)
+    expected = without_watermark(journal.rebuild())
+
+    store = open_store()
+    for start in range(0, len(history), 50):
+        store.extend(history[start:start + 50])
+    assert without_watermark(store.rollup()) == expected  # kept up to date write by write
+    assert without_watermark(store.rebuild()) == expected  # recounted by the store's own queries
+    assert without_watermark(open_store().rollup()) == expected
+    assert store.summary() == journal.summary()
+
+
+def test_history_reads_match_the_journal(open_store, tmp_path):
+    history = varied_history()
+    store = open_store()
+    for item in history:
+        store.append(item)
+    assert store.count() == len(history)
+    assert store.all() == history
+    assert store.since("2025-03-01") == [r for r in history if r["date"] >= "2025-03-01"]
+
+
+def test_packed_dates_keep_whole_seconds_of_wall_clock_time(tmp_path):
+    dates = ["2025-03-01T09:15:42.123456", "2025-03-01T23:30:00-05:00", "2025-03-02T00:00:00"]
+    history = [dict(record(1), date=d) for d in dates]
+    journal = tool.JournalStore(str(tmp_path / "actions.jsonl"))
+    packed = tool.PackedStore(str(tmp_path / "actions.bin"))
+    journal.extend(history)
+    packed.extend(history)
+
+    assert journal.all() == history
+    assert [r["date"] for r in packed.all()] == [
+        "2025-03-01T09:15:42", "2025-03-01T23:30:00", "2025-03-02T00:00:00"]
+    counters = lambda store: {k: v for k, v in without_watermark(store.rebuild()).items() if k != "recent"}
+    assert counters(packed) == counters(journal)  # only "recent" shows the trimmed dates
+
+
+def test_save_config_is_all_or_nothing(tmp_path, monkeypatch):
+    path = str(tmp_path / "config.json")
+    tool.save_config({"user_name": "Before"}, path)
+
+    def crash(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", crash)
+    with pytest.raises(OSError):
+        tool.save_config({"user_name": "After"}, path)
+    monkeypatch.undo()
+
+    assert json.loads((tmp_path / "config.json").read_text()) == {"user_name": "Before"}
+    assert sorted(os.listdir(tmp_path)) == ["config.json", "config.json.lock"]
+
+
+def test_save_config_keeps_actions_out_of_the_profile(tmp_path):
+    path = str(tmp_path / "config.json")
+    tool.save_config({"user_name": "A", "actions_taken": [record(1)]}, path)
+    assert json.loads((tmp_path / "config.json").read_text()) == {"user_name": "A"}
+
+
+def test_damaged_config_is_set_aside(tmp_path, capsys):
+    path = tmp_path / "config.json"
+    path.write_text('{"user_name": "Ha')
+    assert tool.load_config(str(path)) == tool.DEFAULT_CONFIG
+    assert (tmp_path / "config.json.corrupt").exists()
+    assert "damaged" in capsys.readouterr().out
+
+
+def test_load_config_leaves_the_store_alone(tmp_path, monkeypatch):
+    def unexpected():
+        raise AssertionError("load_config opened the action store")
+
+    path = tmp_path / "config.json"
+    tool.save_config({"user_name": "A"}, str(path))
+    monkeypatch.setattr(tool, "get_action_store", unexpected)
+    assert tool.load_config(str(path)) == {"user_name": "A"}
+
+
+def test_legacy_actions_are_moved_to_the_store_once(tmp_path, monkeypatch):
+    store = tool.JournalStore(str(tmp_path / "actions.jsonl"))
+    monkeypatch.setattr(tool, "get_action_store", lambda: store)
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"user_name": "A", "actions_taken": [record(1), record(2)]}))
+
+    assert tool.load_config(str(path)) == {"user_name": "A"}
+    assert store.all() == [record(1), record(2)]
+    assert json.loads(path.read_text()) == {"user_name": "A"}
+
+    path.write_text(json.dumps({"user_name": "A", "actions_taken": [record(3)]}))
+    tool.load_config(str(path))
+    assert store.count() == 2  # never merged into an existing history
+    assert json.loads(path.read_text()) == {"user_name": "A"}
+
+
+@pytest.mark.parametrize("store", ["journal", "sqlite", "packed"])
+def test_concurrent_writers_lose_nothing(store, capsys):
+    args = argparse.Namespace(store=store, processes=4, actions=30, interval=0.0)
+    tool.cmd_stress(args)  # exits non-zero on lost actions or a half-written config
+    assert "OK: no actions lost" in capsys.readouterr().out
+
+
+def packed_history():
+    return [record(n, target) for n, target in enumerate(["Target", "Home Depot", "Target", "Delta"])]
+
+
+def interrupt_replace(monkeypatch, at_call):
+    """Make the at_call-th os.replace fail, as if the process died there."""
+    real, calls = os.replace, []
+
+    def replace(src, dst):
+        calls.append(dst)
+        if len(calls) == at_call:
+            raise OSError("killed")
+        return real(src, dst)
+
+    monkeypatch.setattr(os, "replace", replace)
+
+
+def test_packed_compact_rewrites_and_drops_unused_strings(tmp_path):
+    path = str(tmp_path / "actions.bin")
+    store = tool.PackedStore(path)
+    store.extend(packed_history() + [record(9, "Gone Inc")])
+    store.compact(packed_history())
+
+    reopened = tool.PackedStore(path)
+    assert reopened.all() == packed_history()
+    assert "Gone Inc" not in reopened.strings
+    assert reopened.rollup().total == 4
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".compact")]
+
+
+def test_packed_compact_killed_before_commit_keeps_old_history(tmp_path, monkeypatch):
+    path = str(tmp_path / "actions.bin")
+    old = packed_history() + [record(9, "Gone Inc")]
+    tool.PackedStore(path).extend(old)
+
+    interrupt_replace(monkeypatch, 1)
+    with pytest.raises(OSError):
+        tool.PackedStore(path).compact(packed_history()[:1])
+    monkeypatch.undo()
+
+    assert tool.PackedStore(path).all() == old
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".compact")]
+
+
+def test_packed_compact_killed_after_commit_is_finished_on_open(tmp_path, monkeypatch):
+    path = str(tmp_path / "actions.bin")
+    tool.PackedStore(path).extend(packed_history() + [record(9, "Gone Inc")])
+
+    interrupt_replace(monkeypatch, 2)
+    with pytest.raises(OSError):
+        tool.PackedStore(path).compact(packed_history())
+    monkeypatch.undo()
+
+    reopened = tool.PackedStore(path)
+    assert reopened.all() == packed_history()
+    assert reopened.rollup().by_target == {"Target": 2, "Home Depot": 1, "Delta": 1}
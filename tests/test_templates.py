@@ -0,0 +1,42 @@
+import pytest
+
+import advocacy_tool as tool
+
+PROFILE = {"user_name": "Alex Doe", "user_address": "1 Main St", "user_city": "Denver",
+           "user_state": "CO", "zip_code": "80202"}
+
+
+def test_compiled_templates_match_str_format():
+    target = tool.get_target_registry().featured()[0]
+    assert tool.render_ceo_email(PROFILE, target) == \
+        tool.CEO_EMAIL_TEMPLATE.format(**tool.ceo_fields(PROFILE, target))
+    assert tool.render_congress_call_script(PROFILE) == \
+        tool.CONGRESS_CALL_SCRIPT.format(**tool.congress_fields(PROFILE))
+    assert tool.render_congress_email(PROFILE) == \
+        tool.CONGRESS_EMAIL_TEMPLATE.format(**tool.congress_fields(PROFILE))
+
+
+def test_congress_call_screen_uses_compiled_template(monkeypatch):
+    rendered = []
+    real = tool.get_template
+
+    def spy(name):
+        rendered.append(name)
+        return real(name)
+
+    monkeypatch.setattr(tool, "get_template", spy)
+    monkeypatch.setattr(tool, "log_action", lambda *args: None)
+    with tool.Headless([""]):
+        tool.show_congress_call_script(PROFILE)
+    assert rendered == ["congress_call"]
+
+
+@pytest.mark.parametrize("profile", [PROFILE, {}, {"user_name": "Sam", "zip_code": "10001"}])
+def test_menu_and_batch_renders_agree(profile):
+    target = tool.get_target_registry().featured()[0]
+    fields = tool.ceo_fields(profile, target)
+    assert tool.render_ceo_call_script(profile, target) == tool.get_template("ceo_call").render(fields)
+    assert tool.render_ceo_email(profile, target) == tool.get_template("ceo_email").render(fields)
+    [bulk_email] = tool._render_chunk([profile], [target], "email")
+    [menu_email] = tool.render_profile(profile, [target], "email")
+    assert bulk_email == menu_email